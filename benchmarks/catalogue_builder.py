@@ -0,0 +1,87 @@
+"""
+Time to build the catalogue model from synthetic STAC json documents.
+
+    python -m benchmarks.catalogue_builder --products 200
+
+Compares the json builder of the catalogue parser with the former builder
+going through pystac objects. Both start from the raw json bytes, as
+received from the Marine Data Store, and must build the same catalogue.
+"""
+import argparse
+import json
+import time
+from typing import Any, Callable
+
+from benchmarks.pystac_catalogue_builder import construct_product_from_pystac
+from benchmarks.synthetic_stac import synthetic_stac_products
+from copernicusmarine.catalogue_parser.catalogue_parser import (
+    CopernicusMarineProduct,
+    _construct_marine_data_store_product,
+)
+
+JsonDocuments = list[tuple[bytes, list[bytes]]]
+
+
+def build_products(
+    documents: JsonDocuments,
+    construct_product: Callable[[Any], Any],
+) -> list[CopernicusMarineProduct]:
+    return [
+        construct_product(
+            (json.loads(collection), [json.loads(item) for item in items])
+        ).to_copernicus_marine_product()
+        for collection, items in documents
+    ]
+
+
+def time_builder(
+    documents: JsonDocuments,
+    construct_product: Callable[[Any], Any],
+    repeat: int,
+) -> tuple[float, list[CopernicusMarineProduct]]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        products = build_products(documents, construct_product)
+        timings.append(time.perf_counter() - start)
+    return min(timings), products
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=100)
+    parser.add_argument("--datasets-per-product", type=int, default=8)
+    parser.add_argument("--variables-per-dataset", type=int, default=6)
+    parser.add_argument("--depth-levels", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    arguments = parser.parse_args()
+
+    documents = [
+        (
+            json.dumps(collection).encode(),
+            [json.dumps(item).encode() for item in items],
+        )
+        for collection, items in synthetic_stac_products(
+            arguments.products,
+            arguments.datasets_per_product,
+            arguments.variables_per_dataset,
+            arguments.depth_levels,
+        )
+    ]
+
+    json_seconds, json_products = time_builder(
+        documents, _construct_marine_data_store_product, arguments.repeat
+    )
+    pystac_seconds, pystac_products = time_builder(
+        documents, construct_product_from_pystac, arguments.repeat
+    )
+    assert json_products == pystac_products, "The builders disagree"
+
+    print(f"products: {len(json_products)}")
+    print(f"json builder: {json_seconds:.3f} s")
+    print(f"pystac builder: {pystac_seconds:.3f} s")
+    print(f"speedup: {pystac_seconds / json_seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+"""
+Time to fetch and parse a synthetic catalogue served by a local STAC server.
+
+    python -m benchmarks.catalogue_fetch --products 1000 --concurrency 1,8,15
+
+The synthetic STAC tree is served over HTTP with a fixed latency per
+request, ETag headers and conditional request support, as the Marine Data
+Store does. For each value of COPERNICUSMARINE_MAX_CONCURRENT_REQUESTS,
+starting from an empty cache, a new process measures in turn:
+
+- the cold fetch and parse of the catalogue by _parse_catalogue,
+- the same with the STAC json cache populated, when every file is
+  revalidated with a conditional request,
+- the load of the catalogue from the local catalogue cache.
+
+The requests are counted by the server, the peak memory is the growth of
+the maximum resident set size of the process during the step.
+"""
+import argparse
+import hashlib
+import http.server
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from typing import Any, Optional
+
+from benchmarks.synthetic_stac import synthetic_stac_products
+from copernicusmarine.catalogue_parser import catalogue_parser
+from copernicusmarine.core_functions.utils import create_cache_directory
+
+STAC_PATH = "/metadata"
+
+
+def _encode(document: dict[str, Any]) -> tuple[bytes, str]:
+    body = json.dumps(document).encode()
+    return body, f'"{hashlib.md5(body).hexdigest()}"'
+
+
+def synthetic_stac_documents(
+    arguments: argparse.Namespace,
+) -> dict[str, tuple[bytes, str]]:
+    """
+    Body and ETag of the synthetic STAC files, by path on the server.
+    """
+    documents = {}
+    child_links = []
+    for collection, items in synthetic_stac_products(
+        arguments.products,
+        arguments.datasets_per_product,
+        arguments.variables_per_dataset,
+        arguments.depth_levels,
+    ):
+        product_id = collection["id"]
+        child_links.append(
+            {
+                "rel": "child",
+                "href": f"{product_id}/product.stac.json",
+                "type": "application/json",
+            }
+        )
+        documents[f"{STAC_PATH}/{product_id}/product.stac.json"] = _encode(
+            collection
+        )
+        for item in items:
+            documents[
+                f"{STAC_PATH}/{product_id}/{item['id']}/dataset.stac.json"
+            ] = _encode(item)
+    documents[f"{STAC_PATH}/catalog.stac.json"] = _encode(
+        {
+            "id": "MDS",
+            "type": "Catalog",
+            "stac_version": "1.0.0",
+            "description": "Synthetic Marine Data Store",
+            "links": [{"rel": "root", "href": "."}, *child_links],
+        }
+    )
+    return documents
+
+
+class SyntheticStacServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self, documents: dict[str, tuple[bytes, str]], latency_seconds: float
+    ) -> None:
+        super().__init__(("127.0.0.1", 0), _SyntheticStacRequestHandler)
+        self.documents = documents
+        self.latency_seconds = latency_seconds
+        self.responses: Counter[int] = Counter()
+        self.__lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}{STAC_PATH}"
+
+    def count_response(self, status: int) -> None:
+        with self.__lock:
+            self.responses[status] += 1
+
+    def pop_responses(self) -> Counter[int]:
+        with self.__lock:
+            responses, self.responses = self.responses, Counter()
+        return responses
+
+
+class _SyntheticStacRequestHandler(http.server.BaseHTTPRequestHandler):
+    server: SyntheticStacServer
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:
+        time.sleep(self.server.latency_seconds)
+        document = self.server.documents.get(self.path.split("?")[0])
+        if document is None:
+            self._respond(404)
+            return
+        body, etag = document
+        if self.headers.get("If-None-Match") == etag:
+            self._respond(304, etag=etag)
+            return
+        self._respond(200, body=body, etag=etag)
+
+    def _respond(
+        self, status: int, body: bytes = b"", etag: Optional[str] = None
+    ) -> None:
+        self.server.count_response(status)
+        self.send_response(status)
+        if etag:
+            self.send_header("ETag", etag)
+        if status != 304:
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+def _max_rss_bytes() -> int:
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def run_step(step: str, base_url: str) -> dict[str, Any]:
+    """
+    Run a step of the benchmark in this process, with the cache of $HOME.
+    """
+    catalogue_parser.MARINE_DATA_STORE_STAC_BASE_URL = base_url
+    catalogue_parser.MARINE_DATA_STORE_STAC_ROOT_CATALOG_URL = (
+        base_url + "/catalog.stac.json"
+    )
+    create_cache_directory()
+
+    max_rss_before = _max_rss_bytes()
+    start = time.perf_counter()
+    if step == "fetch":
+        catalogue = catalogue_parser._parse_catalogue(
+            disable_progress_bar=True
+        )
+        seconds = time.perf_counter() - start
+        catalogue_parser._write_catalogue_to_store(catalogue, staging=False)
+    else:
+        loaded_catalogue = catalogue_parser._load_catalogue_from_store(
+            staging=False
+        )
+        seconds = time.perf_counter() - start
+        assert loaded_catalogue is not None, "The catalogue is not cached"
+        catalogue = loaded_catalogue
+    return {
+        "seconds": seconds,
+        "products": len(catalogue.products),
+        "peak_memory_bytes": _max_rss_bytes() - max_rss_before,
+    }
+
+
+def _run_step_in_subprocess(
+    step: str,
+    server: SyntheticStacServer,
+    home_directory: str,
+    max_concurrent_requests: int,
+) -> dict[str, Any]:
+    completed = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "benchmarks.catalogue_fetch",
+            "--step",
+            step,
+            "--base-url",
+            server.base_url,
+        ],
+        env={
+            **os.environ,
+            "HOME": home_directory,
+            "COPERNICUSMARINE_MAX_CONCURRENT_REQUESTS": str(
+                max_concurrent_requests
+            ),
+        },
+        stdout=subprocess.PIPE,
+        check=True,
+    )
+    result = json.loads(completed.stdout.decode().splitlines()[-1])
+    result["responses"] = dict(sorted(server.pop_responses().items()))
+    return result
+
+
+def _report(name: str, result: dict[str, Any]) -> None:
+    responses = ", ".join(
+        f"{count} x {status}" for status, count in result["responses"].items()
+    )
+    print(
+        f"  {name}: {result['seconds']:.2f} s, "
+        f"{result['products']} products, "
+        f"peak memory +{result['peak_memory_bytes'] / 2**20:.0f} MiB, "
+        f"requests: {responses or 'none'}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=1000)
+    parser.add_argument("--datasets-per-product", type=int, default=4)
+    parser.add_argument("--variables-per-dataset", type=int, default=6)
+    parser.add_argument("--depth-levels", type=int, default=50)
+    parser.add_argument(
+        "--concurrency",
+        default="1,4,15,32",
+        help="Comma separated values of "
+        "COPERNICUSMARINE_MAX_CONCURRENT_REQUESTS.",
+    )
+    parser.add_argument(
+        "--latency-ms",
+        type=float,
+        default=20,
+        help="Time taken by the server to answer each request.",
+    )
+    parser.add_argument("--step", choices=["fetch", "load"])
+    parser.add_argument("--base-url")
+    arguments = parser.parse_args()
+
+    if arguments.step:
+        print(json.dumps(run_step(arguments.step, arguments.base_url)))
+        return
+
+    documents = synthetic_stac_documents(arguments)
+    print(
+        f"{len(documents)} STAC files, "
+        f"{sum(len(body) for body, _ in documents.values()) / 2**20:.0f} MiB"
+    )
+    server = SyntheticStacServer(documents, arguments.latency_ms / 1000)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        for max_concurrent_requests in map(
+            int, arguments.concurrency.split(",")
+        ):
+            print(
+                "COPERNICUSMARINE_MAX_CONCURRENT_REQUESTS="
+                f"{max_concurrent_requests}"
+            )
+            with tempfile.TemporaryDirectory() as home_directory:
+                for name, step in [
+                    ("cold fetch", "fetch"),
+                    ("revalidation", "fetch"),
+                    ("cache load", "load"),
+                ]:
+                    _report(
+                        name,
+                        _run_step_in_subprocess(
+                            step,
+                            server,
+                            home_directory,
+                            max_concurrent_requests,
+                        ),
+                    )
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
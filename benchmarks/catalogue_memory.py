@@ -0,0 +1,83 @@
+"""
+Memory retained by the catalogue model built from synthetic STAC metadata.
+
+    python -m benchmarks.catalogue_memory --products 200
+
+The STAC objects are generated and released before the measurement, so
+that only the memory held by the CopernicusMarineCatalogue is reported.
+"""
+import argparse
+import gc
+import tracemalloc
+
+from benchmarks.synthetic_stac import synthetic_stac_products
+from copernicusmarine.catalogue_parser.catalogue_parser import (
+    CopernicusMarineCatalogue,
+    _construct_marine_data_store_product,
+)
+
+
+def build_catalogue(
+    arguments: argparse.Namespace,
+) -> CopernicusMarineCatalogue:
+    return CopernicusMarineCatalogue(
+        products=[
+            _construct_marine_data_store_product(
+                stac_tuple
+            ).to_copernicus_marine_product()
+            for stac_tuple in synthetic_stac_products(
+                arguments.products,
+                arguments.datasets_per_product,
+                arguments.variables_per_dataset,
+                arguments.depth_levels,
+            )
+        ]
+    )
+
+
+def count_objects(catalogue: CopernicusMarineCatalogue) -> tuple[int, int]:
+    variables = [
+        variable
+        for product in catalogue.products
+        for dataset in product.datasets
+        for version in dataset.versions
+        for part in version.parts
+        for service in part.services
+        for variable in service.variables
+    ]
+    coordinates = {
+        id(coordinate)
+        for variable in variables
+        for coordinate in variable.coordinates
+    }
+    return len(variables), len(coordinates)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=100)
+    parser.add_argument("--datasets-per-product", type=int, default=8)
+    parser.add_argument("--variables-per-dataset", type=int, default=6)
+    parser.add_argument("--depth-levels", type=int, default=50)
+    arguments = parser.parse_args()
+
+    gc.collect()
+    tracemalloc.start()
+    catalogue = build_catalogue(arguments)
+    gc.collect()
+    retained_bytes, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    number_of_variables, number_of_coordinates = count_objects(catalogue)
+    print(f"products: {len(catalogue.products)}")
+    print(f"variables: {number_of_variables}")
+    print(f"distinct coordinates: {number_of_coordinates}")
+    print(f"retained: {retained_bytes / 2**20:.1f} MiB")
+    print(f"peak while building: {peak_bytes / 2**20:.1f} MiB")
+    print(
+        f"retained per variable: {retained_bytes / number_of_variables:.0f} B"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Time to build the products of a large synthetic catalogue in processes.
+
+    python -m benchmarks.catalogue_parallel_builder --products 1000
+
+Compares the construction of the products on the calling thread with
+their construction in a pool of worker processes, as enabled by
+COPERNICUSMARINE_CATALOGUE_BUILD_PROCESSES. The collections are given to
+the builders as they would come from the fetch of the catalogue, and both
+builders must return the same products.
+"""
+import argparse
+import asyncio
+import time
+from typing import Any, AsyncIterator
+
+from benchmarks.synthetic_stac import synthetic_stac_products
+from copernicusmarine.catalogue_parser.catalogue_parser import (
+    _async_construct_products_in_processes,
+    _construct_copernicus_marine_products,
+)
+
+StacTuple = tuple[dict[str, Any], list[dict[str, Any]]]
+
+
+async def _fetched(stac_tuples: list[StacTuple]) -> AsyncIterator[StacTuple]:
+    for stac_tuple in stac_tuples:
+        yield stac_tuple
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=1000)
+    parser.add_argument("--datasets-per-product", type=int, default=8)
+    parser.add_argument("--variables-per-dataset", type=int, default=6)
+    parser.add_argument("--depth-levels", type=int, default=50)
+    parser.add_argument(
+        "--processes",
+        default="2,4,8",
+        help="Comma separated numbers of worker processes.",
+    )
+    arguments = parser.parse_args()
+
+    stac_tuples = list(
+        synthetic_stac_products(
+            arguments.products,
+            arguments.datasets_per_product,
+            arguments.variables_per_dataset,
+            arguments.depth_levels,
+        )
+    )
+
+    start = time.perf_counter()
+    products = _construct_copernicus_marine_products(stac_tuples)
+    sequential_seconds = time.perf_counter() - start
+    print(f"products: {len(products)}")
+    print(f"calling thread: {sequential_seconds:.2f} s")
+
+    for number_of_processes in map(int, arguments.processes.split(",")):
+        start = time.perf_counter()
+        parallel_products = asyncio.run(
+            _async_construct_products_in_processes(
+                _fetched(stac_tuples), number_of_processes
+            )
+        )
+        parallel_seconds = time.perf_counter() - start
+        assert parallel_products == products, "The builders disagree"
+        print(
+            f"{number_of_processes} processes: {parallel_seconds:.2f} s, "
+            f"speedup {sequential_seconds / parallel_seconds:.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
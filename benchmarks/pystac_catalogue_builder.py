@@ -0,0 +1,284 @@
+"""
+Catalogue builder going through pystac objects, as the catalogue parser did
+before building the model directly from the STAC json.
+
+Kept as a reference for benchmarks.catalogue_builder only.
+"""
+import sys
+from itertools import groupby
+from typing import Any, Dict, List, Optional, Tuple
+
+import pystac
+
+from copernicusmarine.catalogue_parser.catalogue_parser import (
+    CopernicusMarineCoordinates,
+    CopernicusMarineDatasetServiceType,
+    CopernicusMarineDatasetVersion,
+    CopernicusMarineService,
+    CopernicusMarineServiceFormat,
+    CopernicusMarineVariable,
+    CopernicusMarineVersionPart,
+    ProductDatasetFromMarineDataStore,
+    ProductFromMarineDataStore,
+    ServiceNotHandled,
+    _get_coordinate,
+    _intern,
+    _service_type_from_web_api_string,
+    get_version_and_part_from_full_dataset_id,
+)
+from copernicusmarine.core_functions.utils import datetime_parser
+
+
+def construct_product_from_pystac(
+    stac_tuple: Tuple[dict[str, Any], List[dict[str, Any]]],
+) -> ProductFromMarineDataStore:
+    collection, items = stac_tuple
+    return _construct_marine_data_store_product(
+        (
+            pystac.Collection.from_dict(collection),
+            [pystac.Item.from_dict(item) for item in items],
+        )
+    )
+
+
+def _construct_copernicus_marine_service(
+    stac_service_name, stac_asset, datacube
+) -> Optional[CopernicusMarineService]:
+    try:
+        service_uri = stac_asset.get_absolute_href()
+        service_type = _service_type_from_web_api_string(stac_service_name)
+        service_format = None
+        admp_in_preparation = datacube.properties.get("admp_in_preparation")
+        if stac_asset.media_type and "zarr" in stac_asset.media_type:
+            service_format = CopernicusMarineServiceFormat.ZARR
+        elif stac_asset.media_type and "sqlite3" in stac_asset.media_type:
+            service_format = CopernicusMarineServiceFormat.SQLITE
+
+        if not service_uri.endswith("/"):
+            if admp_in_preparation and (
+                service_type == CopernicusMarineDatasetServiceType.GEOSERIES
+                or service_type
+                == CopernicusMarineDatasetServiceType.TIMESERIES
+            ):
+                return None
+            else:
+                return CopernicusMarineService(
+                    service_type=service_type,
+                    uri=service_uri,
+                    variables=_get_variables(datacube, stac_asset),
+                    service_format=service_format,
+                )
+        return None
+    except ServiceNotHandled:
+        return None
+
+
+def _get_versions_from_marine_datastore(
+    datacubes: List[pystac.Item],
+) -> List[CopernicusMarineDatasetVersion]:
+    copernicus_marine_dataset_versions: List[
+        CopernicusMarineDatasetVersion
+    ] = []
+
+    datacubes_by_version = groupby(
+        datacubes,
+        key=lambda datacube: get_version_and_part_from_full_dataset_id(
+            datacube.id
+        )[1],
+    )
+    for dataset_version, datacubes in datacubes_by_version:  # type: ignore
+        parts = _get_parts(datacubes)
+
+        if parts:
+            version = CopernicusMarineDatasetVersion(
+                label=sys.intern(dataset_version),
+                parts=parts,
+            )
+            copernicus_marine_dataset_versions.append(version)
+
+    return copernicus_marine_dataset_versions
+
+
+def _get_parts(
+    datacubes: List[pystac.Item],
+) -> List[CopernicusMarineVersionPart]:
+    parts: List[CopernicusMarineVersionPart] = []
+    for datacube in datacubes:
+        released_date = datacube.properties.get("admp_released_date")
+        retired_date = datacube.properties.get("admp_retired_date")
+        if retired_date and datetime_parser(retired_date) < datetime_parser(
+            "now"
+        ):
+            continue
+
+        services = _get_services(datacube)
+        _, _, part = get_version_and_part_from_full_dataset_id(datacube.id)
+
+        if services:
+            parts.append(
+                CopernicusMarineVersionPart(
+                    name=sys.intern(part),
+                    services=services,
+                    retired_date=_intern(retired_date),
+                    released_date=_intern(released_date),
+                )
+            )
+
+    if parts:
+        return parts
+    return []
+
+
+def _get_services(
+    datacube: pystac.Item,
+) -> list[CopernicusMarineService]:
+    stac_assets_dict = datacube.get_assets()
+    return [
+        dataset_service
+        for stac_service_name, stac_asset in stac_assets_dict.items()
+        if (
+            dataset_service := _construct_copernicus_marine_service(
+                stac_service_name, stac_asset, datacube
+            )
+        )
+        is not None
+    ]
+
+
+def _get_variables(
+    stac_dataset: pystac.Item,
+    stac_asset: pystac.Asset,
+) -> list[CopernicusMarineVariable]:
+    bbox = stac_dataset.bbox
+    # Variables of an asset only differ by the chunking of their
+    # coordinates: identical coordinates are shared between them
+    coordinates_cache: dict[tuple, CopernicusMarineCoordinates] = {}
+    return [
+        CopernicusMarineVariable(
+            short_name=sys.intern(var_cube["id"]),
+            standard_name=sys.intern(var_cube["standardName"]),
+            units=sys.intern(var_cube.get("unit") or ""),
+            bbox=bbox,
+            coordinates=_get_coordinates(
+                var_cube["id"],
+                stac_asset,
+                stac_dataset.properties.get("admp_valid_start_date"),
+                coordinates_cache,
+            )
+            or [],
+        )
+        for var_cube in stac_dataset.properties["cube:variables"].values()
+    ]
+
+
+def _get_coordinates(
+    variable_id: str,
+    stac_asset: pystac.Asset,
+    arco_data_metadata_producer_valid_start_date: Optional[str],
+    coordinates_cache: dict[tuple, CopernicusMarineCoordinates],
+) -> Optional[list[CopernicusMarineCoordinates]]:
+    extra_fields_asset = stac_asset.extra_fields
+    dimensions = extra_fields_asset.get("viewDims")
+    if dimensions:
+        coordinates = []
+        for dimension, dimension_metadata in dimensions.items():
+            chunking_length = dimension_metadata.get("chunkLen")
+            if isinstance(chunking_length, dict):
+                chunking_length = chunking_length.get(variable_id)
+            chunk_geometric_factor = dimension_metadata.get(
+                "chunkGeometricFactor", {}
+            ).get(variable_id)
+            cache_key = (dimension, chunking_length, chunk_geometric_factor)
+            if cache_key not in coordinates_cache:
+                coordinates_cache[cache_key] = _get_coordinate(
+                    dimension,
+                    dimension_metadata,
+                    arco_data_metadata_producer_valid_start_date,
+                    chunking_length,
+                    chunk_geometric_factor,
+                )
+            coordinates.append(coordinates_cache[cache_key])
+        return coordinates
+    else:
+        return None
+
+
+def _construct_marine_data_store_dataset(
+    datacubes_by_id: List,
+) -> Optional[ProductDatasetFromMarineDataStore]:
+    dataset_id = datacubes_by_id[0]
+    datacubes = list(datacubes_by_id[1])
+    dataset_name = (
+        datacubes[0].properties["title"] if len(datacubes) == 1 else dataset_id
+    )
+    if datacubes:
+        versions = _get_versions_from_marine_datastore(datacubes)
+        if versions:
+            return ProductDatasetFromMarineDataStore(
+                dataset_id=dataset_id,
+                dataset_name=dataset_name,
+                versions=versions,
+            )
+    return None
+
+
+def _construct_marine_data_store_product(
+    stac_tuple: Tuple[pystac.Collection, List[pystac.Item]],
+) -> ProductFromMarineDataStore:
+    stac_product, stac_datasets = stac_tuple
+    stac_datasets_sorted = sorted(stac_datasets, key=lambda x: x.id)
+    datacubes_by_id = groupby(
+        stac_datasets_sorted,
+        key=lambda x: get_version_and_part_from_full_dataset_id(x.id)[0],
+    )
+
+    datasets = map(
+        _construct_marine_data_store_dataset,  # type: ignore
+        datacubes_by_id,  # type: ignore
+    )
+
+    production_center = [
+        provider.name
+        for provider in stac_product.providers or []
+        if "producer" in provider.roles
+    ]
+
+    production_center_name = production_center[0] if production_center else ""
+
+    thumbnail = stac_product.assets and stac_product.assets.get("thumbnail")
+    digital_object_identifier = (
+        stac_product.extra_fields.get("sci:doi", None)
+        if stac_product.extra_fields
+        else None
+    )
+    sources = _get_stac_product_property(stac_product, "sources") or []
+    processing_level = _get_stac_product_property(
+        stac_product, "processingLevel"
+    )
+
+    return ProductFromMarineDataStore(
+        title=stac_product.title or stac_product.id,
+        product_id=stac_product.id,
+        thumbnail_url=thumbnail.get_absolute_href() if thumbnail else "",
+        description=stac_product.description,
+        digital_object_identifier=digital_object_identifier,
+        sources=sources,
+        processing_level=processing_level,
+        production_center=production_center_name,
+        keywords=stac_product.keywords,
+        datasets=sorted(
+            [dataset for dataset in datasets if dataset],
+            key=lambda dataset: dataset.dataset_id,
+        ),
+    )
+
+
+def _get_stac_product_property(
+    stac_product: pystac.Collection, property_key: str
+) -> Optional[Any]:
+    properties: Dict[str, str] = (
+        stac_product.extra_fields.get("properties", {})
+        if stac_product.extra_fields
+        else {}
+    )
+    return properties.get(property_key)
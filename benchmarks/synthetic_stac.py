@@ -0,0 +1,204 @@
+"""
+Synthetic STAC metadata shaped like the Copernicus Marine Data Store.
+
+The generated collections and items only contain the fields read by the
+catalogue parser, with realistic sizes: explicit depth values, variables
+chunked per dimension, and one native and two ARCO assets per item.
+"""
+from typing import Any, Iterator
+
+ARCO_BASE_URL = "https://s3.waw3-1.cloudferro.com/mdl-arco-{}-001/arco"
+NATIVE_BASE_URL = "https://s3.waw3-1.cloudferro.com/mdl-native-01/native"
+VERSION = "202211"
+BBOX = [-180.0, -80.0, 179.91668701171875, 90.0]
+
+
+def _depth_values(number_of_levels: int) -> list[float]:
+    return [
+        -(0.494025 * (1.18**level) + level * 0.75)
+        for level in range(number_of_levels)
+    ][::-1]
+
+
+def _view_dimensions(
+    variable_ids: list[str], number_of_depth_levels: int, time_chunked: bool
+) -> dict[str, Any]:
+    chunk_length = 1 if time_chunked else 512
+    return {
+        "time": {
+            "chunkLen": {variable_id: 1 for variable_id in variable_ids},
+            "units": "milliseconds since 1970-01-01 00:00:00Z (no leap seconds)",
+            "coords": {
+                "type": "minMaxStep",
+                "min": 1604188800000,
+                "max": 1714608000000,
+                "step": 86400000,
+            },
+        },
+        "elevation": {
+            "chunkLen": {variable_id: 1 for variable_id in variable_ids},
+            "units": "m",
+            "coords": {
+                "type": "explicit",
+                "values": _depth_values(number_of_depth_levels),
+            },
+        },
+        "latitude": {
+            "chunkLen": {
+                variable_id: chunk_length for variable_id in variable_ids
+            },
+            "units": "degrees_north",
+            "chunkType": "default",
+            "chunkRefCoord": 0,
+            "coords": {
+                "type": "minMaxStep",
+                "min": -80,
+                "max": 90,
+                "step": 0.08333333333333333,
+            },
+        },
+        "longitude": {
+            "chunkLen": {
+                variable_id: chunk_length for variable_id in variable_ids
+            },
+            "units": "degrees_east",
+            "chunkType": "default",
+            "chunkRefCoord": 0,
+            "coords": {
+                "type": "minMaxStep",
+                "min": -180,
+                "max": 179.91668701171875,
+                "step": 0.08333333804392655,
+            },
+        },
+    }
+
+
+def synthetic_item(
+    product_id: str,
+    dataset_id: str,
+    number_of_variables: int,
+    number_of_depth_levels: int,
+) -> dict[str, Any]:
+    item_id = f"{dataset_id}_{VERSION}"
+    variable_ids = [f"var{index}" for index in range(number_of_variables)]
+    arco_path = f"{product_id}/{item_id}"
+    return {
+        "id": item_id,
+        "type": "Feature",
+        "stac_version": "1.0.0",
+        "stac_extensions": [
+            "https://stac-extensions.github.io/datacube/v2.1.0/schema.json"
+        ],
+        "geometry": {
+            "type": "Polygon",
+            "coordinates": [
+                [
+                    [BBOX[0], BBOX[1]],
+                    [BBOX[0], BBOX[3]],
+                    [BBOX[2], BBOX[3]],
+                    [BBOX[2], BBOX[1]],
+                    [BBOX[0], BBOX[1]],
+                ]
+            ],
+        },
+        "bbox": BBOX,
+        "properties": {
+            "title": f"daily mean fields of {dataset_id}",
+            "datetime": None,
+            "start_datetime": "2020-11-01T00:00:00Z",
+            "end_datetime": "2024-05-02T00:00:00Z",
+            "cube:variables": {
+                variable_id: {
+                    "id": variable_id,
+                    "standardName": f"sea_water_{variable_id}",
+                    "unit": "1e-3",
+                }
+                for variable_id in variable_ids
+            },
+            "admp_in_preparation": False,
+            "admp_released_date": None,
+            "admp_retired_date": None,
+        },
+        "links": [],
+        "assets": {
+            "native": {
+                "href": f"{NATIVE_BASE_URL}/{arco_path}",
+                "type": "application/x-netcdf",
+                "roles": ["data"],
+            },
+            "timeChunked": {
+                "href": f"{ARCO_BASE_URL.format('time')}/{arco_path}"
+                "/timeChunked.zarr",
+                "type": "application/vnd+zarr",
+                "roles": ["data"],
+                "viewDims": _view_dimensions(
+                    variable_ids, number_of_depth_levels, time_chunked=True
+                ),
+            },
+            "geoChunked": {
+                "href": f"{ARCO_BASE_URL.format('geo')}/{arco_path}"
+                "/geoChunked.zarr",
+                "type": "application/vnd+zarr",
+                "roles": ["data"],
+                "viewDims": _view_dimensions(
+                    variable_ids, number_of_depth_levels, time_chunked=False
+                ),
+            },
+        },
+    }
+
+
+def synthetic_collection(
+    product_id: str, item_ids: list[str]
+) -> dict[str, Any]:
+    return {
+        "id": product_id,
+        "type": "Collection",
+        "stac_version": "1.0.0",
+        "title": f"Synthetic product {product_id}",
+        "description": f"Synthetic product {product_id}. " * 20,
+        "license": "proprietary",
+        "providers": [
+            {"name": "Synthetic producer", "roles": ["producer"]},
+        ],
+        "keywords": ["sea-water-salinity", "global-ocean", "level-4"],
+        "extent": {
+            "spatial": {"bbox": [BBOX]},
+            "temporal": {"interval": [[None, None]]},
+        },
+        "links": [
+            {
+                "rel": "item",
+                "href": f"{item_id}/dataset.stac.json",
+                "type": "application/json",
+            }
+            for item_id in item_ids
+        ],
+    }
+
+
+def synthetic_stac_products(
+    number_of_products: int,
+    datasets_per_product: int,
+    variables_per_dataset: int,
+    number_of_depth_levels: int,
+) -> Iterator[tuple[dict[str, Any], list[dict[str, Any]]]]:
+    """
+    Yield (collection, items) json tuples, as fetched by the catalogue parser.
+    """
+    for product_index in range(number_of_products):
+        product_id = f"SYNTHETIC_PRODUCT_{product_index:04d}"
+        items = [
+            synthetic_item(
+                product_id,
+                f"cmems_synthetic_{product_index:04d}_{dataset_index:03d}",
+                variables_per_dataset,
+                number_of_depth_levels,
+            )
+            for dataset_index in range(datasets_per_product)
+        ]
+        collection = synthetic_collection(
+            product_id, [item["id"] for item in items]
+        )
+        yield collection, items
@@ -12,6 +12,9 @@ logging.config.dictConfig(logging_configuration_dict)
 logging.Formatter.converter = time.gmtime
 
 from copernicusmarine.python_interface.describe import describe
+from copernicusmarine.python_interface.describe_changes import (
+    describe_changes,
+)
 from copernicusmarine.python_interface.get import get
 from copernicusmarine.python_interface.login import login
 from copernicusmarine.python_interface.open_dataset import (
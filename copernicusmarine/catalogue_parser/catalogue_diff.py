@@ -0,0 +1,202 @@
+from dataclasses import dataclass, fields
+from enum import Enum
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from copernicusmarine.catalogue_parser.catalogue_parser import (
+    CopernicusMarineCatalogue,
+    CopernicusMarineProduct,
+    CopernicusMarineProductDataset,
+    CopernicusMarineVersionPart,
+)
+
+
+class CatalogueChangeType(str, Enum):
+    PRODUCT_ADDED = "product_added"
+    PRODUCT_REMOVED = "product_removed"
+    DATASET_ADDED = "dataset_added"
+    DATASET_REMOVED = "dataset_removed"
+    VERSION_ADDED = "version_added"
+    VERSION_REMOVED = "version_removed"
+    PART_ADDED = "part_added"
+    PART_REMOVED = "part_removed"
+    SERVICE_ADDED = "service_added"
+    SERVICE_REMOVED = "service_removed"
+    TIME_EXTENT_CHANGED = "time_extent_changed"
+
+
+@dataclass
+class CatalogueChange:
+    change: CatalogueChangeType
+    product_id: str
+    dataset_id: Optional[str] = None
+    version: Optional[str] = None
+    part: Optional[str] = None
+    service: Optional[str] = None
+    old_value: Optional[Any] = None
+    new_value: Optional[Any] = None
+
+    def to_json_dict(self) -> Dict[str, Any]:
+        values = {
+            attribute.name: getattr(self, attribute.name)
+            for attribute in fields(self)
+        }
+        return {
+            key: value.value if isinstance(value, Enum) else value
+            for key, value in values.items()
+            if value is not None
+        }
+
+
+def diff_catalogues(
+    old_catalogue: CopernicusMarineCatalogue,
+    new_catalogue: CopernicusMarineCatalogue,
+) -> List[CatalogueChange]:
+    """
+    Changes from the old catalogue to the new one.
+
+    Only the highest level of an addition or a removal is reported: a new
+    dataset is reported once, not once per version and part.
+    """
+    return list(
+        _diff_products(
+            _by_key(old_catalogue.products, "product_id"),
+            _by_key(new_catalogue.products, "product_id"),
+        )
+    )
+
+
+def _by_key(objects: List[Any], key: str) -> Dict[str, Any]:
+    return {getattr(obj, key): obj for obj in objects}
+
+
+def _diff_products(
+    old_products: Dict[str, CopernicusMarineProduct],
+    new_products: Dict[str, CopernicusMarineProduct],
+) -> Iterator[CatalogueChange]:
+    for product_id in sorted(old_products.keys() - new_products.keys()):
+        yield CatalogueChange(CatalogueChangeType.PRODUCT_REMOVED, product_id)
+    for product_id, new_product in new_products.items():
+        old_product = old_products.get(product_id)
+        if old_product is None:
+            yield CatalogueChange(
+                CatalogueChangeType.PRODUCT_ADDED, product_id
+            )
+            continue
+        yield from _diff_datasets(
+            product_id,
+            _by_key(old_product.datasets, "dataset_id"),
+            _by_key(new_product.datasets, "dataset_id"),
+        )
+
+
+def _diff_datasets(
+    product_id: str,
+    old_datasets: Dict[str, CopernicusMarineProductDataset],
+    new_datasets: Dict[str, CopernicusMarineProductDataset],
+) -> Iterator[CatalogueChange]:
+    for dataset_id in sorted(old_datasets.keys() - new_datasets.keys()):
+        yield CatalogueChange(
+            CatalogueChangeType.DATASET_REMOVED, product_id, dataset_id
+        )
+    for dataset_id, new_dataset in new_datasets.items():
+        old_dataset = old_datasets.get(dataset_id)
+        if old_dataset is None:
+            yield CatalogueChange(
+                CatalogueChangeType.DATASET_ADDED, product_id, dataset_id
+            )
+            continue
+        old_versions = _by_key(old_dataset.versions, "label")
+        new_versions = _by_key(new_dataset.versions, "label")
+        for label in sorted(old_versions.keys() - new_versions.keys()):
+            yield CatalogueChange(
+                CatalogueChangeType.VERSION_REMOVED,
+                product_id,
+                dataset_id,
+                label,
+            )
+        for label, new_version in new_versions.items():
+            old_version = old_versions.get(label)
+            if old_version is None:
+                yield CatalogueChange(
+                    CatalogueChangeType.VERSION_ADDED,
+                    product_id,
+                    dataset_id,
+                    label,
+                )
+                continue
+            yield from _diff_parts(
+                (product_id, dataset_id, label),
+                _by_key(old_version.parts, "name"),
+                _by_key(new_version.parts, "name"),
+            )
+
+
+def _diff_parts(
+    keys: Tuple[str, str, str],
+    old_parts: Dict[str, CopernicusMarineVersionPart],
+    new_parts: Dict[str, CopernicusMarineVersionPart],
+) -> Iterator[CatalogueChange]:
+    for name in sorted(old_parts.keys() - new_parts.keys()):
+        yield CatalogueChange(CatalogueChangeType.PART_REMOVED, *keys, name)
+    for name, new_part in new_parts.items():
+        old_part = old_parts.get(name)
+        if old_part is None:
+            yield CatalogueChange(CatalogueChangeType.PART_ADDED, *keys, name)
+            continue
+        old_services = {
+            service.service_type.service_name.value
+            for service in old_part.services
+        }
+        new_services = {
+            service.service_type.service_name.value
+            for service in new_part.services
+        }
+        for service_name in sorted(old_services - new_services):
+            yield CatalogueChange(
+                CatalogueChangeType.SERVICE_REMOVED,
+                *keys,
+                name,
+                service=service_name,
+            )
+        for service_name in sorted(new_services - old_services):
+            yield CatalogueChange(
+                CatalogueChangeType.SERVICE_ADDED,
+                *keys,
+                name,
+                service=service_name,
+            )
+        old_time_extent = get_part_time_extent(old_part)
+        new_time_extent = get_part_time_extent(new_part)
+        if old_time_extent != new_time_extent:
+            yield CatalogueChange(
+                CatalogueChangeType.TIME_EXTENT_CHANGED,
+                *keys,
+                name,
+                old_value=old_time_extent,
+                new_value=new_time_extent,
+            )
+
+
+def get_part_time_extent(
+    part: CopernicusMarineVersionPart,
+) -> Optional[List[Any]]:
+    """
+    Minimum and maximum of the time coordinate of the first service and
+    variable of the part that have one.
+    """
+    for service in part.services:
+        for variable in service.variables:
+            for coordinate in variable.coordinates:
+                if coordinate.coordinates_id != "time":
+                    continue
+                if coordinate.values is not None and len(coordinate.values):
+                    return [
+                        _to_builtin(coordinate.values[0]),
+                        _to_builtin(coordinate.values[-1]),
+                    ]
+                return [coordinate.minimum_value, coordinate.maximum_value]
+    return None
+
+
+def _to_builtin(value: Any) -> Any:
+    return value.item() if hasattr(value, "item") else value
@@ -1,38 +1,60 @@
 import asyncio
+import copy
 import logging
+import multiprocessing
+import os
+import pathlib
 import re
+import sqlite3
+import subprocess
+import sys
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from datetime import timedelta
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, fields, is_dataclass
+from datetime import datetime, timedelta
 from enum import Enum
+from functools import lru_cache, partial
 from itertools import groupby
-from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
+from urllib.parse import urljoin, urlparse
 
 import nest_asyncio
+import numpy
 import pystac
 from aiohttp import ContentTypeError, ServerDisconnectedError
-from cachier.core import cachier
 from tqdm import tqdm
 
 from copernicusmarine._version import __version__ as package_version
 from copernicusmarine.aioretry import RetryInfo, RetryPolicyStrategy, retry
+from copernicusmarine.catalogue_parser.catalogue_store import (
+    CatalogueStore,
+    get_catalogue_store_path,
+)
+from copernicusmarine.catalogue_parser.stac_json_cache import StacJsonCache
 from copernicusmarine.command_line_interface.exception_handler import (
     log_exception_debug,
 )
+from copernicusmarine.core_functions.async_executor import (
+    BoundedConcurrencyExecutor,
+)
 from copernicusmarine.core_functions.environment_variables import (
+    COPERNICUSMARINE_CATALOGUE_BUILD_PROCESSES,
     COPERNICUSMARINE_MAX_CONCURRENT_REQUESTS,
+    COPERNICUSMARINE_OFFLINE,
+)
+from copernicusmarine.core_functions.memoization import TimeToLiveCache
+from copernicusmarine.core_functions.metadata_cache import (
+    OfflineMetadataNotCached,
+    log_offline_metadata_age,
 )
 from copernicusmarine.core_functions.sessions import (
     get_configured_aiohttp_session,
     get_https_proxy,
 )
 from copernicusmarine.core_functions.utils import (
-    CACHE_BASE_DIRECTORY,
     construct_query_params_for_marine_data_store_monitoring,
     datetime_parser,
-    map_reject_none,
     next_or_raise_exception,
-    rolling_batch_gather,
 )
 
 logger = logging.getLogger("copernicus_marine_root_logger")
@@ -70,6 +92,14 @@ MARINE_DATA_STORE_STAC_ROOT_CATALOG_URL_STAGING = (
 )
 
 MAX_CONCURRENT_REQUESTS = int(COPERNICUSMARINE_MAX_CONCURRENT_REQUESTS)
+CATALOGUE_BUILD_PROCESSES = (
+    int(COPERNICUSMARINE_CATALOGUE_BUILD_PROCESSES)
+    if COPERNICUSMARINE_CATALOGUE_BUILD_PROCESSES
+    else 0
+)
+CATALOGUE_BUILD_CHUNK_SIZE = 16
+CATALOGUE_STALE_AFTER = timedelta(hours=24)
+DATASET_CATALOGUE_MEMORY_TTL = timedelta(minutes=10)
 
 
 @dataclass(frozen=True)
@@ -146,19 +176,93 @@ VERSION_DEFAULT = "default"
 PART_DEFAULT = "default"
 
 
-@dataclass
-class CopernicusMarineCoordinates:
+# Homogeneous lists of coordinate values are stored as numpy arrays
+CoordinateValues = Union[numpy.ndarray, list[Union[float, int]]]
+
+
+def _compact_coordinate_values(
+    values: Optional[list[Union[float, int]]]
+) -> Optional[CoordinateValues]:
+    if not values:
+        return values
+    if all(type(value) is float for value in values):
+        return numpy.array(values, dtype=numpy.float64)
+    if all(type(value) is int for value in values):
+        try:
+            return numpy.array(values, dtype=numpy.int64)
+        except OverflowError:
+            return values
+    return values
+
+
+def _intern(string: Optional[str]) -> Optional[str]:
+    return sys.intern(string) if string is not None else None
+
+
+@lru_cache(maxsize=4096)
+def _parse_catalogue_datetime(string: str) -> datetime:
+    # The catalogue repeats the same dates across versions and parts
+    return datetime_parser(string)
+
+
+class _SlottedModel:
+    """
+    Base of the slotted classes of the catalogue model.
+
+    They are pickled as a call to their constructor with the values of
+    their slots, which is several times faster to load than the default
+    pickling of slotted classes, for catalogues built in other processes.
+    The slots must be declared in the order of the constructor arguments.
+    """
+
+    __slots__ = ()
+
+    def __reduce__(self):
+        return (
+            self.__class__,
+            tuple(getattr(self, name) for name in self.__slots__),
+        )
+
+
+@dataclass(eq=False)
+class CopernicusMarineCoordinates(_SlottedModel):
+    __slots__ = (
+        "coordinates_id",
+        "units",
+        "minimum_value",
+        "maximum_value",
+        "step",
+        "values",
+        "chunking_length",
+        "chunk_type",
+        "chunk_reference_coordinate",
+        "chunk_geometric_factor",
+    )
     coordinates_id: str
     units: str
     minimum_value: Optional[float]
     maximum_value: Optional[float]
     step: Optional[float]
-    values: Optional[list[Union[float, int]]]
+    values: Optional[CoordinateValues]
     chunking_length: Optional[int]
     chunk_type: Optional[str]
     chunk_reference_coordinate: Optional[int]
     chunk_geometric_factor: Optional[int]
 
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, CopernicusMarineCoordinates):
+            return NotImplemented
+        if (self.values is None) != (other.values is None):
+            return False
+        return all(
+            getattr(self, name) == getattr(other, name)
+            for name in self.__slots__
+            if name != "values"
+        ) and (
+            self.values is None
+            or numpy.array_equal(self.values, other.values)  # type: ignore
+        )
+
     def convert_elevation_to_depth(self):
         self.coordinates_id = "depth"
         minimum_elevation = self.minimum_value
@@ -171,12 +275,15 @@ class CopernicusMarineCoordinates:
             self.minimum_value = -maximum_elevation
         else:
             self.minimum_value = None
-        if self.values is not None:
+        if isinstance(self.values, numpy.ndarray):
+            self.values = -self.values
+        elif self.values is not None:
             self.values = [-value for value in self.values]
 
 
 @dataclass
-class CopernicusMarineVariable:
+class CopernicusMarineVariable(_SlottedModel):
+    __slots__ = ("short_name", "standard_name", "units", "bbox", "coordinates")
     short_name: str
     standard_name: str
     units: str
@@ -185,7 +292,8 @@ class CopernicusMarineVariable:
 
 
 @dataclass
-class CopernicusMarineService:
+class CopernicusMarineService(_SlottedModel):
+    __slots__ = ("service_type", "service_format", "uri", "variables")
     service_type: CopernicusMarineDatasetServiceType
     service_format: Optional[CopernicusMarineServiceFormat]
     uri: str
@@ -193,7 +301,8 @@ class CopernicusMarineService:
 
 
 @dataclass
-class CopernicusMarineVersionPart:
+class CopernicusMarineVersionPart(_SlottedModel):
+    __slots__ = ("name", "services", "retired_date", "released_date")
     name: str
     services: list[CopernicusMarineService]
     retired_date: Optional[str]
@@ -210,7 +319,8 @@ class CopernicusMarineVersionPart:
 
 
 @dataclass
-class CopernicusMarineDatasetVersion:
+class CopernicusMarineDatasetVersion(_SlottedModel):
+    __slots__ = ("label", "parts")
     label: str
     parts: list[CopernicusMarineVersionPart]
 
@@ -225,19 +335,22 @@ class CopernicusMarineDatasetVersion:
                 return part
         raise dataset_version_part_not_found_exception(self)
 
-    def sort_parts(self) -> tuple[Optional[str], Optional[str]]:
+    def sort_parts(
+        self, now: Optional[datetime] = None
+    ) -> tuple[Optional[str], Optional[str]]:
+        now = now or datetime_parser("now")
         not_released_parts = {
             part.name
             for part in self.parts
             if part.released_date
-            and datetime_parser(part.released_date) > datetime_parser("now")
+            and _parse_catalogue_datetime(part.released_date) > now
         }
         will_be_retired_parts = {
-            part.name: datetime_parser(part.retired_date).timestamp()
+            part.name: _parse_catalogue_datetime(part.retired_date).timestamp()
             for part in self.parts
             if part.retired_date
         }
-        max_retired_timestamp = 0
+        max_retired_timestamp = 0.0
         if will_be_retired_parts:
             max_retired_timestamp = max(will_be_retired_parts.values()) + 1
         self.parts = sorted(
@@ -264,7 +377,8 @@ class DatasetVersionNotFound(Exception):
 
 
 @dataclass
-class CopernicusMarineProductDataset:
+class CopernicusMarineProductDataset(_SlottedModel):
+    __slots__ = ("dataset_id", "dataset_name", "versions")
     dataset_id: str
     dataset_name: str
     versions: list[CopernicusMarineDatasetVersion]
@@ -304,14 +418,16 @@ class CopernicusMarineProductDataset:
                 return version
         raise dataset_version_not_found_exception(self)
 
-    def sort_versions(self) -> None:
+    def sort_versions(self, now: Optional[datetime] = None) -> None:
+        now = now or datetime_parser("now")
         not_released_versions: set[str] = set()
         retired_dates = {}
         for version in self.versions:
-            released_date, retired_date = version.sort_parts()
-            if released_date and datetime_parser(
+            released_date, retired_date = version.sort_parts(now)
+            if (
                 released_date
-            ) > datetime_parser("now"):
+                and _parse_catalogue_datetime(released_date) > now
+            ):
                 not_released_versions.add(version.label)
             if retired_date:
                 retired_dates[version.label] = retired_date
@@ -353,7 +469,19 @@ class CopernicusMarineProductProvider:
 
 
 @dataclass
-class CopernicusMarineProduct:
+class CopernicusMarineProduct(_SlottedModel):
+    __slots__ = (
+        "title",
+        "product_id",
+        "thumbnail_url",
+        "description",
+        "digital_object_identifier",
+        "sources",
+        "processing_level",
+        "production_center",
+        "keywords",
+        "datasets",
+    )
     title: str
     product_id: str
     thumbnail_url: str
@@ -374,7 +502,7 @@ class ProductDatasetParser(ABC):
 
     @abstractmethod
     def to_copernicus_marine_dataset(
-        self,
+        self, now: Optional[datetime] = None
     ) -> CopernicusMarineProductDataset:
         ...
 
@@ -394,13 +522,15 @@ class ProductParser(ABC):
 
 @dataclass
 class ProductDatasetFromMarineDataStore(ProductDatasetParser):
-    def to_copernicus_marine_dataset(self) -> CopernicusMarineProductDataset:
+    def to_copernicus_marine_dataset(
+        self, now: Optional[datetime] = None
+    ) -> CopernicusMarineProductDataset:
         dataset = CopernicusMarineProductDataset(
             dataset_id=self.dataset_id,
             dataset_name=self.dataset_name,
             versions=self.versions,
         )
-        dataset.sort_versions()
+        dataset.sort_versions(now)
         return dataset
 
 
@@ -409,6 +539,7 @@ class ProductFromMarineDataStore(ProductParser):
     datasets: list[ProductDatasetFromMarineDataStore]
 
     def to_copernicus_marine_product(self) -> CopernicusMarineProduct:
+        now = datetime_parser("now")
         return CopernicusMarineProduct(
             title=self.title,
             product_id=self.product_id,
@@ -420,20 +551,244 @@ class ProductFromMarineDataStore(ProductParser):
             production_center=self.production_center,
             keywords=self.keywords,
             datasets=[
-                dataset.to_copernicus_marine_dataset()
+                dataset.to_copernicus_marine_dataset(now)
                 for dataset in self.datasets
             ],
         )
 
 
+@dataclass
+class _ServiceUriTrieNode:
+    children: dict[str, "_ServiceUriTrieNode"] = field(default_factory=dict)
+    # Children at which a service URI ends
+    matching_children: dict[str, "_ServiceUriTrieNode"] = field(
+        default_factory=dict
+    )
+    # Position in the catalogue, dataset and service of the first service
+    # whose URI ends at this node
+    match: Optional[
+        Tuple[int, CopernicusMarineProductDataset, CopernicusMarineService]
+    ] = None
+
+
+class CatalogueIndex:
+    """
+    Lookup index over the datasets and service URIs of a catalogue.
+
+    Service URIs are stored in a trie keyed by their "/" separated
+    segments. Resolving a URL walks its segments and gives the same
+    result as testing ``url.startswith(uri)`` against every service in
+    catalogue order.
+    """
+
+    def __init__(self, products: list[CopernicusMarineProduct]) -> None:
+        self.products = products
+        self.datasets: dict[str, CopernicusMarineProductDataset] = {}
+        self.service_uris = _ServiceUriTrieNode()
+        self._search_index: Optional[CatalogueSearchIndex] = None
+        position = 0
+        for product in products:
+            for dataset in product.datasets:
+                self.datasets.setdefault(dataset.dataset_id, dataset)
+                for version in dataset.versions:
+                    for part in version.parts:
+                        for service in part.services:
+                            self._insert_service(position, dataset, service)
+                            position += 1
+
+    def _insert_service(
+        self,
+        position: int,
+        dataset: CopernicusMarineProductDataset,
+        service: CopernicusMarineService,
+    ) -> None:
+        parent = node = self.service_uris
+        segment = ""
+        for segment in service.uri.split("/"):
+            parent = node
+            node = node.children.setdefault(segment, _ServiceUriTrieNode())
+        if node.match is None:
+            node.match = (position, dataset, service)
+            parent.matching_children[segment] = node
+
+    def get_dataset(
+        self, dataset_id: str
+    ) -> Optional[CopernicusMarineProductDataset]:
+        return self.datasets.get(dataset_id)
+
+    def get_search_index(self) -> "CatalogueSearchIndex":
+        if self._search_index is None:
+            self._search_index = CatalogueSearchIndex(self.products)
+        return self._search_index
+
+    def find_service_from_url(
+        self, dataset_url: str
+    ) -> Optional[
+        Tuple[CopernicusMarineProductDataset, CopernicusMarineService]
+    ]:
+        matches: List[
+            Tuple[int, CopernicusMarineProductDataset, CopernicusMarineService]
+        ] = []
+        node: Optional[_ServiceUriTrieNode] = self.service_uris
+        for segment in dataset_url.split("/"):
+            if node is None:
+                break
+            # A URI can also end in the middle of a segment of the URL
+            matches.extend(
+                child.match
+                for key, child in node.matching_children.items()
+                if child.match and segment.startswith(key)
+            )
+            node = node.children.get(segment)
+        if not matches:
+            return None
+        _, dataset, service = min(matches, key=lambda match: match[0])
+        return dataset, service
+
+
+class CatalogueSearchIndex:
+    """
+    Inverted index of the strings of a catalogue.
+
+    Every distinct string of the catalogue (ids, titles, names,
+    keywords, URIs...) is mapped to the objects holding it, and every
+    object to its parents. A search scans the distinct strings once per
+    token, marks the objects leading to a match and projects the matching
+    sub-tree on copies, leaving the catalogue untouched. A string matches
+    if one of the tokens is a substring of it.
+    """
+
+    def __init__(self, products: list[CopernicusMarineProduct]) -> None:
+        self.strings: dict[str, list[Optional[int]]] = {}
+        self.parents: dict[int, list[Optional[int]]] = {}
+        self.products = products
+        self._matches: dict[tuple[str, ...], tuple[set[str], set[int]]] = {}
+        self._index_value(products, None)
+
+    def _index_value(self, value: Any, parent: Optional[int]) -> None:
+        if isinstance(value, str):
+            self.strings.setdefault(value, []).append(parent)
+        elif isinstance(value, Enum):
+            self._index_value(value.value, parent)
+        elif isinstance(value, (list, tuple, dict)) or is_dataclass(value):
+            node = id(value)
+            already_indexed = node in self.parents
+            self.parents.setdefault(node, []).append(parent)
+            if already_indexed:
+                return
+            if isinstance(value, dict):
+                children: Any = [*value.keys(), *value.values()]
+            elif isinstance(value, (list, tuple)):
+                children = value
+            else:
+                children = [
+                    getattr(value, attribute.name)
+                    for attribute in fields(value)
+                ]
+            for child in children:
+                self._index_value(child, node)
+
+    def _match(self, tokens: list[str]) -> tuple[set[str], set[int]]:
+        key = tuple(tokens)
+        if key not in self._matches:
+            matched_strings = {
+                string
+                for string in self.strings
+                if any(token in string for token in tokens)
+            }
+            matched_nodes: set[int] = set()
+            nodes = [
+                node
+                for string in matched_strings
+                for node in self.strings[string]
+            ]
+            while nodes:
+                node = nodes.pop()
+                if node is None or node in matched_nodes:
+                    continue
+                matched_nodes.add(node)
+                nodes.extend(self.parents[node])
+            self._matches[key] = (matched_strings, matched_nodes)
+        return self._matches[key]
+
+    def search(self, tokens: list[str]) -> list[CopernicusMarineProduct]:
+        matched_strings, matched_nodes = self._match(tokens)
+        return (
+            self._project(self.products, matched_strings, matched_nodes) or []
+        )
+
+    def _project(
+        self, value: Any, matched_strings: set[str], matched_nodes: set[int]
+    ) -> Any:
+        if isinstance(value, str):
+            return value if value in matched_strings else None
+        if isinstance(value, Enum):
+            return self._project(value.value, matched_strings, matched_nodes)
+        if id(value) not in matched_nodes:
+            return None
+        if isinstance(value, dict):
+            return {
+                key: item
+                for key, item in value.items()
+                if key in matched_strings
+                or (isinstance(item, str) and item in matched_strings)
+            }
+        if isinstance(value, (list, tuple)):
+            return [
+                projection
+                for projection in (
+                    self._project(item, matched_strings, matched_nodes)
+                    for item in value
+                )
+                if projection is not None
+            ]
+        projection = copy.copy(value)
+        for attribute in fields(value):
+            attribute_projection = self._project(
+                getattr(value, attribute.name), matched_strings, matched_nodes
+            )
+            if attribute_projection:
+                # Also sets the attributes of frozen dataclasses
+                object.__setattr__(
+                    projection, attribute.name, attribute_projection
+                )
+        return projection
+
+
 @dataclass
 class CopernicusMarineCatalogue:
     products: list[CopernicusMarineProduct]
+    _index: CatalogueIndex = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.update_index()
+
+    def update_index(self) -> None:
+        self._index = CatalogueIndex(self.products)
+
+    def get_dataset(
+        self, dataset_id: str
+    ) -> Optional[CopernicusMarineProductDataset]:
+        return self._index.get_dataset(dataset_id)
+
+    def find_service_from_url(
+        self, dataset_url: str
+    ) -> Optional[
+        Tuple[CopernicusMarineProductDataset, CopernicusMarineService]
+    ]:
+        return self._index.find_service_from_url(dataset_url)
+
+    def search(self, tokens: list[str]) -> list[CopernicusMarineProduct]:
+        """
+        Products matching one of the tokens, projected on copies.
+        """
+        return self._index.get_search_index().search(tokens)
 
     def filter(self, tokens: list[str]):
         return filter_catalogue_with_strings(self, tokens)
 
     def filter_only_official_versions_and_parts(self):
+        now = datetime_parser("now")
         products_to_remove = []
         for product in self.products:
             datasets_to_remove = []
@@ -441,9 +796,10 @@ class CopernicusMarineCatalogue:
                 latest_version = dataset.versions[0]
                 parts_to_remove = []
                 for part in latest_version.parts:
-                    if part.released_date and datetime_parser(
+                    if (
                         part.released_date
-                    ) > datetime_parser("now"):
+                        and _parse_catalogue_datetime(part.released_date) > now
+                    ):
                         parts_to_remove.append(part)
                 for part_to_remove in parts_to_remove:
                     latest_version.parts.remove(part_to_remove)
@@ -457,28 +813,60 @@ class CopernicusMarineCatalogue:
                 products_to_remove.append(product)
         for product_to_remove in products_to_remove:
             self.products.remove(product_to_remove)
+        self.update_index()
 
 
 class CatalogParserConnection:
-    def __init__(self, proxy: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        proxy: Optional[str] = None,
+        json_cache: Optional[StacJsonCache] = None,
+        max_concurrent_requests: int = MAX_CONCURRENT_REQUESTS,
+    ) -> None:
         self.proxy = proxy
         self.session = get_configured_aiohttp_session()
         self.proxy = get_https_proxy()
+        self.json_cache = json_cache
+        self.executor = BoundedConcurrencyExecutor(max_concurrent_requests)
         self.__max_retries = 5
         self.__sleep_time = 1
 
     @retry("_retry_policy")
     async def get_json_file(self, url: str) -> dict[str, Any]:
+        return await self.executor.run(self._get_json_file, url, name=url)
+
+    async def _get_json_file(self, url: str) -> dict[str, Any]:
         logger.debug(f"Fetching json file at this url: {url}")
+        cached_json_file = (
+            self.json_cache.get(url) if self.json_cache else None
+        )
         async with self.session.get(
             url,
             params=construct_query_params_for_marine_data_store_monitoring(),
             proxy=self.proxy,
+            headers=(
+                cached_json_file.conditional_request_headers()
+                if cached_json_file
+                else None
+            ),
         ) as response:
-            return await response.json()
+            if cached_json_file and response.status == 304:
+                logger.debug(f"Json file not modified since cached: {url}")
+                return cached_json_file.content
+            json_file = await response.json()
+            if self.json_cache and response.status == 200:
+                self.json_cache.put(
+                    url,
+                    etag=response.headers.get("ETag"),
+                    last_modified=response.headers.get("Last-Modified"),
+                    content=json_file,
+                )
+            return json_file
 
     async def close(self) -> None:
-        await self.session.close()
+        # The session is shared through the transport manager, which owns it
+        # and closes it at exit: closing it here would break the other users
+        pass
 
     def _retry_policy(self, info: RetryInfo) -> RetryPolicyStrategy:
         if not isinstance(
@@ -500,20 +888,43 @@ class CatalogParserConnection:
         return info.fails >= self.__max_retries, info.fails * self.__sleep_time
 
 
+def _is_absolute_href(href: str) -> bool:
+    return bool(urlparse(href).scheme) or os.path.isabs(href)
+
+
+def _get_absolute_href(
+    href: Optional[str], stac_object: dict[str, Any]
+) -> Optional[str]:
+    if href is None or _is_absolute_href(href):
+        return href
+    self_href = next(
+        (
+            link.get("href")
+            for link in stac_object.get("links", [])
+            if link.get("rel") == "self"
+        ),
+        None,
+    )
+    return urljoin(self_href, href) if self_href else None
+
+
 def _construct_copernicus_marine_service(
-    stac_service_name, stac_asset, datacube
+    stac_service_name: str,
+    stac_asset: dict[str, Any],
+    datacube: dict[str, Any],
 ) -> Optional[CopernicusMarineService]:
     try:
-        service_uri = stac_asset.get_absolute_href()
+        service_uri = _get_absolute_href(stac_asset.get("href"), datacube)
         service_type = _service_type_from_web_api_string(stac_service_name)
         service_format = None
-        admp_in_preparation = datacube.properties.get("admp_in_preparation")
-        if stac_asset.media_type and "zarr" in stac_asset.media_type:
+        admp_in_preparation = datacube["properties"].get("admp_in_preparation")
+        media_type = stac_asset.get("type")
+        if media_type and "zarr" in media_type:
             service_format = CopernicusMarineServiceFormat.ZARR
-        elif stac_asset.media_type and "sqlite3" in stac_asset.media_type:
+        elif media_type and "sqlite3" in media_type:
             service_format = CopernicusMarineServiceFormat.SQLITE
 
-        if not service_uri.endswith("/"):
+        if service_uri and not service_uri.endswith("/"):
             if admp_in_preparation and (
                 service_type == CopernicusMarineDatasetServiceType.GEOSERIES
                 or service_type
@@ -534,7 +945,8 @@ def _construct_copernicus_marine_service(
 
 
 def _get_versions_from_marine_datastore(
-    datacubes: List[pystac.Item],
+    datacubes: List[dict[str, Any]],
+    now: datetime,
 ) -> List[CopernicusMarineDatasetVersion]:
     copernicus_marine_dataset_versions: List[
         CopernicusMarineDatasetVersion
@@ -543,15 +955,15 @@ def _get_versions_from_marine_datastore(
     datacubes_by_version = groupby(
         datacubes,
         key=lambda datacube: get_version_and_part_from_full_dataset_id(
-            datacube.id
+            datacube["id"]
         )[1],
     )
     for dataset_version, datacubes in datacubes_by_version:  # type: ignore
-        parts = _get_parts(datacubes)
+        parts = _get_parts(datacubes, now)
 
         if parts:
             version = CopernicusMarineDatasetVersion(
-                label=dataset_version,
+                label=sys.intern(dataset_version),
                 parts=parts,
             )
             copernicus_marine_dataset_versions.append(version)
@@ -560,27 +972,26 @@ def _get_versions_from_marine_datastore(
 
 
 def _get_parts(
-    datacubes: List[pystac.Item],
+    datacubes: List[dict[str, Any]],
+    now: datetime,
 ) -> List[CopernicusMarineVersionPart]:
     parts: List[CopernicusMarineVersionPart] = []
     for datacube in datacubes:
-        released_date = datacube.properties.get("admp_released_date")
-        retired_date = datacube.properties.get("admp_retired_date")
-        if retired_date and datetime_parser(retired_date) < datetime_parser(
-            "now"
-        ):
+        released_date = datacube["properties"].get("admp_released_date")
+        retired_date = datacube["properties"].get("admp_retired_date")
+        if retired_date and _parse_catalogue_datetime(retired_date) < now:
             continue
 
         services = _get_services(datacube)
-        _, _, part = get_version_and_part_from_full_dataset_id(datacube.id)
+        _, _, part = get_version_and_part_from_full_dataset_id(datacube["id"])
 
         if services:
             parts.append(
                 CopernicusMarineVersionPart(
-                    name=part,
+                    name=sys.intern(part),
                     services=services,
-                    retired_date=retired_date,
-                    released_date=released_date,
+                    retired_date=_intern(retired_date),
+                    released_date=_intern(released_date),
                 )
             )
 
@@ -590,12 +1001,11 @@ def _get_parts(
 
 
 def _get_services(
-    datacube: pystac.Item,
+    datacube: dict[str, Any],
 ) -> list[CopernicusMarineService]:
-    stac_assets_dict = datacube.get_assets()
     return [
         dataset_service
-        for stac_service_name, stac_asset in stac_assets_dict.items()
+        for stac_service_name, stac_asset in datacube.get("assets", {}).items()
         if (
             dataset_service := _construct_copernicus_marine_service(
                 stac_service_name, stac_asset, datacube
@@ -620,91 +1030,109 @@ def _format_arco_data_metadata_producer_valid_start_date(
 
 
 def _get_variables(
-    stac_dataset: pystac.Item,
-    stac_asset: pystac.Asset,
+    stac_dataset: dict[str, Any],
+    stac_asset: dict[str, Any],
 ) -> list[CopernicusMarineVariable]:
-    bbox = stac_dataset.bbox
+    bbox = stac_dataset.get("bbox")
+    # Variables of an asset only differ by the chunking of their
+    # coordinates: identical coordinates are shared between them
+    coordinates_cache: dict[tuple, CopernicusMarineCoordinates] = {}
     return [
         CopernicusMarineVariable(
-            short_name=var_cube["id"],
-            standard_name=var_cube["standardName"],
-            units=var_cube.get("unit") or "",
+            short_name=sys.intern(var_cube["id"]),
+            standard_name=sys.intern(var_cube["standardName"]),
+            units=sys.intern(var_cube.get("unit") or ""),
             bbox=bbox,
             coordinates=_get_coordinates(
                 var_cube["id"],
                 stac_asset,
-                stac_dataset.properties.get("admp_valid_start_date"),
+                stac_dataset["properties"].get("admp_valid_start_date"),
+                coordinates_cache,
             )
             or [],
         )
-        for var_cube in stac_dataset.properties["cube:variables"].values()
+        for var_cube in stac_dataset["properties"]["cube:variables"].values()
     ]
 
 
 def _get_coordinates(
     variable_id: str,
-    stac_asset: pystac.Asset,
+    stac_asset: dict[str, Any],
     arco_data_metadata_producer_valid_start_date: Optional[str],
+    coordinates_cache: dict[tuple, CopernicusMarineCoordinates],
 ) -> Optional[list[CopernicusMarineCoordinates]]:
-    extra_fields_asset = stac_asset.extra_fields
-    dimensions = extra_fields_asset.get("viewDims")
+    dimensions = stac_asset.get("viewDims")
     if dimensions:
         coordinates = []
         for dimension, dimension_metadata in dimensions.items():
-            coordinates_info = dimension_metadata.get("coords", {})
-            if (
-                arco_data_metadata_producer_valid_start_date
-                and dimension == "time"
-            ):
-                minimum_value = (
-                    _format_arco_data_metadata_producer_valid_start_date(
-                        arco_data_metadata_producer_valid_start_date,
-                        to_timestamp=isinstance(
-                            coordinates_info.get("min"), int
-                        ),
-                    )
-                )
-            else:
-                minimum_value = coordinates_info.get("min")
             chunking_length = dimension_metadata.get("chunkLen")
             if isinstance(chunking_length, dict):
                 chunking_length = chunking_length.get(variable_id)
-            coordinate = CopernicusMarineCoordinates(
-                coordinates_id=(
-                    "depth" if dimension == "elevation" else dimension
-                ),
-                units=dimension_metadata.get("units") or "",
-                minimum_value=minimum_value,  # type: ignore
-                maximum_value=coordinates_info.get("max"),
-                step=coordinates_info.get("step"),
-                values=coordinates_info.get("values"),
-                chunking_length=chunking_length,
-                chunk_type=dimension_metadata.get("chunkType"),
-                chunk_reference_coordinate=dimension_metadata.get(
-                    "chunkRefCoord"
-                ),
-                chunk_geometric_factor=dimension_metadata.get(
-                    "chunkGeometricFactor", {}
-                ).get(variable_id),
-            )
-            if dimension == "elevation":
-                coordinate.convert_elevation_to_depth()
-            coordinates.append(coordinate)
+            chunk_geometric_factor = dimension_metadata.get(
+                "chunkGeometricFactor", {}
+            ).get(variable_id)
+            cache_key = (dimension, chunking_length, chunk_geometric_factor)
+            if cache_key not in coordinates_cache:
+                coordinates_cache[cache_key] = _get_coordinate(
+                    dimension,
+                    dimension_metadata,
+                    arco_data_metadata_producer_valid_start_date,
+                    chunking_length,
+                    chunk_geometric_factor,
+                )
+            coordinates.append(coordinates_cache[cache_key])
         return coordinates
     else:
         return None
 
 
+def _get_coordinate(
+    dimension: str,
+    dimension_metadata: dict[str, Any],
+    arco_data_metadata_producer_valid_start_date: Optional[str],
+    chunking_length: Optional[int],
+    chunk_geometric_factor: Optional[int],
+) -> CopernicusMarineCoordinates:
+    coordinates_info = dimension_metadata.get("coords", {})
+    if arco_data_metadata_producer_valid_start_date and dimension == "time":
+        minimum_value = _format_arco_data_metadata_producer_valid_start_date(
+            arco_data_metadata_producer_valid_start_date,
+            to_timestamp=isinstance(coordinates_info.get("min"), int),
+        )
+    else:
+        minimum_value = coordinates_info.get("min")
+    coordinate = CopernicusMarineCoordinates(
+        coordinates_id=sys.intern(
+            "depth" if dimension == "elevation" else dimension
+        ),
+        units=sys.intern(dimension_metadata.get("units") or ""),
+        minimum_value=minimum_value,  # type: ignore
+        maximum_value=coordinates_info.get("max"),
+        step=coordinates_info.get("step"),
+        values=_compact_coordinate_values(coordinates_info.get("values")),
+        chunking_length=chunking_length,
+        chunk_type=_intern(dimension_metadata.get("chunkType")),
+        chunk_reference_coordinate=dimension_metadata.get("chunkRefCoord"),
+        chunk_geometric_factor=chunk_geometric_factor,
+    )
+    if dimension == "elevation":
+        coordinate.convert_elevation_to_depth()
+    return coordinate
+
+
 def _construct_marine_data_store_dataset(
     datacubes_by_id: List,
+    now: datetime,
 ) -> Optional[ProductDatasetFromMarineDataStore]:
     dataset_id = datacubes_by_id[0]
     datacubes = list(datacubes_by_id[1])
     dataset_name = (
-        datacubes[0].properties["title"] if len(datacubes) == 1 else dataset_id
+        datacubes[0]["properties"]["title"]
+        if len(datacubes) == 1
+        else dataset_id
     )
     if datacubes:
-        versions = _get_versions_from_marine_datastore(datacubes)
+        versions = _get_versions_from_marine_datastore(datacubes, now)
         if versions:
             return ProductDatasetFromMarineDataStore(
                 dataset_id=dataset_id,
@@ -715,49 +1143,53 @@ def _construct_marine_data_store_dataset(
 
 
 def _construct_marine_data_store_product(
-    stac_tuple: Tuple[pystac.Collection, List[pystac.Item]],
+    stac_tuple: Tuple[dict[str, Any], List[dict[str, Any]]],
 ) -> ProductFromMarineDataStore:
+    """
+    Build the product from the json of its STAC collection and items.
+    """
     stac_product, stac_datasets = stac_tuple
-    stac_datasets_sorted = sorted(stac_datasets, key=lambda x: x.id)
+    now = datetime_parser("now")
+    stac_datasets_sorted = sorted(stac_datasets, key=lambda x: x["id"])
     datacubes_by_id = groupby(
         stac_datasets_sorted,
-        key=lambda x: get_version_and_part_from_full_dataset_id(x.id)[0],
+        key=lambda x: get_version_and_part_from_full_dataset_id(x["id"])[0],
     )
 
-    datasets = map(
-        _construct_marine_data_store_dataset,  # type: ignore
-        datacubes_by_id,  # type: ignore
+    datasets = (
+        _construct_marine_data_store_dataset(datacubes, now)  # type: ignore
+        for datacubes in datacubes_by_id
     )
 
     production_center = [
-        provider.name
-        for provider in stac_product.providers or []
-        if "producer" in provider.roles
+        provider["name"]
+        for provider in stac_product.get("providers") or []
+        if "producer" in (provider.get("roles") or [])
     ]
 
     production_center_name = production_center[0] if production_center else ""
 
-    thumbnail = stac_product.assets and stac_product.assets.get("thumbnail")
-    digital_object_identifier = (
-        stac_product.extra_fields.get("sci:doi", None)
-        if stac_product.extra_fields
-        else None
-    )
+    thumbnail = (stac_product.get("assets") or {}).get("thumbnail")
+    digital_object_identifier = stac_product.get("sci:doi", None)
     sources = _get_stac_product_property(stac_product, "sources") or []
     processing_level = _get_stac_product_property(
         stac_product, "processingLevel"
     )
 
     return ProductFromMarineDataStore(
-        title=stac_product.title or stac_product.id,
-        product_id=stac_product.id,
-        thumbnail_url=thumbnail.get_absolute_href() if thumbnail else "",
-        description=stac_product.description,
+        title=stac_product.get("title") or stac_product["id"],
+        product_id=stac_product["id"],
+        thumbnail_url=(
+            _get_absolute_href(thumbnail.get("href"), stac_product)
+            if thumbnail
+            else ""
+        ),
+        description=stac_product["description"],
         digital_object_identifier=digital_object_identifier,
         sources=sources,
         processing_level=processing_level,
         production_center=production_center_name,
-        keywords=stac_product.keywords,
+        keywords=stac_product.get("keywords"),
         datasets=sorted(
             [dataset for dataset in datasets if dataset],
             key=lambda dataset: dataset.dataset_id,
@@ -766,79 +1198,118 @@ def _construct_marine_data_store_product(
 
 
 def _get_stac_product_property(
-    stac_product: pystac.Collection, property_key: str
+    stac_product: dict[str, Any], property_key: str
 ) -> Optional[Any]:
-    properties: Dict[str, str] = (
-        stac_product.extra_fields.get("properties", {})
-        if stac_product.extra_fields
-        else {}
-    )
+    properties: Dict[str, str] = stac_product.get("properties") or {}
     return properties.get(property_key)
 
 
 async def async_fetch_items_from_collection(
     root_url: str,
     connection: CatalogParserConnection,
-    collection: pystac.Collection,
-) -> List[pystac.Item]:
-    items = []
-    for link in collection.get_item_links():
-        if not link.owner:
-            logger.warning(f"Invalid Item, no owner for: {link.href}")
+    json_collection: dict[str, Any],
+    dataset_id: Optional[str] = None,
+) -> List[dict[str, Any]]:
+    item_urls = []
+    for link in json_collection.get("links", []):
+        if link.get("rel") != "item":
             continue
-        url = root_url + "/" + link.owner.id + "/" + link.href
-        try:
-            item_json = await connection.get_json_file(url)
-            items.append(pystac.Item.from_dict(item_json))
-        except pystac.STACError as exception:
-            message = (
-                "Invalid Item: If datetime is None, a start_datetime "
-                + "and end_datetime must be supplied."
-            )
-            if exception.args[0] != message:
-                logger.error(exception)
-                raise pystac.STACError(exception.args)
-    return items
+        if dataset_id and _get_dataset_id_from_item_href(link["href"]) != (
+            dataset_id
+        ):
+            continue
+        item_urls.append(
+            root_url + "/" + json_collection["id"] + "/" + link["href"]
+        )
+    items = await asyncio.gather(
+        *[async_fetch_item(connection, url) for url in item_urls]
+    )
+    return [item for item in items if item]
+
+
+def _is_valid_stac_item(json_item: dict[str, Any]) -> bool:
+    properties = json_item.get("properties", {})
+    return properties.get("datetime") is not None or (
+        "start_datetime" in properties and "end_datetime" in properties
+    )
+
+
+async def async_fetch_item(
+    connection: CatalogParserConnection, url: str
+) -> Optional[dict[str, Any]]:
+    item_json = await connection.get_json_file(url)
+    if not _is_valid_stac_item(item_json):
+        logger.debug(
+            "Invalid Item: If datetime is None, a start_datetime "
+            f"and end_datetime must be supplied: {url}"
+        )
+        return None
+    return item_json
 
 
 async def async_fetch_collection(
-    root_url: str, connection: CatalogParserConnection, url: str
-) -> Optional[Tuple[pystac.Collection, List[pystac.Item]]]:
+    root_url: str,
+    connection: CatalogParserConnection,
+    url: str,
+    dataset_id: Optional[str] = None,
+) -> Optional[Tuple[dict[str, Any], List[dict[str, Any]]]]:
     json_collection = await connection.get_json_file(url)
-    try:
-        collection = pystac.Collection.from_dict(json_collection)
-        items = await async_fetch_items_from_collection(
-            root_url, connection, collection
-        )
-        return (collection, items)
+    return await async_fetch_collection_items(
+        root_url, connection, json_collection, dataset_id
+    )
+
+
+def _check_stac_collection(json_collection: dict[str, Any]) -> None:
+    # Fields required by pystac.Collection.from_dict
+    for key in ["id", "description", "extent"]:
+        if key not in json_collection:
+            raise KeyError(key)
+    for key in ["spatial", "temporal"]:
+        if key not in json_collection["extent"]:
+            raise KeyError(key)
 
+
+async def async_fetch_collection_items(
+    root_url: str,
+    connection: CatalogParserConnection,
+    json_collection: dict[str, Any],
+    dataset_id: Optional[str] = None,
+) -> Optional[Tuple[dict[str, Any], List[dict[str, Any]]]]:
+    try:
+        _check_stac_collection(json_collection)
     except KeyError as exception:
         messages = ["spatial", "temporal"]
         if exception.args[0] not in messages:
             logger.error(exception)
         return None
+    items = await async_fetch_items_from_collection(
+        root_url, connection, json_collection, dataset_id
+    )
+    return (json_collection, items)
 
 
 async def async_fetch_childs(
     root_url: str,
     connection: CatalogParserConnection,
     child_links: List[pystac.Link],
-) -> Iterator[Optional[Tuple[pystac.Collection, List[pystac.Item]]]]:
-    tasks = []
-    for link in child_links:
-        tasks.append(
-            async_fetch_collection(root_url, connection, link.absolute_href)
+) -> AsyncIterator[Tuple[dict[str, Any], List[dict[str, Any]]]]:
+    # The number of requests in flight is bounded by the connection
+    # executor, for collections and items alike
+    fetch_functions = (
+        partial(
+            async_fetch_collection, root_url, connection, link.absolute_href
         )
-    return filter(
-        lambda x: x is not None,
-        await rolling_batch_gather(tasks, MAX_CONCURRENT_REQUESTS),
+        for link in child_links
     )
+    async for task_result in connection.executor.as_completed(fetch_functions):
+        if task_result.result is not None:
+            yield task_result.result
 
 
-async def async_fetch_catalog(
+async def async_fetch_root_child_links(
     connection: CatalogParserConnection,
     staging: bool = False,
-) -> Iterator[pystac.Collection]:
+) -> List[pystac.Link]:
     catalog_root_url = (
         MARINE_DATA_STORE_STAC_ROOT_CATALOG_URL
         if not staging
@@ -847,14 +1318,172 @@ async def async_fetch_catalog(
     json_catalog = await connection.get_json_file(catalog_root_url)
     catalog = pystac.Catalog.from_dict(json_catalog)
     catalog.set_self_href(catalog_root_url)
-    child_links = catalog.get_child_links()
-    root_url = (
+    return catalog.get_child_links()
+
+
+def _get_root_url(staging: bool) -> str:
+    return (
         MARINE_DATA_STORE_STAC_BASE_URL
         if not staging
         else (MARINE_DATA_STORE_STAC_BASE_URL_STAGING)
     )
-    childs = await async_fetch_childs(root_url, connection, child_links)
-    return childs
+
+
+async def async_fetch_catalog(
+    connection: CatalogParserConnection,
+    staging: bool = False,
+) -> AsyncIterator[Tuple[dict[str, Any], List[dict[str, Any]]]]:
+    child_links = await async_fetch_root_child_links(connection, staging)
+    root_url = _get_root_url(staging)
+    async for child in async_fetch_childs(root_url, connection, child_links):
+        yield child
+
+
+def _get_dataset_id_from_item_href(item_href: str) -> str:
+    full_dataset_id = item_href.split("/")[0]
+    return get_version_and_part_from_full_dataset_id(full_dataset_id)[0]
+
+
+def _get_item_dataset_ids(json_collection: dict[str, Any]) -> List[str]:
+    return [
+        _get_dataset_id_from_item_href(link["href"])
+        for link in json_collection.get("links", [])
+        if link.get("rel") == "item" and link.get("href")
+    ]
+
+
+def _find_dataset_id_in_collection(
+    json_collection: dict[str, Any],
+    dataset_id: Optional[str],
+    dataset_url: Optional[str],
+) -> Optional[str]:
+    dataset_url_segments = dataset_url.split("/") if dataset_url else []
+    for link in json_collection.get("links", []):
+        if link.get("rel") != "item" or not link.get("href"):
+            continue
+        full_dataset_id = link["href"].split("/")[0]
+        item_dataset_id = _get_dataset_id_from_item_href(link["href"])
+        if item_dataset_id == dataset_id or (
+            full_dataset_id in dataset_url_segments
+        ):
+            return item_dataset_id
+    return None
+
+
+def _get_product_id_from_link(link: pystac.Link) -> str:
+    return link.href.split("/")[0]
+
+
+def _get_dataset_area(dataset_id: str) -> Optional[str]:
+    # Dataset ids read cmems_<origin>_<area>_..., and the area (glo, nws,
+    # med...) also starts a segment of the product id, as in
+    # GLOBAL_ANALYSISFORECAST_PHY_001_024 or SEALEVEL_GLO_PHY_L4_NRT_008_046
+    segments = dataset_id.split("_")
+    if len(segments) < 3 or segments[0] != "cmems":
+        return None
+    return segments[2].upper()
+
+
+def _get_candidate_collection_links(
+    child_links: List[pystac.Link],
+    connection: CatalogParserConnection,
+    dataset_id: Optional[str],
+    dataset_url: Optional[str],
+    product_id: Optional[str] = None,
+) -> List[List[pystac.Link]]:
+    """
+    Product collections that may hold the dataset, grouped from the most to
+    the least likely. A group is only fetched if the dataset was not found
+    in the previous ones.
+
+    For a dataset id, the groups are the product found in the catalogue
+    store, the products whose cached collection lists the dataset, the
+    products of the area of the dataset id, then all the others. The last
+    group is only reached for a dataset unknown locally and named against
+    the convention, its cost then grows with the number of products.
+    """
+    if dataset_url:
+        dataset_url_segments = dataset_url.split("/")
+        return [
+            [
+                link
+                for link in child_links
+                if _get_product_id_from_link(link) in dataset_url_segments
+            ]
+        ]
+    stored_product_links = [
+        link
+        for link in child_links
+        if product_id and _get_product_id_from_link(link) == product_id
+    ]
+    cached_product_links = []
+    if connection.json_cache:
+        for link in child_links:
+            cached_json_file = connection.json_cache.get(link.absolute_href)
+            if cached_json_file and dataset_id in _get_item_dataset_ids(
+                cached_json_file.content
+            ):
+                cached_product_links.append(link)
+    area = _get_dataset_area(dataset_id) if dataset_id else None
+    area_product_links = [
+        link
+        for link in child_links
+        if area
+        and any(
+            segment.startswith(area)
+            for segment in _get_product_id_from_link(link).split("_")
+        )
+    ]
+    groups: List[List[pystac.Link]] = []
+    grouped_links: set[str] = set()
+    for links in [
+        stored_product_links,
+        cached_product_links,
+        area_product_links,
+        child_links,
+    ]:
+        group = [link for link in links if link.href not in grouped_links]
+        grouped_links.update(link.href for link in group)
+        if group:
+            groups.append(group)
+    return groups
+
+
+async def async_fetch_dataset_collection(
+    connection: CatalogParserConnection,
+    dataset_id: Optional[str],
+    dataset_url: Optional[str],
+    staging: bool = False,
+    product_id: Optional[str] = None,
+) -> Optional[Tuple[dict[str, Any], List[dict[str, Any]]]]:
+    child_links = await async_fetch_root_child_links(connection, staging)
+    for candidate_links in _get_candidate_collection_links(
+        child_links, connection, dataset_id, dataset_url, product_id
+    ):
+        logger.debug(
+            f"Looking for dataset in {len(candidate_links)} "
+            "product collection(s)"
+        )
+        json_collections = connection.executor.as_completed(
+            partial(connection.get_json_file, link.absolute_href)
+            for link in candidate_links
+        )
+        try:
+            async for task_result in json_collections:
+                json_collection = task_result.result
+                found_dataset_id = _find_dataset_id_in_collection(
+                    json_collection, dataset_id, dataset_url
+                )
+                if found_dataset_id:
+                    return await async_fetch_collection_items(
+                        _get_root_url(staging),
+                        connection,
+                        json_collection,
+                        dataset_id=found_dataset_id,
+                    )
+        finally:
+            await json_collections.aclose()
+    return None
 
 
 def _retrieve_marine_data_store_products(
@@ -863,16 +1492,455 @@ def _retrieve_marine_data_store_products(
 ) -> list[ProductFromMarineDataStore]:
     nest_asyncio.apply()
     loop = asyncio.get_event_loop()
-    marine_data_store_root_collections = loop.run_until_complete(
-        async_fetch_catalog(connection=connection, staging=staging)
+    products = loop.run_until_complete(
+        _async_construct_marine_data_store_products(
+            connection=connection, staging=staging
+        )
+    )
+    connection.executor.log_timings("Catalogue json files fetched")
+    return products
+
+
+async def _async_construct_marine_data_store_products(
+    connection: CatalogParserConnection,
+    staging: bool = False,
+) -> list[ProductFromMarineDataStore]:
+    # Products are constructed as soon as their collection is fetched,
+    # while the other fetches are still running
+    products = []
+    async for stac_tuple in async_fetch_catalog(
+        connection=connection, staging=staging
+    ):
+        products.append(_construct_marine_data_store_product(stac_tuple))
+    return products
+
+
+def _construct_copernicus_marine_products(
+    stac_tuples: List[Tuple[dict[str, Any], List[dict[str, Any]]]]
+) -> List[CopernicusMarineProduct]:
+    products = []
+    for stac_tuple in stac_tuples:
+        marine_data_store_product = _construct_marine_data_store_product(
+            stac_tuple
+        )
+        if marine_data_store_product.datasets:
+            products.append(
+                marine_data_store_product.to_copernicus_marine_product()
+            )
+    return products
+
+
+def _retrieve_products_in_processes(
+    connection: CatalogParserConnection,
+    number_of_processes: int,
+    staging: bool = False,
+) -> List[CopernicusMarineProduct]:
+    nest_asyncio.apply()
+    loop = asyncio.get_event_loop()
+    products = loop.run_until_complete(
+        _async_construct_products_in_processes(
+            async_fetch_catalog(connection=connection, staging=staging),
+            number_of_processes,
+        )
+    )
+    connection.executor.log_timings("Catalogue json files fetched")
+    return products
+
+
+async def _async_construct_products_in_processes(
+    stac_tuples: AsyncIterator[Tuple[dict[str, Any], List[dict[str, Any]]]],
+    number_of_processes: int,
+) -> List[CopernicusMarineProduct]:
+    # Fetched collections are sent by chunks to the worker processes,
+    # while the other fetches are still running
+    loop = asyncio.get_event_loop()
+    with ProcessPoolExecutor(
+        max_workers=number_of_processes,
+        mp_context=multiprocessing.get_context("spawn"),
+    ) as executor:
+        chunks = []
+        chunk: List[Tuple[dict[str, Any], List[dict[str, Any]]]] = []
+        async for stac_tuple in stac_tuples:
+            chunk.append(stac_tuple)
+            if len(chunk) == CATALOGUE_BUILD_CHUNK_SIZE:
+                chunks.append(
+                    loop.run_in_executor(
+                        executor, _construct_copernicus_marine_products, chunk
+                    )
+                )
+                chunk = []
+        if chunk:
+            chunks.append(
+                loop.run_in_executor(
+                    executor, _construct_copernicus_marine_products, chunk
+                )
+            )
+        products_by_chunk = await asyncio.gather(*chunks)
+    return [product for products in products_by_chunk for product in products]
+
+
+def _coordinates_to_dict(
+    coordinates: CopernicusMarineCoordinates,
+) -> dict[str, Any]:
+    coordinates_dict = {
+        name: getattr(coordinates, name) for name in coordinates.__slots__
+    }
+    if isinstance(coordinates.values, numpy.ndarray):
+        coordinates_dict["values"] = coordinates.values.tolist()
+    return coordinates_dict
+
+
+def _variable_to_dict(variable: CopernicusMarineVariable) -> dict[str, Any]:
+    return {
+        "short_name": variable.short_name,
+        "standard_name": variable.standard_name,
+        "units": variable.units,
+        "bbox": variable.bbox,
+        "coordinates": [
+            _coordinates_to_dict(coordinates)
+            for coordinates in variable.coordinates
+        ],
+    }
+
+
+def _coordinates_from_dict(
+    coordinates: dict[str, Any]
+) -> CopernicusMarineCoordinates:
+    return CopernicusMarineCoordinates(
+        **{
+            **coordinates,
+            "coordinates_id": sys.intern(coordinates["coordinates_id"]),
+            "units": sys.intern(coordinates["units"]),
+            "chunk_type": _intern(coordinates["chunk_type"]),
+            "values": _compact_coordinate_values(coordinates["values"]),
+        }
+    )
+
+
+def _variables_from_dicts(
+    variables: list[dict[str, Any]]
+) -> list[CopernicusMarineVariable]:
+    # Identical coordinates of the variables of a service are shared
+    coordinates_cache: dict[str, CopernicusMarineCoordinates] = {}
+
+    def get_coordinates(
+        coordinates: dict[str, Any]
+    ) -> CopernicusMarineCoordinates:
+        cache_key = repr(coordinates)
+        if cache_key not in coordinates_cache:
+            coordinates_cache[cache_key] = _coordinates_from_dict(coordinates)
+        return coordinates_cache[cache_key]
+
+    return [
+        CopernicusMarineVariable(
+            short_name=sys.intern(variable["short_name"]),
+            standard_name=sys.intern(variable["standard_name"]),
+            units=sys.intern(variable["units"]),
+            bbox=variable["bbox"],
+            coordinates=[
+                get_coordinates(coordinates)
+                for coordinates in variable["coordinates"]
+            ],
+        )
+        for variable in variables
+    ]
+
+
+def _service_type_from_service_name(
+    service_name: str,
+) -> CopernicusMarineDatasetServiceType:
+    return next(
+        service_type
+        for service_type in CopernicusMarineDatasetServiceType
+        if service_type.service_name.value == service_name
     )
 
-    products = map_reject_none(
-        _construct_marine_data_store_product,
-        marine_data_store_root_collections,
+
+def _product_to_dict(product: CopernicusMarineProduct) -> dict[str, Any]:
+    return {
+        "title": product.title,
+        "product_id": product.product_id,
+        "thumbnail_url": product.thumbnail_url,
+        "description": product.description,
+        "digital_object_identifier": product.digital_object_identifier,
+        "sources": product.sources,
+        "processing_level": product.processing_level,
+        "production_center": product.production_center,
+        "keywords": product.keywords,
+        "datasets": [
+            {
+                "dataset_id": dataset.dataset_id,
+                "dataset_name": dataset.dataset_name,
+                "versions": [
+                    {
+                        "label": version.label,
+                        "parts": [
+                            {
+                                "name": part.name,
+                                "retired_date": part.retired_date,
+                                "released_date": part.released_date,
+                                "services": [
+                                    {
+                                        "service_type": (
+                                            service.service_type.service_name.value  # noqa: E501
+                                        ),
+                                        "service_format": (
+                                            service.service_format.value
+                                            if service.service_format
+                                            else None
+                                        ),
+                                        "uri": service.uri,
+                                        "variables": [
+                                            _variable_to_dict(variable)
+                                            for variable in service.variables
+                                        ],
+                                    }
+                                    for service in part.services
+                                ],
+                            }
+                            for part in version.parts
+                        ],
+                    }
+                    for version in dataset.versions
+                ],
+            }
+            for dataset in product.datasets
+        ],
+    }
+
+
+def _product_from_dict(product: dict[str, Any]) -> CopernicusMarineProduct:
+    return CopernicusMarineProduct(
+        title=product["title"],
+        product_id=product["product_id"],
+        thumbnail_url=product["thumbnail_url"],
+        description=product["description"],
+        digital_object_identifier=product["digital_object_identifier"],
+        sources=product["sources"],
+        processing_level=product["processing_level"],
+        production_center=product["production_center"],
+        keywords=product["keywords"],
+        datasets=[
+            CopernicusMarineProductDataset(
+                dataset_id=dataset["dataset_id"],
+                dataset_name=dataset["dataset_name"],
+                versions=[
+                    CopernicusMarineDatasetVersion(
+                        label=version["label"],
+                        parts=[
+                            CopernicusMarineVersionPart(
+                                name=part["name"],
+                                retired_date=part["retired_date"],
+                                released_date=part["released_date"],
+                                services=[
+                                    CopernicusMarineService(
+                                        service_type=_service_type_from_service_name(  # noqa: E501
+                                            service["service_type"]
+                                        ),
+                                        service_format=(
+                                            CopernicusMarineServiceFormat(
+                                                service["service_format"]
+                                            )
+                                            if service["service_format"]
+                                            else None
+                                        ),
+                                        uri=service["uri"],
+                                        variables=_variables_from_dicts(
+                                            service["variables"]
+                                        ),
+                                    )
+                                    for service in part["services"]
+                                ],
+                            )
+                            for part in version["parts"]
+                        ],
+                    )
+                    for version in dataset["versions"]
+                ],
+            )
+            for dataset in product["datasets"]
+        ],
+    )
+
+
+def _get_catalogue_store(staging: bool) -> Optional[CatalogueStore]:
+    """
+    Stored catalogue, stale or not.
+
+    A stale catalogue is still served, and refreshed in the background for
+    the next commands unless in offline mode.
+    """
+    catalogue_store = CatalogueStore(get_catalogue_store_path(staging))
+    age = catalogue_store.get_age(package_version)
+    if age is None:
+        return None
+    if COPERNICUSMARINE_OFFLINE:
+        log_offline_metadata_age("catalogue", age, CATALOGUE_STALE_AFTER)
+    elif age > CATALOGUE_STALE_AFTER:
+        _refresh_catalogue_store_in_background(catalogue_store, staging)
+    return catalogue_store
+
+
+def _refresh_catalogue_store_in_background(
+    catalogue_store: CatalogueStore, staging: bool
+) -> None:
+    refresh_lock_token = catalogue_store.acquire_refresh_lock()
+    if refresh_lock_token is None:
+        logger.debug("Catalogue cache is already being refreshed")
+        return
+    logger.debug("Catalogue cache is stale, refreshing it in the background")
+    command = [
+        sys.executable,
+        "-m",
+        "copernicusmarine.command_line_interface.copernicus_marine",
+        "describe",
+        "--refresh-cache",
+        "--disable-progress-bar",
+        "--log-level",
+        "QUIET",
+        "--refresh-lock-token",
+        refresh_lock_token,
+    ]
+    if staging:
+        command.append("--staging")
+    try:
+        subprocess.Popen(
+            command,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+    except OSError as e:
+        logger.debug(f"Could not start the catalogue cache refresh: {e}")
+        catalogue_store.release_refresh_lock(refresh_lock_token)
+
+
+def _load_catalogue_from_store(
+    staging: bool,
+) -> Optional[CopernicusMarineCatalogue]:
+    catalogue_store = _get_catalogue_store(staging)
+    if catalogue_store is None:
+        return None
+    try:
+        products = catalogue_store.load_products()
+    except (sqlite3.Error, KeyError, TypeError, ValueError) as e:
+        logger.debug(f"Error while loading the catalogue from cache: {e}")
+        return None
+    return CopernicusMarineCatalogue(
+        products=[_product_from_dict(product) for product in products]
+    )
+
+
+def _load_dataset_catalogue_from_store(
+    dataset_id: Optional[str],
+    dataset_url: Optional[str],
+    staging: bool,
+) -> Optional[CopernicusMarineCatalogue]:
+    catalogue_store = _get_catalogue_store(staging)
+    if catalogue_store is None:
+        return None
+    try:
+        if dataset_id is None and dataset_url is not None:
+            dataset_id = catalogue_store.find_dataset_id_from_url(dataset_url)
+        product = (
+            catalogue_store.load_product_with_dataset(dataset_id)
+            if dataset_id
+            else None
+        )
+    except (sqlite3.Error, KeyError, TypeError, ValueError) as e:
+        logger.debug(f"Error while loading the dataset from cache: {e}")
+        return None
+    if product is None:
+        return None
+    return CopernicusMarineCatalogue(products=[_product_from_dict(product)])
+
+
+def _find_stored_product_id(dataset_id: str, staging: bool) -> Optional[str]:
+    """
+    Product of the dataset in the stored catalogue, even outdated, to fetch
+    its collection first.
+    """
+    catalogue_store = CatalogueStore(get_catalogue_store_path(staging))
+    try:
+        return catalogue_store.find_product_id(dataset_id)
+    except sqlite3.Error as e:
+        logger.debug(f"Could not read the catalogue cache: {e}")
+        return None
+
+
+def _write_catalogue_to_store(
+    catalogue: CopernicusMarineCatalogue, staging: bool
+) -> None:
+    catalogue_store = CatalogueStore(get_catalogue_store_path(staging))
+    try:
+        catalogue_store.write(
+            (_product_to_dict(product) for product in catalogue.products),
+            package_version=package_version,
+        )
+    except (OSError, sqlite3.Error) as e:
+        logger.debug(f"Could not write the catalogue cache: {e}")
+
+
+def refresh_catalogue_cache(
+    disable_progress_bar: bool,
+    staging: bool = False,
+    refresh_lock_token: Optional[str] = None,
+) -> CopernicusMarineCatalogue:
+    """
+    Fetch the catalogue and replace the cached one.
+
+    The cached catalogue is replaced atomically once the new one is
+    written: commands running meanwhile keep reading the previous one.
+    The STAC files are revalidated with conditional requests, so only
+    the changed ones are downloaded.
+
+    The refresh lock is only released with the token of the command that
+    took it, so that a refresh run meanwhile does not release the lock of
+    a background refresh.
+    """
+    logger.debug("Refreshing catalogue cache...")
+    try:
+        catalog = _parse_catalogue(
+            disable_progress_bar=disable_progress_bar,
+            staging=staging,
+            use_json_cache=True,
+        )
+        _write_catalogue_to_store(catalog, staging)
+    finally:
+        if refresh_lock_token is not None:
+            CatalogueStore(
+                get_catalogue_store_path(staging)
+            ).release_refresh_lock(refresh_lock_token)
+    logger.debug("Catalogue cache refreshed")
+    return catalog
+
+
+def write_catalogue_snapshot(
+    catalogue: CopernicusMarineCatalogue, path: pathlib.Path
+) -> None:
+    CatalogueStore(path).write(
+        (_product_to_dict(product) for product in catalogue.products),
+        package_version=package_version,
     )
 
-    return list(products)
+
+def load_catalogue_snapshot(
+    path: pathlib.Path,
+) -> Optional[CopernicusMarineCatalogue]:
+    """
+    Catalogue written by write_catalogue_snapshot, None if there is none.
+    """
+    if not path.exists():
+        return None
+    try:
+        products = CatalogueStore(path).load_products()
+    except (sqlite3.Error, KeyError, TypeError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable catalogue snapshot {path}: {e}")
+        return None
+    return CopernicusMarineCatalogue(
+        products=[_product_from_dict(product) for product in products]
+    )
 
 
 def parse_catalogue(
@@ -881,58 +1949,188 @@ def parse_catalogue(
     staging: bool = False,
 ) -> CopernicusMarineCatalogue:
     logger.debug("Parsing catalogue...")
+    if not no_metadata_cache or COPERNICUSMARINE_OFFLINE:
+        catalog = _load_catalogue_from_store(staging)
+        if catalog is not None:
+            logger.debug("Catalogue loaded from cache")
+            return catalog
+    if COPERNICUSMARINE_OFFLINE:
+        raise OfflineMetadataNotCached("catalogue")
+    catalog = _parse_catalogue(
+        disable_progress_bar=disable_progress_bar,
+        staging=staging,
+        use_json_cache=not no_metadata_cache,
+    )
+    if not no_metadata_cache:
+        _write_catalogue_to_store(catalog, staging)
+    logger.debug("Catalogue parsed")
+    return catalog
+
+
+def _get_catalogue_store_version(staging: bool) -> Optional[int]:
     try:
-        catalog = _parse_catalogue(
-            ignore_cache=no_metadata_cache,
-            _versions=package_version,
+        return get_catalogue_store_path(staging).stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+_dataset_catalogues_in_memory: TimeToLiveCache[
+    CopernicusMarineCatalogue
+] = TimeToLiveCache(DATASET_CATALOGUE_MEMORY_TTL)
+
+
+def parse_dataset_catalogue(
+    dataset_id: Optional[str],
+    dataset_url: Optional[str],
+    no_metadata_cache: bool,
+    disable_progress_bar: bool,
+    staging: bool = False,
+) -> CopernicusMarineCatalogue:
+    """
+    Return a catalogue restricted to the product containing the dataset.
+
+    Only the root catalog, the product collection and the items of the
+    requested dataset are fetched. Falls back to the whole catalogue if
+    the dataset cannot be located this way.
+
+    Unless no_metadata_cache is set, the catalogue is kept in memory for
+    DATASET_CATALOGUE_MEMORY_TTL, or until the cached catalogue changes.
+    """
+    if no_metadata_cache:
+        return _parse_dataset_catalogue(
+            dataset_id=dataset_id,
+            dataset_url=dataset_url,
+            no_metadata_cache=no_metadata_cache,
             disable_progress_bar=disable_progress_bar,
             staging=staging,
         )
-    except ValueError as e:
-        logger.debug(f"Error while parsing catalogue: {e}")
+    memory_key = (
+        dataset_id,
+        dataset_url,
+        staging,
+        _get_catalogue_store_version(staging),
+    )
+    catalog = _dataset_catalogues_in_memory.get(memory_key)
+    if catalog is not None:
+        logger.debug("Dataset catalogue found in memory")
+        return catalog
+    catalog = _parse_dataset_catalogue(
+        dataset_id=dataset_id,
+        dataset_url=dataset_url,
+        no_metadata_cache=no_metadata_cache,
+        disable_progress_bar=disable_progress_bar,
+        staging=staging,
+    )
+    _dataset_catalogues_in_memory.put(memory_key, catalog)
+    return catalog
+
+
+def _parse_dataset_catalogue(
+    dataset_id: Optional[str],
+    dataset_url: Optional[str],
+    no_metadata_cache: bool,
+    disable_progress_bar: bool,
+    staging: bool,
+) -> CopernicusMarineCatalogue:
+    if dataset_id is None and dataset_url is None:
+        syntax_error = SyntaxError(
+            "Must specify at least one of "
+            "'dataset_url' or 'dataset_id' options"
+        )
+        raise syntax_error
+    if not no_metadata_cache or COPERNICUSMARINE_OFFLINE:
+        catalog = _load_dataset_catalogue_from_store(
+            dataset_id, dataset_url, staging
+        )
+        if catalog is not None:
+            logger.debug("Dataset catalogue loaded from cache")
+            return catalog
+    if COPERNICUSMARINE_OFFLINE:
+        return parse_catalogue(
+            no_metadata_cache=no_metadata_cache,
+            disable_progress_bar=disable_progress_bar,
+            staging=staging,
+        )
+    logger.debug("Parsing catalogue for the requested dataset...")
+    progress_bar = tqdm(
+        total=1, desc="Fetching catalog", disable=disable_progress_bar
+    )
+    connection = CatalogParserConnection(
+        json_cache=StacJsonCache() if not no_metadata_cache else None
+    )
+    nest_asyncio.apply()
+    loop = asyncio.get_event_loop()
+    stac_tuple = loop.run_until_complete(
+        async_fetch_dataset_collection(
+            connection=connection,
+            dataset_id=dataset_id,
+            dataset_url=dataset_url,
+            staging=staging,
+            product_id=(
+                _find_stored_product_id(dataset_id, staging)
+                if dataset_id
+                else None
+            ),
+        )
+    )
+    progress_bar.update()
+    product = (
+        _construct_marine_data_store_product(
+            stac_tuple
+        ).to_copernicus_marine_product()
+        if stac_tuple
+        else None
+    )
+    if product is None or not product.datasets:
         logger.debug(
-            "Now retrying without cache. If the problem with "
-            "the cache persists, try running "
-            "copernicusmarine describe --overwrite-metadata-cache"
+            "Dataset not found in its product collection, "
+            "parsing the whole catalogue"
         )
-        catalog = _parse_catalogue(
-            ignore_cache=True,
-            _versions=package_version,
+        return parse_catalogue(
+            no_metadata_cache=no_metadata_cache,
             disable_progress_bar=disable_progress_bar,
             staging=staging,
         )
     logger.debug("Catalogue parsed")
-    return catalog
+    return CopernicusMarineCatalogue(products=[product])
 
 
-@cachier(cache_dir=CACHE_BASE_DIRECTORY, stale_after=timedelta(hours=24))
 def _parse_catalogue(
-    _versions: str,  # force cachier to overwrite cache in case of version update
     disable_progress_bar: bool,
     staging: bool = False,
+    use_json_cache: bool = True,
 ) -> CopernicusMarineCatalogue:
     progress_bar = tqdm(
         total=3, desc="Fetching catalog", disable=disable_progress_bar
     )
-    connection = CatalogParserConnection()
-
-    marine_data_store_products = _retrieve_marine_data_store_products(
-        connection=connection, staging=staging
+    connection = CatalogParserConnection(
+        json_cache=StacJsonCache() if use_json_cache else None
     )
-    progress_bar.update()
 
-    products_merged: List[CopernicusMarineProduct] = [
-        marine_data_store_product.to_copernicus_marine_product()
-        for marine_data_store_product in marine_data_store_products
-        if marine_data_store_product.datasets
-    ]
+    products_merged: List[CopernicusMarineProduct]
+    if CATALOGUE_BUILD_PROCESSES > 0:
+        products_merged = _retrieve_products_in_processes(
+            connection=connection,
+            number_of_processes=CATALOGUE_BUILD_PROCESSES,
+            staging=staging,
+        )
+        progress_bar.update()
+    else:
+        marine_data_store_products = _retrieve_marine_data_store_products(
+            connection=connection, staging=staging
+        )
+        progress_bar.update()
+        products_merged = [
+            marine_data_store_product.to_copernicus_marine_product()
+            for marine_data_store_product in marine_data_store_products
+            if marine_data_store_product.datasets
+        ]
     products_merged.sort(key=lambda x: x.product_id)
     progress_bar.update()
 
     full_catalog = CopernicusMarineCatalogue(products=products_merged)
 
     progress_bar.update()
-    asyncio.run(connection.close())
 
     return full_catalog
 
@@ -948,6 +2146,9 @@ class DistinctDatasetVersionPart:
 
 
 REGEX_PATTERN_DATE_YYYYMM = r"[12]\d{3}(0[1-9]|1[0-2])"
+FULL_DATASET_ID_PATTERN = re.compile(
+    rf"^(.*?)(?:_({REGEX_PATTERN_DATE_YYYYMM}))?$"
+)
 PART_SEPARATOR = "--ext--"
 
 
@@ -959,8 +2160,7 @@ def get_version_and_part_from_full_dataset_id(
     else:
         name_with_maybe_version = full_dataset_id
         part = PART_DEFAULT
-    pattern = rf"^(.*?)(?:_({REGEX_PATTERN_DATE_YYYYMM}))?$"
-    match = re.match(pattern, name_with_maybe_version)
+    match = FULL_DATASET_ID_PATTERN.match(name_with_maybe_version)
     if match:
         dataset_name = match.group(1)
         version = match.group(2) or VERSION_DEFAULT
@@ -983,68 +2183,14 @@ def get_product_from_url(
     filtered_catalogue = filter_catalogue_with_strings(
         catalogue, [dataset_url]
     )
-    if filtered_catalogue is None:
+    if not filtered_catalogue:
         error = TypeError("filtered catalogue is empty")
         raise error
-    if isinstance(filtered_catalogue, CopernicusMarineCatalogue):
-        return filtered_catalogue.products[0]
     return filtered_catalogue["products"][0]
 
 
 def filter_catalogue_with_strings(
     catalogue: CopernicusMarineCatalogue, tokens: list[str]
 ) -> dict[str, Any]:
-    return find_match_object(catalogue, tokens) or {}
-
-
-def find_match_object(value: Any, tokens: list[str]) -> Any:
-    match: Any
-    if isinstance(value, str):
-        match = find_match_string(value, tokens)
-    elif isinstance(value, Enum):
-        match = find_match_enum(value, tokens)
-    elif isinstance(value, tuple):
-        match = find_match_tuple(value, tokens)
-    elif isinstance(value, list):
-        match = find_match_list(value, tokens)
-    elif hasattr(value, "__dict__"):
-        match = find_match_dict(value, tokens)
-    else:
-        match = None
-    return match
-
-
-def find_match_string(string: str, tokens: list[str]) -> Optional[str]:
-    return string if any(token in string for token in tokens) else None
-
-
-def find_match_enum(enum: Enum, tokens: list[str]) -> Any:
-    return find_match_object(enum.value, tokens)
-
-
-def find_match_tuple(tuple: Tuple, tokens: list[str]) -> Optional[list[Any]]:
-    return find_match_list(list(tuple), tokens)
-
-
-def find_match_list(object_list: list[Any], tokens) -> Optional[list[Any]]:
-    def find_match(element: Any) -> Optional[Any]:
-        return find_match_object(element, tokens)
-
-    filtered_list: list[Any] = list(map_reject_none(find_match, object_list))
-    return filtered_list if filtered_list else None
-
-
-def find_match_dict(
-    structure: dict[str, Any], tokens
-) -> Optional[dict[str, Any]]:
-    filtered_dict = {
-        key: find_match_object(value, tokens)
-        for key, value in structure.__dict__.items()
-        if find_match_object(value, tokens)
-    }
-
-    found_match = any(filtered_dict.values())
-    if found_match:
-        new_dict = dict(structure.__dict__, **filtered_dict)
-        structure.__dict__ = new_dict
-    return structure if found_match else None
+    products = catalogue.search(tokens)
+    return {"products": products} if products else {}
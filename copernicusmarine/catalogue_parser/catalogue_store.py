@@ -0,0 +1,431 @@
+import json
+import logging
+import os
+import pathlib
+import sqlite3
+import tempfile
+import uuid
+import zlib
+from contextlib import closing
+from datetime import datetime, timedelta
+from typing import Any, Iterable, Optional
+
+from copernicusmarine.core_functions.utils import CACHE_BASE_DIRECTORY
+
+logger = logging.getLogger("copernicus_marine_root_logger")
+
+CATALOGUE_STORE_SCHEMA_VERSION = "1"
+REFRESH_LOCK_EXPIRES_AFTER = timedelta(minutes=30)
+
+_SCHEMA = """
+CREATE TABLE metadata (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE products (
+    product_position INTEGER PRIMARY KEY,
+    product_id TEXT NOT NULL,
+    content TEXT NOT NULL
+);
+CREATE TABLE datasets (
+    product_position INTEGER NOT NULL,
+    dataset_position INTEGER NOT NULL,
+    dataset_id TEXT NOT NULL,
+    dataset_name TEXT NOT NULL,
+    PRIMARY KEY (product_position, dataset_position)
+);
+CREATE TABLE parts (
+    product_position INTEGER NOT NULL,
+    dataset_position INTEGER NOT NULL,
+    version_position INTEGER NOT NULL,
+    part_position INTEGER NOT NULL,
+    dataset_id TEXT NOT NULL,
+    version TEXT NOT NULL,
+    part TEXT NOT NULL,
+    retired_date TEXT,
+    released_date TEXT,
+    PRIMARY KEY (
+        product_position, dataset_position, version_position, part_position
+    )
+);
+CREATE TABLE services (
+    product_position INTEGER NOT NULL,
+    dataset_position INTEGER NOT NULL,
+    version_position INTEGER NOT NULL,
+    part_position INTEGER NOT NULL,
+    service_position INTEGER NOT NULL,
+    dataset_id TEXT NOT NULL,
+    version TEXT NOT NULL,
+    part TEXT NOT NULL,
+    service_type TEXT NOT NULL,
+    service_format TEXT,
+    uri TEXT NOT NULL,
+    variables BLOB NOT NULL
+);
+CREATE INDEX products_product_id ON products (product_id);
+CREATE INDEX datasets_dataset_id ON datasets (dataset_id);
+CREATE INDEX parts_dataset_id_version_part ON parts (dataset_id, version, part);
+CREATE INDEX services_dataset_id_version_part
+    ON services (dataset_id, version, part);
+CREATE INDEX services_uri ON services (uri);
+"""
+
+
+def get_catalogue_store_path(staging: bool) -> pathlib.Path:
+    filename = "catalogue_staging.sqlite3" if staging else "catalogue.sqlite3"
+    return CACHE_BASE_DIRECTORY / filename
+
+
+def _encode_variables(variables: list[dict[str, Any]]) -> bytes:
+    return zlib.compress(json.dumps(variables).encode("utf-8"))
+
+
+def _decode_variables(blob: bytes) -> list[dict[str, Any]]:
+    return json.loads(zlib.decompress(blob).decode("utf-8"))
+
+
+def _get_url_origin(url: str) -> str:
+    """
+    Scheme and host of the URL, that any service URI prefix of it starts
+    with.
+    """
+    host_end = url.find("/", url.find("://") + 3)
+    return url if host_end == -1 else url[:host_end]
+
+
+class CatalogueStore:
+    """
+    Indexed on-disk store of the catalogue.
+
+    Products are stored as nested dictionaries (product, datasets,
+    versions, parts, services) split into indexed tables, so that looking
+    up one dataset only reads the rows of this dataset. The variables of
+    the services, which hold the coordinates values, are stored compressed
+    and only decoded for the services that are loaded.
+    """
+
+    def __init__(self, path: pathlib.Path) -> None:
+        self.path = path
+
+    @property
+    def refresh_lock_path(self) -> pathlib.Path:
+        return self.path.with_name(self.path.name + ".refresh")
+
+    def acquire_refresh_lock(self) -> Optional[str]:
+        """
+        Mark the store as being refreshed, None if a refresh started less
+        than REFRESH_LOCK_EXPIRES_AFTER ago is still marked.
+
+        Returns the token of the lock, that the refresh passes to
+        ``release_refresh_lock`` once done.
+        """
+        try:
+            lock_age = datetime.now() - datetime.fromtimestamp(
+                self.refresh_lock_path.stat().st_mtime
+            )
+            if lock_age < REFRESH_LOCK_EXPIRES_AFTER:
+                return None
+            self.release_refresh_lock()
+        except FileNotFoundError:
+            pass
+        token = uuid.uuid4().hex
+        try:
+            self.refresh_lock_path.parent.mkdir(parents=True, exist_ok=True)
+            file_descriptor = os.open(
+                self.refresh_lock_path,
+                os.O_CREAT | os.O_EXCL | os.O_WRONLY,
+            )
+            with os.fdopen(file_descriptor, "w") as lock_file:
+                lock_file.write(token)
+        except OSError as exception:
+            logger.debug(f"Could not lock catalogue store: {exception}")
+            return None
+        return token
+
+    def release_refresh_lock(self, token: Optional[str] = None) -> None:
+        """
+        Remove the refresh mark. With a token, the mark is only removed if
+        it is still the one of this token.
+        """
+        try:
+            if token is not None:
+                with open(self.refresh_lock_path) as lock_file:
+                    if lock_file.read() != token:
+                        return
+            os.remove(self.refresh_lock_path)
+        except FileNotFoundError:
+            pass
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(
+            f"{self.path.absolute().as_uri()}?mode=ro", uri=True
+        )
+
+    def get_age(self, package_version: str) -> Optional[timedelta]:
+        """
+        Age of the stored catalogue, None if it is missing or incompatible.
+        """
+        if not self.path.exists():
+            return None
+        try:
+            with closing(self._connect()) as connection:
+                metadata = dict(
+                    connection.execute("SELECT key, value FROM metadata")
+                )
+        except sqlite3.Error as exception:
+            logger.debug(f"Could not read catalogue store: {exception}")
+            return None
+        if (
+            metadata.get("schema_version") != CATALOGUE_STORE_SCHEMA_VERSION
+            or metadata.get("package_version") != package_version
+            or "created_at" not in metadata
+        ):
+            return None
+        return datetime.now() - datetime.fromisoformat(metadata["created_at"])
+
+    def write(
+        self, products: Iterable[dict[str, Any]], package_version: str
+    ) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        file_descriptor, temporary_path = tempfile.mkstemp(
+            dir=self.path.parent, suffix=".tmp"
+        )
+        os.close(file_descriptor)
+        try:
+            with closing(sqlite3.connect(temporary_path)) as connection:
+                connection.executescript(_SCHEMA)
+                connection.executemany(
+                    "INSERT INTO metadata VALUES (?, ?)",
+                    [
+                        ("schema_version", CATALOGUE_STORE_SCHEMA_VERSION),
+                        ("package_version", package_version),
+                        ("created_at", datetime.now().isoformat()),
+                    ],
+                )
+                for product_position, product in enumerate(products):
+                    self._insert_product(connection, product_position, product)
+                connection.commit()
+            os.replace(temporary_path, self.path)
+        finally:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+
+    @staticmethod
+    def _insert_product(
+        connection: sqlite3.Connection,
+        product_position: int,
+        product: dict[str, Any],
+    ) -> None:
+        product_content = {
+            key: value for key, value in product.items() if key != "datasets"
+        }
+        connection.execute(
+            "INSERT INTO products VALUES (?, ?, ?)",
+            (
+                product_position,
+                product["product_id"],
+                json.dumps(product_content),
+            ),
+        )
+        for dataset_position, dataset in enumerate(product["datasets"]):
+            dataset_id = dataset["dataset_id"]
+            connection.execute(
+                "INSERT INTO datasets VALUES (?, ?, ?, ?)",
+                (
+                    product_position,
+                    dataset_position,
+                    dataset_id,
+                    dataset["dataset_name"],
+                ),
+            )
+            for version_position, version in enumerate(dataset["versions"]):
+                for part_position, part in enumerate(version["parts"]):
+                    positions = (
+                        product_position,
+                        dataset_position,
+                        version_position,
+                        part_position,
+                    )
+                    keys = (dataset_id, version["label"], part["name"])
+                    connection.execute(
+                        "INSERT INTO parts VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        positions
+                        + keys
+                        + (part["retired_date"], part["released_date"]),
+                    )
+                    connection.executemany(
+                        "INSERT INTO services VALUES "
+                        "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        [
+                            positions
+                            + (service_position,)
+                            + keys
+                            + (
+                                service["service_type"],
+                                service["service_format"],
+                                service["uri"],
+                                _encode_variables(service["variables"]),
+                            )
+                            for service_position, service in enumerate(
+                                part["services"]
+                            )
+                        ],
+                    )
+
+    def load_products(self) -> list[dict[str, Any]]:
+        with closing(self._connect()) as connection:
+            return self._load_products(connection, dataset_id=None)
+
+    def load_product_with_dataset(
+        self, dataset_id: str
+    ) -> Optional[dict[str, Any]]:
+        """
+        Product containing the dataset, with only this dataset.
+        """
+        with closing(self._connect()) as connection:
+            products = self._load_products(connection, dataset_id=dataset_id)
+        return products[0] if products else None
+
+    def find_product_id(self, dataset_id: str) -> Optional[str]:
+        if not self.path.exists():
+            return None
+        with closing(self._connect()) as connection:
+            row = connection.execute(
+                "SELECT product_id FROM datasets JOIN products "
+                "USING (product_position) WHERE dataset_id = ? LIMIT 1",
+                (dataset_id,),
+            ).fetchone()
+        return row[0] if row else None
+
+    def find_dataset_id_from_url(self, dataset_url: str) -> Optional[str]:
+        """
+        Dataset of the first service, in catalogue order, whose URI is a
+        prefix of the URL, as ``CatalogueIndex.find_service_from_url``.
+
+        The URIs prefix of the URL sort between its scheme and host and
+        the URL itself, so only this range of the index is scanned.
+        """
+        with closing(self._connect()) as connection:
+            row = connection.execute(
+                "SELECT dataset_id FROM services "
+                "WHERE uri >= ? AND uri <= ? "
+                "AND substr(?, 1, length(uri)) = uri "
+                "ORDER BY product_position, dataset_position, "
+                "version_position, part_position, service_position LIMIT 1",
+                (_get_url_origin(dataset_url), dataset_url, dataset_url),
+            ).fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def _load_products(
+        connection: sqlite3.Connection, dataset_id: Optional[str]
+    ) -> list[dict[str, Any]]:
+        dataset_filter = "WHERE dataset_id = ?" if dataset_id else ""
+        parameters = (dataset_id,) if dataset_id else ()
+        datasets: dict[tuple[int, int], dict[str, Any]] = {}
+        products: dict[int, list[dict[str, Any]]] = {}
+        for (
+            product_position,
+            dataset_position,
+            row_dataset_id,
+            dataset_name,
+        ) in connection.execute(
+            "SELECT product_position, dataset_position, dataset_id, "
+            f"dataset_name FROM datasets {dataset_filter} "
+            "ORDER BY product_position, dataset_position",
+            parameters,
+        ):
+            dataset = {
+                "dataset_id": row_dataset_id,
+                "dataset_name": dataset_name,
+                "versions": [],
+            }
+            datasets[(product_position, dataset_position)] = dataset
+            products.setdefault(product_position, []).append(dataset)
+        if not products:
+            return []
+
+        parts: dict[tuple[int, int, int, int], dict[str, Any]] = {}
+        for (
+            product_position,
+            dataset_position,
+            version_position,
+            part_position,
+            version_label,
+            part_name,
+            retired_date,
+            released_date,
+        ) in connection.execute(
+            "SELECT product_position, dataset_position, version_position, "
+            "part_position, version, part, retired_date, released_date "
+            f"FROM parts {dataset_filter} ORDER BY product_position, "
+            "dataset_position, version_position, part_position",
+            parameters,
+        ):
+            versions = datasets[(product_position, dataset_position)][
+                "versions"
+            ]
+            if len(versions) <= version_position:
+                versions.append({"label": version_label, "parts": []})
+            part = {
+                "name": part_name,
+                "services": [],
+                "retired_date": retired_date,
+                "released_date": released_date,
+            }
+            versions[version_position]["parts"].append(part)
+            parts[
+                (
+                    product_position,
+                    dataset_position,
+                    version_position,
+                    part_position,
+                )
+            ] = part
+
+        for (
+            product_position,
+            dataset_position,
+            version_position,
+            part_position,
+            service_type,
+            service_format,
+            uri,
+            variables,
+        ) in connection.execute(
+            "SELECT product_position, dataset_position, version_position, "
+            "part_position, service_type, service_format, uri, variables "
+            f"FROM services {dataset_filter} ORDER BY product_position, "
+            "dataset_position, version_position, part_position, "
+            "service_position",
+            parameters,
+        ):
+            parts[
+                (
+                    product_position,
+                    dataset_position,
+                    version_position,
+                    part_position,
+                )
+            ]["services"].append(
+                {
+                    "service_type": service_type,
+                    "service_format": service_format,
+                    "uri": uri,
+                    "variables": _decode_variables(variables),
+                }
+            )
+
+        product_positions = list(products)
+        loaded_products = []
+        for product_position, content in connection.execute(
+            "SELECT product_position, content FROM products "
+            "WHERE product_position IN "
+            f"({', '.join('?' for _ in product_positions)}) "
+            "ORDER BY product_position",
+            product_positions,
+        ):
+            product = json.loads(content)
+            product["datasets"] = products[product_position]
+            loaded_products.append(product)
+        return loaded_products
@@ -0,0 +1,76 @@
+import hashlib
+import pathlib
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from copernicusmarine.core_functions.json_file_cache import (
+    read_json_cache_file,
+    write_json_cache_file,
+)
+from copernicusmarine.core_functions.utils import CACHE_BASE_DIRECTORY
+
+STAC_JSON_CACHE_DIRECTORY: pathlib.Path = CACHE_BASE_DIRECTORY / "stac"
+
+
+@dataclass
+class CachedJsonFile:
+    url: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    content: Any
+
+    def conditional_request_headers(self) -> dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class StacJsonCache:
+    """
+    On-disk cache of STAC json files, one file per url.
+
+    Entries keep the ETag and Last-Modified headers of the response so that
+    they can be revalidated with a conditional request.
+    """
+
+    def __init__(
+        self, cache_directory: pathlib.Path = STAC_JSON_CACHE_DIRECTORY
+    ) -> None:
+        self.cache_directory = cache_directory
+
+    def _get_path(self, url: str) -> pathlib.Path:
+        url_hash = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.cache_directory / url_hash[:2] / f"{url_hash}.json"
+
+    def get(self, url: str) -> Optional[CachedJsonFile]:
+        def decode(cached: dict[str, Any]) -> Optional[CachedJsonFile]:
+            if cached.get("url") != url:
+                return None
+            return CachedJsonFile(
+                url=url,
+                etag=cached.get("etag"),
+                last_modified=cached.get("last_modified"),
+                content=cached.get("content"),
+            )
+
+        return read_json_cache_file(self._get_path(url), decode)
+
+    def put(
+        self,
+        url: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        content: Any,
+    ) -> None:
+        write_json_cache_file(
+            self._get_path(url),
+            {
+                "url": url,
+                "etag": etag,
+                "last_modified": last_modified,
+                "content": content,
+            },
+        )
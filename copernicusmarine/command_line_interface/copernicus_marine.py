@@ -3,6 +3,9 @@ import click
 from copernicusmarine.command_line_interface.group_describe import (
     cli_group_describe,
 )
+from copernicusmarine.command_line_interface.group_describe_changes import (
+    cli_group_describe_changes,
+)
 from copernicusmarine.command_line_interface.group_get import cli_group_get
 from copernicusmarine.command_line_interface.group_login import cli_group_login
 from copernicusmarine.command_line_interface.group_subset import (
@@ -14,6 +17,7 @@ from copernicusmarine.command_line_interface.group_subset import (
     cls=click.CommandCollection,
     sources=[
         cli_group_describe,
+        cli_group_describe_changes,
         cli_group_login,
         cli_group_subset,
         cli_group_get,
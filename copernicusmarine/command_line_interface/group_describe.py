@@ -1,4 +1,6 @@
 import logging
+import sys
+from typing import Optional
 
 import click
 
@@ -13,10 +15,12 @@ from copernicusmarine.core_functions.deprecated import (
     DeprecatedClickOption,
     DeprecatedClickOptionsCommand,
 )
-from copernicusmarine.core_functions.describe import describe_function
+from copernicusmarine.core_functions.describe import (
+    refresh_catalogue_cache_function,
+    write_describe_function,
+)
 
 logger = logging.getLogger("copernicus_marine_root_logger")
-blank_logger = logging.getLogger("copernicus_marine_blank_logger")
 
 
 @click.group()
@@ -47,6 +51,9 @@ def cli_group_describe() -> None:
 
     \b
     copernicusmarine describe -c METOFFICE-GLO-SST-L4-NRT-OBS-SST-V2
+
+    \b
+    copernicusmarine describe --refresh-cache
     """,  # noqa
 )
 @click.option(
@@ -106,7 +113,7 @@ def cli_group_describe() -> None:
     is_flag=True,
     default=False,
     help="Force to refresh the catalogue by overwriting the local cache.",
-    mutually_exclusive=["no_metadata_cache"],
+    mutually_exclusive=["no_metadata_cache", "refresh_cache"],
 )
 @click.option(
     "--no-metadata-cache",
@@ -115,7 +122,18 @@ def cli_group_describe() -> None:
     is_flag=True,
     default=False,
     help="Bypass the use of cache.",
-    mutually_exclusive=["overwrite_metadata_cache"],
+    mutually_exclusive=["overwrite_metadata_cache", "refresh_cache"],
+)
+@click.option(
+    "--refresh-cache",
+    cls=MutuallyExclusiveOption,
+    type=bool,
+    is_flag=True,
+    default=False,
+    help="Refresh the local catalogue cache without printing the catalogue. "
+    "The cached catalogue keeps being used until the new one is ready, so "
+    "this can be scheduled periodically.",
+    mutually_exclusive=["overwrite_metadata_cache", "no_metadata_cache"],
 )
 @tqdm_disable_option
 @click.option(
@@ -134,6 +152,12 @@ def cli_group_describe() -> None:
     is_flag=True,
     hidden=True,
 )
+@click.option(
+    "--refresh-lock-token",
+    type=str,
+    default=None,
+    hidden=True,
+)
 @log_exception_and_exit
 def describe(
     include_description: bool,
@@ -144,9 +168,11 @@ def describe(
     contains: list[str],
     overwrite_metadata_cache: bool,
     no_metadata_cache: bool,
+    refresh_cache: bool,
     disable_progress_bar: bool,
     log_level: str,
     staging: bool,
+    refresh_lock_token: Optional[str],
 ) -> None:
     if log_level == "QUIET":
         logger.disabled = True
@@ -157,13 +183,21 @@ def describe(
     if logger.isEnabledFor(logging.DEBUG):
         logger.debug("DEBUG mode activated")
 
+    if refresh_cache:
+        refresh_catalogue_cache_function(
+            disable_progress_bar=disable_progress_bar,
+            staging=staging,
+            refresh_lock_token=refresh_lock_token,
+        )
+        return
+
     if include_all:
         include_description = True
         include_datasets = True
         include_keywords = True
         include_versions = True
 
-    json_dump = describe_function(
+    write_describe_function(
         include_description=include_description,
         include_datasets=include_datasets,
         include_keywords=include_keywords,
@@ -173,5 +207,5 @@ def describe(
         no_metadata_cache=no_metadata_cache,
         disable_progress_bar=disable_progress_bar,
         staging=staging,
+        output=sys.stdout,
     )
-    blank_logger.info(json_dump)
@@ -0,0 +1,102 @@
+import json
+import logging
+import pathlib
+
+import click
+
+from copernicusmarine.command_line_interface.exception_handler import (
+    log_exception_and_exit,
+)
+from copernicusmarine.command_line_interface.utils import tqdm_disable_option
+from copernicusmarine.core_functions.describe_changes import (
+    describe_changes_function,
+)
+
+logger = logging.getLogger("copernicus_marine_root_logger")
+blank_logger = logging.getLogger("copernicus_marine_blank_logger")
+
+
+@click.group()
+def cli_group_describe_changes() -> None:
+    pass
+
+
+@cli_group_describe_changes.command(
+    "describe-changes",
+    short_help="Print the changes of the Copernicus Marine catalog as JSON.",
+    help="""
+    Print the changes of the Copernicus Marine catalog as JSON.
+
+    The catalog is compared to a snapshot saved in a file by a previous run,
+    then the snapshot is updated. Products, datasets, versions, parts and
+    services added or removed are listed, as well as changes of the time
+    extent of the parts. Only the STAC files changed since the last refresh
+    of the local cache are downloaded.
+    """,  # noqa
+    epilog="""
+    Examples:
+
+    \b
+    copernicusmarine describe-changes --snapshot-file catalogue_snapshot.sqlite3
+    """,  # noqa
+)
+@click.option(
+    "--snapshot-file",
+    type=click.Path(dir_okay=False, path_type=pathlib.Path),
+    required=True,
+    help="Path to the catalogue snapshot to compare with. If it does not "
+    "exist, every product is reported as added.",
+)
+@click.option(
+    "--no-snapshot-update",
+    type=bool,
+    is_flag=True,
+    default=False,
+    help="Do not replace the snapshot with the current catalogue.",
+)
+@tqdm_disable_option
+@click.option(
+    "--log-level",
+    type=click.Choice(["DEBUG", "INFO", "WARN", "ERROR", "CRITICAL", "QUIET"]),
+    default="INFO",
+    help=(
+        "Set the details printed to console by the command "
+        "(based on standard logging library)."
+    ),
+)
+@click.option(
+    "--staging",
+    type=bool,
+    default=False,
+    is_flag=True,
+    hidden=True,
+)
+@log_exception_and_exit
+def describe_changes(
+    snapshot_file: pathlib.Path,
+    no_snapshot_update: bool,
+    disable_progress_bar: bool,
+    log_level: str,
+    staging: bool,
+) -> None:
+    if log_level == "QUIET":
+        logger.disabled = True
+        logger.setLevel(level="CRITICAL")
+    else:
+        logger.setLevel(level=log_level)
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("DEBUG mode activated")
+
+    changes = describe_changes_function(
+        snapshot_file=snapshot_file,
+        update_snapshot=not no_snapshot_update,
+        disable_progress_bar=disable_progress_bar,
+        staging=staging,
+    )
+    blank_logger.info(
+        json.dumps(
+            {"changes": [change.to_json_dict() for change in changes]},
+            indent=2,
+        )
+    )
@@ -10,7 +10,7 @@ class MutuallyExclusiveOption(Option):
         self.mutually_exclusive = set(kwargs.pop("mutually_exclusive", []))
         help = kwargs.get("help", "")
         if self.mutually_exclusive:
-            ex_str = ", ".join(self.mutually_exclusive)
+            ex_str = ", ".join(sorted(self.mutually_exclusive))
             kwargs["help"] = (
                 help
                 + """
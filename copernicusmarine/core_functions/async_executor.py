@@ -0,0 +1,128 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import (
+    Any,
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+logger = logging.getLogger("copernicus_marine_root_logger")
+
+_T = TypeVar("_T")
+
+
+@dataclass
+class TaskTiming:
+    name: str
+    duration_seconds: float
+
+
+@dataclass
+class TaskResult(Generic[_T]):
+    index: int
+    result: _T
+    duration_seconds: float
+
+
+class BoundedConcurrencyExecutor:
+    """
+    Run coroutines with a bounded concurrency.
+
+    ``run`` executes a single coroutine function once a slot of the
+    semaphore is free. ``as_completed`` creates tasks lazily from an
+    iterable of coroutine functions, keeping at most ``max_concurrency``
+    of them pending, and yields their results as soon as they complete.
+    Tasks passed to ``as_completed`` may themselves call ``run``: only
+    ``run`` holds a slot of the semaphore.
+    """
+
+    def __init__(self, max_concurrency: int) -> None:
+        self.max_concurrency = max(1, max_concurrency)
+        self.task_timings: List[TaskTiming] = []
+        self.__semaphore: Optional[asyncio.Semaphore] = None
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # Created lazily to be bound to the running event loop
+        if self.__semaphore is None:
+            self.__semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self.__semaphore
+
+    async def run(
+        self,
+        function: Callable[..., Awaitable[_T]],
+        *args: Any,
+        name: Optional[str] = None,
+    ) -> _T:
+        async with self._get_semaphore():
+            start_time = time.perf_counter()
+            try:
+                return await function(*args)
+            finally:
+                task_name: str = name or str(
+                    getattr(function, "__name__", "task")
+                )
+                self.task_timings.append(
+                    TaskTiming(
+                        name=task_name,
+                        duration_seconds=time.perf_counter() - start_time,
+                    )
+                )
+
+    async def as_completed(
+        self, functions: Iterable[Callable[[], Awaitable[_T]]]
+    ) -> AsyncGenerator[TaskResult[_T], None]:
+        function_iterator = enumerate(functions)
+        pending: Dict[asyncio.Future, Tuple[int, float]] = {}
+
+        def schedule_next_task() -> bool:
+            try:
+                index, function = next(function_iterator)
+            except StopIteration:
+                return False
+            task = asyncio.ensure_future(function())
+            pending[task] = (index, time.perf_counter())
+            return True
+
+        try:
+            while len(pending) < self.max_concurrency and schedule_next_task():
+                pass
+            while pending:
+                done, _ = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    index, start_time = pending.pop(task)
+                    schedule_next_task()
+                    yield TaskResult(
+                        index=index,
+                        result=task.result(),
+                        duration_seconds=time.perf_counter() - start_time,
+                    )
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def log_timings(self, description: str) -> None:
+        if not self.task_timings or not logger.isEnabledFor(logging.DEBUG):
+            return
+        total_duration = sum(
+            timing.duration_seconds for timing in self.task_timings
+        )
+        slowest = max(
+            self.task_timings, key=lambda timing: timing.duration_seconds
+        )
+        logger.debug(
+            f"{description}: {len(self.task_timings)} tasks, "
+            f"{total_duration:.2f} s cumulated, slowest "
+            f"{slowest.duration_seconds:.2f} s ({slowest.name})"
+        )
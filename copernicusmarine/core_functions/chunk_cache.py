@@ -0,0 +1,308 @@
+import hashlib
+import logging
+import os
+import pathlib
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import closing, contextmanager
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from copernicusmarine.core_functions.environment_variables import (
+    COPERNICUSMARINE_CHUNK_CACHE_SIZE_MB,
+)
+from copernicusmarine.core_functions.utils import CACHE_BASE_DIRECTORY
+
+logger = logging.getLogger("copernicus_marine_root_logger")
+
+CHUNK_CACHE_DIRECTORY: pathlib.Path = CACHE_BASE_DIRECTORY / "chunks"
+CHUNK_CACHE_MAXIMUM_SIZE_BYTES = (
+    int(COPERNICUSMARINE_CHUNK_CACHE_SIZE_MB or 0) * 2**20
+)
+# Eviction frees some room below the limit, so that it does not run again
+# for every chunk added once the cache is full
+EVICTION_TARGET_RATIO = 0.9
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS chunks (
+    dataset_url TEXT NOT NULL,
+    chunk_key TEXT NOT NULL,
+    generation TEXT NOT NULL,
+    file_name TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    last_access REAL NOT NULL,
+    PRIMARY KEY (dataset_url, chunk_key)
+);
+CREATE INDEX IF NOT EXISTS chunks_last_access ON chunks (last_access);
+"""
+
+
+class ChunkCache:
+    """
+    On-disk cache of zarr chunks, keyed by dataset url and chunk key.
+
+    The chunks are stored one file per chunk, indexed in a sqlite database
+    holding their size and last access time. The least recently used
+    chunks are removed when the total size goes beyond maximum_size_bytes.
+    Several processes can share the cache: files are written to a
+    temporary file and moved in place, and the index is only changed in
+    sqlite transactions.
+
+    Each chunk is stored with the generation of its dataset, for instance
+    the ETag of its metadata. Chunks of another generation are never
+    returned and are removed by ``invalidate``.
+    """
+
+    def __init__(
+        self,
+        maximum_size_bytes: int,
+        directory: pathlib.Path = CHUNK_CACHE_DIRECTORY,
+    ) -> None:
+        self.maximum_size_bytes = maximum_size_bytes
+        self.directory = directory
+
+    @property
+    def index_path(self) -> pathlib.Path:
+        return self.directory / "index.sqlite3"
+
+    def _connect(self) -> sqlite3.Connection:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(
+            self.index_path, timeout=30, isolation_level=None
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript(_SCHEMA)
+        return connection
+
+    @contextmanager
+    def _write_transaction(self) -> Iterator[sqlite3.Connection]:
+        with closing(self._connect()) as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+
+    def _get_path(
+        self, dataset_url: str, generation: str, chunk_key: str
+    ) -> pathlib.Path:
+        chunk_hash = hashlib.sha256(
+            f"{dataset_url}\n{generation}\n{chunk_key}".encode("utf-8")
+        ).hexdigest()
+        return self.directory / chunk_hash[:2] / chunk_hash
+
+    def get_many(
+        self, dataset_url: str, generation: str, chunk_keys: Iterable[str]
+    ) -> Dict[str, bytes]:
+        """
+        Cached chunks of the keys, the keys not in the cache are left out.
+        """
+        chunk_keys = list(chunk_keys)
+        try:
+            with closing(self._connect()) as connection:
+                file_names = self._select_file_names(
+                    connection, dataset_url, generation, chunk_keys
+                )
+            if file_names:
+                with self._write_transaction() as connection:
+                    connection.executemany(
+                        "UPDATE chunks SET last_access = ? "
+                        "WHERE dataset_url = ? AND chunk_key = ?",
+                        [
+                            (time.time(), dataset_url, chunk_key)
+                            for chunk_key in file_names
+                        ],
+                    )
+        except (sqlite3.Error, OSError) as exception:
+            logger.debug(f"Could not read chunk cache index: {exception}")
+            return {}
+        chunks = {}
+        missing_chunk_keys = []
+        for chunk_key, file_name in file_names.items():
+            try:
+                chunks[chunk_key] = (self.directory / file_name).read_bytes()
+            except FileNotFoundError:
+                missing_chunk_keys.append(chunk_key)
+            except OSError as exception:
+                logger.debug(f"Could not read chunk cache file: {exception}")
+        if missing_chunk_keys:
+            self._remove_rows(dataset_url, generation, missing_chunk_keys)
+        return chunks
+
+    def _remove_rows(
+        self, dataset_url: str, generation: str, chunk_keys: list[str]
+    ) -> None:
+        """
+        Remove the index rows of chunks whose file is missing, for instance
+        removed by hand, so that their size no longer counts in the cache.
+        """
+        try:
+            with self._write_transaction() as connection:
+                connection.executemany(
+                    "DELETE FROM chunks WHERE dataset_url = ? "
+                    "AND chunk_key = ? AND generation = ?",
+                    [
+                        (dataset_url, chunk_key, generation)
+                        for chunk_key in chunk_keys
+                    ],
+                )
+        except (sqlite3.Error, OSError) as exception:
+            logger.debug(f"Could not update chunk cache index: {exception}")
+
+    @staticmethod
+    def _select_file_names(
+        connection: sqlite3.Connection,
+        dataset_url: str,
+        generation: str,
+        chunk_keys: list[str],
+    ) -> Dict[str, str]:
+        file_names: Dict[str, str] = {}
+        # Stay below the maximum number of parameters of old sqlite versions
+        for start in range(0, len(chunk_keys), 500):
+            batch = chunk_keys[start : start + 500]
+            file_names.update(
+                connection.execute(
+                    "SELECT chunk_key, file_name FROM chunks "
+                    "WHERE dataset_url = ? AND generation = ? "
+                    f"AND chunk_key IN ({', '.join('?' * len(batch))})",
+                    [dataset_url, generation, *batch],
+                )
+            )
+        return file_names
+
+    def put_many(
+        self, dataset_url: str, generation: str, chunks: Dict[str, bytes]
+    ) -> None:
+        rows = []
+        for chunk_key, chunk in chunks.items():
+            if len(chunk) > self.maximum_size_bytes:
+                continue
+            path = self._get_path(dataset_url, generation, chunk_key)
+            try:
+                self._write_file(path, chunk)
+            except OSError as exception:
+                logger.debug(f"Could not write chunk cache file: {exception}")
+                continue
+            rows.append(
+                (
+                    dataset_url,
+                    chunk_key,
+                    generation,
+                    str(path.relative_to(self.directory)),
+                    len(chunk),
+                    time.time(),
+                )
+            )
+        if not rows:
+            return
+        try:
+            with self._write_transaction() as connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO chunks VALUES (?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+                evicted_file_names = self._evict(connection)
+        except (sqlite3.Error, OSError) as exception:
+            logger.debug(f"Could not update chunk cache index: {exception}")
+            return
+        self._remove_files(evicted_file_names)
+
+    def _write_file(self, path: pathlib.Path, chunk: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        file_descriptor, temporary_path = tempfile.mkstemp(
+            dir=path.parent, suffix=".tmp"
+        )
+        try:
+            with os.fdopen(file_descriptor, "wb") as chunk_file:
+                chunk_file.write(chunk)
+            os.replace(temporary_path, path)
+        finally:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+
+    def _evict(self, connection: sqlite3.Connection) -> list[str]:
+        (total_size,) = connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM chunks"
+        ).fetchone()
+        if total_size <= self.maximum_size_bytes:
+            return []
+        size_to_free = (
+            total_size - self.maximum_size_bytes * EVICTION_TARGET_RATIO
+        )
+        evicted: list[Tuple[str, str, str]] = []
+        for dataset_url, chunk_key, file_name, size in connection.execute(
+            "SELECT dataset_url, chunk_key, file_name, size FROM chunks "
+            "ORDER BY last_access"
+        ):
+            if size_to_free <= 0:
+                break
+            evicted.append((dataset_url, chunk_key, file_name))
+            size_to_free -= size
+        connection.executemany(
+            "DELETE FROM chunks WHERE dataset_url = ? AND chunk_key = ?",
+            [
+                (dataset_url, chunk_key)
+                for dataset_url, chunk_key, _ in evicted
+            ],
+        )
+        logger.debug(f"Evicting {len(evicted)} chunks from the chunk cache")
+        return [file_name for _, _, file_name in evicted]
+
+    def invalidate(self, dataset_url: str, generation: str) -> None:
+        """
+        Remove the chunks of the dataset stored with another generation.
+        """
+        try:
+            with self._write_transaction() as connection:
+                stale_file_names = [
+                    file_name
+                    for (file_name,) in connection.execute(
+                        "SELECT file_name FROM chunks "
+                        "WHERE dataset_url = ? AND generation != ?",
+                        (dataset_url, generation),
+                    )
+                ]
+                connection.execute(
+                    "DELETE FROM chunks "
+                    "WHERE dataset_url = ? AND generation != ?",
+                    (dataset_url, generation),
+                )
+        except (sqlite3.Error, OSError) as exception:
+            logger.debug(f"Could not update chunk cache index: {exception}")
+            return
+        if stale_file_names:
+            logger.debug(
+                f"Removing {len(stale_file_names)} outdated chunks "
+                f"of {dataset_url} from the chunk cache"
+            )
+        self._remove_files(stale_file_names)
+
+    def _remove_files(self, file_names: list[str]) -> None:
+        for file_name in file_names:
+            try:
+                os.remove(self.directory / file_name)
+            except FileNotFoundError:
+                pass
+            except OSError as exception:
+                logger.debug(f"Could not remove chunk cache file: {exception}")
+
+
+_chunk_cache: Optional[ChunkCache] = None
+_chunk_cache_lock = threading.Lock()
+
+
+def get_chunk_cache() -> Optional[ChunkCache]:
+    """
+    Chunk cache shared by the stores, None unless a size limit is set.
+    """
+    global _chunk_cache
+    if CHUNK_CACHE_MAXIMUM_SIZE_BYTES <= 0:
+        return None
+    with _chunk_cache_lock:
+        if _chunk_cache is None:
+            _chunk_cache = ChunkCache(CHUNK_CACHE_MAXIMUM_SIZE_BYTES)
+        return _chunk_cache
@@ -10,19 +10,21 @@ from typing import Literal, Optional, Tuple
 import click
 import lxml.html
 import requests
-from cachier.core import cachier
 
 from copernicusmarine.core_functions.environment_variables import (
+    COPERNICUSMARINE_OFFLINE,
     COPERNICUSMARINE_SERVICE_PASSWORD,
     COPERNICUSMARINE_SERVICE_USERNAME,
 )
+from copernicusmarine.core_functions.metadata_cache import (
+    MetadataCache,
+    OfflineMetadataNotCached,
+    log_offline_metadata_age,
+)
 from copernicusmarine.core_functions.sessions import (
     get_configured_requests_session,
 )
-from copernicusmarine.core_functions.utils import (
-    CACHE_BASE_DIRECTORY,
-    DEFAULT_CLIENT_BASE_DIRECTORY,
-)
+from copernicusmarine.core_functions.utils import DEFAULT_CLIENT_BASE_DIRECTORY
 
 logger = logging.getLogger("copernicus_marine_root_logger")
 
@@ -30,6 +32,7 @@ DEFAULT_CLIENT_CREDENTIALS_FILENAME = ".copernicusmarine-credentials"
 DEFAULT_CLIENT_CREDENTIALS_FILEPATH = (
     DEFAULT_CLIENT_BASE_DIRECTORY / DEFAULT_CLIENT_CREDENTIALS_FILENAME
 )
+CREDENTIALS_VALIDITY_STALE_AFTER = timedelta(hours=48)
 
 
 class CredentialCannotBeNone(Exception):
@@ -255,12 +258,44 @@ def _check_credentials_with_cas(username: str, password: str) -> bool:
     return login_success
 
 
-@cachier(stale_after=timedelta(hours=48), cache_dir=CACHE_BASE_DIRECTORY)
 def _are_copernicus_marine_credentials_valid(
+    username: str, password: str, ignore_cache: bool = False
+) -> Optional[bool]:
+    """
+    Whether the credentials are valid, None if they could not be checked.
+
+    The result of the check is cached for
+    CREDENTIALS_VALIDITY_STALE_AFTER. In offline mode, the cached result
+    is used whatever its age.
+    """
+    cache_key = f"credentials:{username}:{password}"
+    metadata_cache = MetadataCache()
+    cached_validity = None if ignore_cache else metadata_cache.get(cache_key)
+    if COPERNICUSMARINE_OFFLINE:
+        if cached_validity is None:
+            raise OfflineMetadataNotCached("validation of the credentials")
+        log_offline_metadata_age(
+            "validation of the credentials",
+            cached_validity.age,
+            CREDENTIALS_VALIDITY_STALE_AFTER,
+        )
+        return cached_validity.content
+    if (
+        cached_validity is not None
+        and cached_validity.age < CREDENTIALS_VALIDITY_STALE_AFTER
+    ):
+        return cached_validity.content
+    user_is_active = _check_credentials_with_retries(username, password)
+    if user_is_active is not None and not ignore_cache:
+        metadata_cache.put(cache_key, user_is_active)
+    return user_is_active
+
+
+def _check_credentials_with_retries(
     username: str, password: str
 ) -> Optional[bool]:
     number_of_retry = 3
-    user_is_active = None  # Not cached by cachier
+    user_is_active = None
     while (user_is_active not in [True, False]) and number_of_retry > 0:
         try:
             user_is_active = _check_credentials_with_cas(
@@ -315,6 +350,13 @@ def get_and_check_username_password(
     username, password = get_username_password(
         username=username, password=password, credentials_file=credentials_file
     )
+    check_username_password(username, password, no_metadata_cache)
+    return (username, password)
+
+
+def check_username_password(
+    username: str, password: str, no_metadata_cache: bool
+) -> None:
     copernicus_marine_credentials_are_valid = (
         _are_copernicus_marine_credentials_valid(
             username, password, ignore_cache=no_metadata_cache
@@ -326,7 +368,6 @@ def get_and_check_username_password(
             "https://help.marine.copernicus.eu/en/articles/"
             "4444552-i-forgot-my-username-or-my-password-what-should-i-do"
         )
-    return (username, password)
 
 
 def get_username_password(
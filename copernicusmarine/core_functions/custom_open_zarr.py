@@ -1,62 +1,342 @@
 import logging
+import threading
 import time
-from collections.abc import MutableMapping
-from typing import Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import timedelta
+from functools import partial
+from typing import Dict, Hashable, Iterator, Optional, Sequence
 
 import botocore.config
 import botocore.exceptions
 import botocore.session
 import xarray
+import zarr.storage
 
+from copernicusmarine.core_functions.chunk_cache import (
+    ChunkCache,
+    get_chunk_cache,
+)
+from copernicusmarine.core_functions.environment_variables import (
+    COPERNICUSMARINE_OFFLINE,
+)
+from copernicusmarine.core_functions.memoization import TimeToLiveCache
+from copernicusmarine.core_functions.retry_controller import (
+    RetryController,
+    classify_error,
+    s3_retry_controller,
+)
 from copernicusmarine.core_functions.sessions import (
     PROXIES,
     TRUST_ENV,
     _get_ssl_context,
     get_configured_boto3_session,
+    transport_manager,
 )
 from copernicusmarine.core_functions.utils import parse_access_dataset_url
+from copernicusmarine.core_functions.zarr_metadata_cache import (
+    CachedZarrMetadata,
+    ZarrMetadataCache,
+)
 
 logger = logging.getLogger("copernicus_marine_root_logger")
 
+OPENED_DATASET_MEMORY_TTL = timedelta(minutes=10)
+OPENED_DATASETS_IN_MEMORY = 16
+
+_opened_datasets: ContextVar[
+    Optional[Dict[Hashable, xarray.Dataset]]
+] = ContextVar("opened_datasets", default=None)
+_opened_datasets_in_memory: TimeToLiveCache[xarray.Dataset] = TimeToLiveCache(
+    OPENED_DATASET_MEMORY_TTL, maximum_size=OPENED_DATASETS_IN_MEMORY
+)
+
+_chunk_fetch_executor: Optional[ThreadPoolExecutor] = None
+_chunk_fetch_executor_lock = threading.Lock()
+
+
+def _get_chunk_fetch_executor() -> ThreadPoolExecutor:
+    # Shared by all the stores, so that the number of requests in flight
+    # stays within the S3 connection pool whatever the number of datasets
+    global _chunk_fetch_executor
+    with _chunk_fetch_executor_lock:
+        if _chunk_fetch_executor is None:
+            _chunk_fetch_executor = ThreadPoolExecutor(
+                max_workers=(
+                    transport_manager.get_boto3_config().max_pool_connections
+                ),
+                thread_name_prefix="chunk-fetch",
+            )
+        return _chunk_fetch_executor
+
+
+def _is_chunk_key(key: str) -> bool:
+    # Metadata keys (.zmetadata, .zarray, .zattrs...) start with a dot
+    return not key.rsplit("/", 1)[-1].startswith(".")
+
+
+def _result_or_none(future: "Future[bytes]") -> Optional[bytes]:
+    try:
+        return future.result()
+    except KeyError:
+        return None
 
-class CustomS3Store(MutableMapping):
+
+class CustomS3Store(zarr.storage.BaseStore):
     def __init__(
         self,
         endpoint: str,
         bucket: str,
         root_path: str,
         copernicus_marine_username: Optional[str] = None,
-        number_of_retries: int = 9,
-        initial_retry_wait_seconds: int = 1,
+        retry_controller: RetryController = s3_retry_controller,
+        chunk_cache: Optional[ChunkCache] = None,
+        metadata_cache: Optional[ZarrMetadataCache] = None,
     ):
         self._root_path = root_path.lstrip("/")
         self._bucket = bucket
+        self._dataset_url = f"{endpoint}/{bucket}/{self._root_path}"
+        self.chunk_cache = chunk_cache
+        self._chunk_cache_generation: Optional[str] = None
+        self._chunk_cache_generation_checked = False
+        self._chunk_cache_generation_lock = threading.Lock()
+        self.metadata_cache = metadata_cache
+        self._metadata: Optional[CachedZarrMetadata] = None
+        self._metadata_loaded = False
+        self._metadata_changed = False
+        self._coordinate_names: set[str] = set()
+        self._metadata_lock = threading.Lock()
         self.client, _ = get_configured_boto3_session(
             endpoint,
             ["GetObject", "HeadObject", "ListObjects"],
             copernicus_marine_username,
+            retried_by_botocore=False,
         )
-
-        self.number_of_retries = number_of_retries
-        self.initial_retry_wait_seconds = initial_retry_wait_seconds
+        self.retry_controller = retry_controller
 
     def __getitem__(self, key):
+        if key == ".zmetadata":
+            metadata = self._get_metadata()
+            if metadata is not None:
+                return metadata.consolidated_metadata
+        cached_chunks = self._get_cached_chunks([key])
+        if key in cached_chunks:
+            return cached_chunks[key]
+        chunk = self._fetch(key)
+        self._cache_chunks({key: chunk})
+        return chunk
+
+    def _fetch(self, key: str) -> bytes:
+        return self.with_retries(partial(self._fetch_once, key))
+
+    def _fetch_once(self, key: str) -> bytes:
+        full_key = f"{self._root_path}/{key}"
+        try:
+            resp = self.client.get_object(Bucket=self._bucket, Key=full_key)
+        except botocore.exceptions.ClientError as e:
+            # Errors worth retrying are left to the retry controller
+            if classify_error(e) is None:
+                raise KeyError(key) from e
+            raise
+        return resp["Body"].read()
+
+    def getitems(self, keys: Sequence[str], **kwargs) -> Dict[str, bytes]:
+        """
+        Fetch the chunks of the keys concurrently.
+
+        Missing keys are left out of the result, as zarr expects.
+        """
+        keys = list(keys)
+        cached_chunks = self._get_cached_chunks(keys)
+        missing_keys = [key for key in keys if key not in cached_chunks]
+        executor = _get_chunk_fetch_executor()
+        futures = [
+            self.retry_controller.submit(
+                executor, partial(self._fetch_once, key)
+            )
+            for key in missing_keys
+        ]
+        chunks = [_result_or_none(future) for future in futures]
+        fetched_chunks = {
+            key: chunk
+            for key, chunk in zip(missing_keys, chunks)
+            if chunk is not None
+        }
+        self._cache_chunks(fetched_chunks)
+        return {**cached_chunks, **fetched_chunks}
+
+    def _get_metadata(self) -> Optional[CachedZarrMetadata]:
+        """
+        Consolidated metadata of the store from the metadata cache,
+        fetched or revalidated when needed. None without metadata cache or
+        consolidated metadata.
+        """
+        if self.metadata_cache is None:
+            return None
+        with self._metadata_lock:
+            if self._metadata_loaded:
+                return self._metadata
+            self._metadata_loaded = True
+            cached_metadata = self.metadata_cache.get(self._dataset_url)
+            if cached_metadata is not None and (
+                cached_metadata.is_fresh() or COPERNICUSMARINE_OFFLINE
+            ):
+                self._metadata = cached_metadata
+            else:
+                self._metadata = self._fetch_metadata(cached_metadata)
+                self._metadata_changed = self._metadata is not None
+            if self._metadata is not None:
+                self._coordinate_names = self._metadata.get_coordinate_names()
+            return self._metadata
+
+    def _fetch_metadata(
+        self, cached_metadata: Optional[CachedZarrMetadata]
+    ) -> Optional[CachedZarrMetadata]:
+        conditional_arguments = (
+            {"IfNoneMatch": cached_metadata.etag} if cached_metadata else {}
+        )
+
         def fn():
-            full_key = f"{self._root_path}/{key}"
             try:
-                resp = self.client.get_object(
-                    Bucket=self._bucket, Key=full_key
+                return self.client.get_object(
+                    Bucket=self._bucket,
+                    Key=f"{self._root_path}/.zmetadata",
+                    **conditional_arguments,
                 )
-                return resp["Body"].read()
             except botocore.exceptions.ClientError as e:
-                raise KeyError(key) from e
+                if cached_metadata and e.response.get("Error", {}).get(
+                    "Code"
+                ) in ["304", "NotModified"]:
+                    return None
+                if classify_error(e) is None:
+                    raise KeyError(".zmetadata") from e
+                raise
 
-        return self.with_retries(fn)
+        try:
+            response = self.with_retries(fn)
+        except KeyError:
+            return None
+        if response is None and cached_metadata is not None:
+            cached_metadata.validated_at = time.time()
+            return cached_metadata
+        return CachedZarrMetadata(
+            dataset_url=self._dataset_url,
+            etag=response["ETag"],
+            validated_at=time.time(),
+            consolidated_metadata=response["Body"].read(),
+        )
+
+    def _is_coordinate_key(self, key: str) -> bool:
+        return (
+            _is_chunk_key(key)
+            and key.split("/", 1)[0] in self._coordinate_names
+        )
+
+    def save_metadata(self) -> None:
+        """
+        Write the metadata read since the store was opened to the metadata
+        cache, for the next time the dataset is opened.
+        """
+        with self._metadata_lock:
+            if (
+                self.metadata_cache is None
+                or self._metadata is None
+                or not self._metadata_changed
+            ):
+                return
+            self.metadata_cache.put(self._metadata)
+            self._metadata_changed = False
+
+    def _get_generation(self) -> Optional[str]:
+        """
+        Version of the dataset content for the chunk cache, from the ETag
+        of its consolidated metadata. None when it cannot be known, in
+        which case the chunk cache is not used.
+        """
+        with self._chunk_cache_generation_lock:
+            if self._chunk_cache_generation_checked:
+                return self._chunk_cache_generation
+            self._chunk_cache_generation_checked = True
+            metadata = self._get_metadata()
+            generation: Optional[str]
+            if metadata is not None:
+                generation = metadata.etag
+            else:
+                generation = self._head_generation()
+            if generation is None or self.chunk_cache is None:
+                return None
+            self._chunk_cache_generation = str(generation)
+            self.chunk_cache.invalidate(
+                self._dataset_url, self._chunk_cache_generation
+            )
+            return self._chunk_cache_generation
+
+    def _head_generation(self) -> Optional[str]:
+        try:
+            metadata = self.client.head_object(
+                Bucket=self._bucket, Key=f"{self._root_path}/.zmetadata"
+            )
+        except botocore.exceptions.ClientError as e:
+            logger.debug(f"Chunk cache disabled for this dataset: {e}")
+            return None
+        generation = metadata.get("ETag") or metadata.get("LastModified")
+        return None if generation is None else str(generation)
+
+    def _get_cached_chunks(self, keys: Sequence[str]) -> Dict[str, bytes]:
+        chunk_keys = [key for key in keys if _is_chunk_key(key)]
+        if not chunk_keys:
+            return {}
+        cached_chunks = {}
+        metadata = self._get_metadata()
+        if metadata is not None:
+            cached_chunks = {
+                key: metadata.coordinate_chunks[key]
+                for key in chunk_keys
+                if self._is_coordinate_key(key)
+                and key in metadata.coordinate_chunks
+            }
+        chunk_keys = [key for key in chunk_keys if key not in cached_chunks]
+        if self.chunk_cache is None or not chunk_keys:
+            return cached_chunks
+        generation = self._get_generation()
+        if generation is None:
+            return cached_chunks
+        cached_chunks.update(
+            self.chunk_cache.get_many(
+                self._dataset_url, generation, chunk_keys
+            )
+        )
+        return cached_chunks
+
+    def _cache_chunks(self, chunks: Dict[str, bytes]) -> None:
+        chunks = {
+            key: chunk for key, chunk in chunks.items() if _is_chunk_key(key)
+        }
+        metadata = self._get_metadata()
+        if metadata is not None:
+            with self._metadata_lock:
+                for key in list(chunks):
+                    if self._is_coordinate_key(key):
+                        metadata.coordinate_chunks[key] = chunks.pop(key)
+                        self._metadata_changed = True
+        if self.chunk_cache is None or not chunks:
+            return
+        generation = self._get_generation()
+        if generation is None:
+            return
+        self.chunk_cache.put_many(self._dataset_url, generation, chunks)
 
     def __contains__(self, key):
+        if key == ".zmetadata" and self._get_metadata() is not None:
+            return True
         full_key = f"{self._root_path}/{key}"
         try:
-            self.client.head_object(Bucket=self._bucket, Key=full_key)
+            self.with_retries(
+                partial(
+                    self.client.head_object, Bucket=self._bucket, Key=full_key
+                )
+            )
             return True
         except botocore.exceptions.ClientError as e:
             if "404" in str(e) or "403" in str(e):
@@ -88,8 +368,13 @@ class CustomS3Store(MutableMapping):
         keys = []
         cursor = self._root_path
         while True:
-            resp = self.client.list_objects_v2(
-                Bucket=self._bucket, Prefix=self._root_path, StartAfter=cursor
+            resp = self.with_retries(
+                partial(
+                    self.client.list_objects_v2,
+                    Bucket=self._bucket,
+                    Prefix=self._root_path,
+                    StartAfter=cursor,
+                )
             )
             entries = resp.get("Contents", [])
             keys += [
@@ -122,27 +407,87 @@ class CustomS3Store(MutableMapping):
             idx += 1000
 
     def with_retries(self, fn):
-        retry_delay = self.initial_retry_wait_seconds
-        for index_try in range(self.number_of_retries):
-            try:
-                return fn()
-            # KeyError is a normal error that we want to propagate
-            # (e.g. if we try to get a chunk and it doesn't exist,
-            # we want the caller to know this has happened -- and not retry!)
-            except KeyError:
-                raise
-            except Exception as e:
-                if index_try == self.number_of_retries - 1:
-                    raise e
-                logger.debug(f"S3 error: {e}")
-                logger.debug(f"Retrying in {retry_delay} s...")
-                time.sleep(retry_delay)
-                retry_delay *= 2
+        # KeyError is a normal error that we want to propagate
+        # (e.g. if we try to get a chunk and it doesn't exist,
+        # we want the caller to know this has happened -- and not retry!)
+        # The requests run on the fetch executor, so that the caller, often
+        # a dask worker, only waits for the result and never sleeps for
+        # the backoff of a retry. fn must not call with_retries itself.
+        return self.retry_controller.submit(
+            _get_chunk_fetch_executor(), fn
+        ).result()
+
+
+@contextmanager
+def reuse_opened_datasets() -> Iterator[None]:
+    """
+    Open each dataset once within the block, for instance for a command
+    which selects the service, checks the bounds and downloads from the
+    same dataset.
+
+    The later calls to open_zarr with the same url and arguments get a
+    shallow copy of the dataset already opened, sharing its store and its
+    loaded coordinates. The statistics of the S3 requests are logged when
+    leaving the block.
+    """
+    token = _opened_datasets.set({})
+    try:
+        yield
+    finally:
+        _opened_datasets.reset(token)
+        s3_retry_controller.log_statistics()
 
 
 def open_zarr(
     dataset_url: str,
     copernicus_marine_username: Optional[str] = None,
+    no_metadata_cache: bool = False,
+    **kwargs,
+) -> xarray.Dataset:
+    """
+    Open the zarr store of the dataset url as a lazy dataset.
+
+    With no_metadata_cache, the dataset is neither taken from nor kept in
+    memory, and the metadata of the store is neither read from nor written
+    to the cache on disk.
+
+    The last OPENED_DATASETS_IN_MEMORY datasets opened are kept in memory
+    for OPENED_DATASET_MEMORY_TTL, so that opening one of them again, with
+    the same arguments, only returns a shallow copy of it. Within a
+    reuse_opened_datasets() block, the datasets are kept for the whole
+    block.
+    """
+    key = (
+        dataset_url,
+        copernicus_marine_username,
+        repr(sorted(kwargs.items())),
+    )
+    opened_datasets = _opened_datasets.get()
+    dataset = None
+    if opened_datasets is not None:
+        dataset = opened_datasets.get(key)
+    if dataset is None and not no_metadata_cache:
+        dataset = _opened_datasets_in_memory.get(key)
+    if dataset is None:
+        dataset = _open_zarr(
+            dataset_url,
+            copernicus_marine_username,
+            no_metadata_cache=no_metadata_cache,
+            **kwargs,
+        )
+        if not no_metadata_cache:
+            _opened_datasets_in_memory.put(key, dataset)
+    else:
+        logger.debug(f"Reusing the dataset already opened at {dataset_url}")
+    if opened_datasets is not None:
+        opened_datasets[key] = dataset
+    return dataset.copy()
+
+
+def _open_zarr(
+    dataset_url: str,
+    copernicus_marine_username: Optional[str] = None,
+    no_metadata_cache: bool = False,
     **kwargs,
 ) -> xarray.Dataset:
     (
@@ -155,6 +500,8 @@ def open_zarr(
         bucket=bucket,
         root_path=root_path,
         copernicus_marine_username=copernicus_marine_username,
+        chunk_cache=get_chunk_cache(),
+        metadata_cache=None if no_metadata_cache else ZarrMetadataCache(),
     )
     kwargs.update(
         {
@@ -164,4 +511,6 @@ def open_zarr(
             }
         }
     )
-    return xarray.open_zarr(store, **kwargs)
+    dataset = xarray.open_zarr(store, **kwargs)
+    store.save_metadata()
+    return dataset
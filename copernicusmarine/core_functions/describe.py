@@ -1,11 +1,16 @@
 import json
 import logging
+from dataclasses import fields
+from typing import Iterator, Optional, TextIO
+
+import numpy
 
 from copernicusmarine.catalogue_parser.catalogue_parser import (
     CopernicusMarineCatalogue,
     CopernicusMarineDatasetServiceType,
     filter_catalogue_with_strings,
     parse_catalogue,
+    refresh_catalogue_cache,
 )
 from copernicusmarine.core_functions.utils import (
     create_cache_directory,
@@ -27,6 +32,78 @@ def describe_function(
     disable_progress_bar: bool,
     staging: bool,
 ) -> str:
+    return "".join(
+        _describe_json_chunks(
+            include_description=include_description,
+            include_datasets=include_datasets,
+            include_keywords=include_keywords,
+            include_versions=include_versions,
+            contains=contains,
+            overwrite_metadata_cache=overwrite_metadata_cache,
+            no_metadata_cache=no_metadata_cache,
+            disable_progress_bar=disable_progress_bar,
+            staging=staging,
+        )
+    )
+
+
+def write_describe_function(
+    include_description: bool,
+    include_datasets: bool,
+    include_keywords: bool,
+    include_versions: bool,
+    contains: list[str],
+    overwrite_metadata_cache: bool,
+    no_metadata_cache: bool,
+    disable_progress_bar: bool,
+    staging: bool,
+    output: TextIO,
+) -> None:
+    """
+    Write the describe JSON to the output as it is encoded,
+    product by product.
+    """
+    for chunk in _describe_json_chunks(
+        include_description=include_description,
+        include_datasets=include_datasets,
+        include_keywords=include_keywords,
+        include_versions=include_versions,
+        contains=contains,
+        overwrite_metadata_cache=overwrite_metadata_cache,
+        no_metadata_cache=no_metadata_cache,
+        disable_progress_bar=disable_progress_bar,
+        staging=staging,
+    ):
+        output.write(chunk)
+    output.write("\n")
+    output.flush()
+
+
+def refresh_catalogue_cache_function(
+    disable_progress_bar: bool,
+    staging: bool,
+    refresh_lock_token: Optional[str] = None,
+) -> None:
+    VersionVerifier.check_version_describe(staging)
+    create_cache_directory()
+    refresh_catalogue_cache(
+        disable_progress_bar=disable_progress_bar,
+        staging=staging,
+        refresh_lock_token=refresh_lock_token,
+    )
+
+
+def _describe_json_chunks(
+    include_description: bool,
+    include_datasets: bool,
+    include_keywords: bool,
+    include_versions: bool,
+    contains: list[str],
+    overwrite_metadata_cache: bool,
+    no_metadata_cache: bool,
+    disable_progress_bar: bool,
+    staging: bool,
+) -> Iterator[str]:
     VersionVerifier.check_version_describe(staging)
     if staging:
         logger.warning(
@@ -51,24 +128,31 @@ def describe_function(
     catalogue_dict = (
         filter_catalogue_with_strings(base_catalogue, contains)
         if contains
-        else base_catalogue.__dict__
+        else {"products": base_catalogue.products}
     )
 
+    excluded_attributes: set[str] = set()
+    if not include_description:
+        excluded_attributes.add("description")
+    if not include_datasets:
+        excluded_attributes.add("datasets")
+    if not include_keywords:
+        excluded_attributes.add("keywords")
+
     def default_filter(obj):
         if isinstance(obj, CopernicusMarineDatasetServiceType):
             return obj.to_json_dict()
+        if isinstance(obj, numpy.ndarray):
+            return obj.tolist()
+        return {
+            attribute.name: getattr(obj, attribute.name)
+            for attribute in fields(obj)
+            if attribute.name not in excluded_attributes
+        }
 
-        attributes = obj.__dict__
-        attributes.pop("__objclass__", None)
-        if not include_description:
-            attributes.pop("description", None)
-        if not include_datasets:
-            attributes.pop("datasets", None)
-        if not include_keywords:
-            attributes.pop("keywords", None)
-        return obj.__dict__
-
-    json_dump = json.dumps(
-        catalogue_dict, default=default_filter, sort_keys=False, indent=2
+    # The encoder is lazy: objects are projected by default_filter only
+    # when they are reached, and chunks are yielded as they are encoded
+    encoder = json.JSONEncoder(
+        default=default_filter, sort_keys=False, indent=2
     )
-    return json_dump
+    return encoder.iterencode(catalogue_dict)
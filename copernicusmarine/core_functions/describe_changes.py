@@ -0,0 +1,49 @@
+import logging
+import pathlib
+
+from copernicusmarine.catalogue_parser.catalogue_diff import (
+    CatalogueChange,
+    diff_catalogues,
+)
+from copernicusmarine.catalogue_parser.catalogue_parser import (
+    CopernicusMarineCatalogue,
+    load_catalogue_snapshot,
+    refresh_catalogue_cache,
+    write_catalogue_snapshot,
+)
+from copernicusmarine.core_functions.utils import create_cache_directory
+from copernicusmarine.core_functions.versions_verifier import VersionVerifier
+
+logger = logging.getLogger("copernicus_marine_root_logger")
+
+
+def describe_changes_function(
+    snapshot_file: pathlib.Path,
+    update_snapshot: bool,
+    disable_progress_bar: bool,
+    staging: bool,
+) -> list[CatalogueChange]:
+    VersionVerifier.check_version_describe(staging)
+    if staging:
+        logger.warning(
+            "Detecting staging flag for describe-changes command. "
+            "Data will come from the staging environment."
+        )
+    create_cache_directory()
+
+    old_catalogue = load_catalogue_snapshot(snapshot_file)
+    if old_catalogue is None:
+        logger.info(
+            f"No catalogue snapshot found at {snapshot_file}, "
+            "every product is reported as added."
+        )
+        old_catalogue = CopernicusMarineCatalogue(products=[])
+    new_catalogue = refresh_catalogue_cache(
+        disable_progress_bar=disable_progress_bar, staging=staging
+    )
+    changes = diff_catalogues(old_catalogue, new_catalogue)
+    logger.info(f"{len(changes)} change(s) in the catalogue")
+
+    if update_snapshot:
+        write_catalogue_snapshot(new_catalogue, snapshot_file)
+    return changes
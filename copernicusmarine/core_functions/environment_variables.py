@@ -3,6 +3,21 @@ import os
 
 logger = logging.getLogger("copernicus_marine_root_logger")
 
+TRUE_VALUES = ["true", "1", "yes", "on"]
+FALSE_VALUES = ["", "false", "0", "no", "off"]
+
+
+def get_boolean_environment_variable(name: str) -> bool:
+    value = os.getenv(name, "").strip().lower()
+    if value not in TRUE_VALUES + FALSE_VALUES:
+        logger.warning(
+            f"Unexpected value '{os.getenv(name)}' for {name}, "
+            f"expected one of {', '.join(TRUE_VALUES + FALSE_VALUES[1:])}. "
+            f"Considering it as false."
+        )
+    return value in TRUE_VALUES
+
+
 COPERNICUSMARINE_SERVICE_USERNAME = os.getenv(
     "COPERNICUSMARINE_SERVICE_USERNAME"
 ) or os.getenv("COPERNICUS_MARINE_SERVICE_USERNAME")
@@ -32,10 +47,22 @@ COPERNICUSMARINE_GET_CONCURRENT_DOWNLOADS = os.getenv(
     "COPERNICUSMARINE_GET_CONCURRENT_DOWNLOADS", None
 )
 
+COPERNICUSMARINE_CATALOGUE_BUILD_PROCESSES = os.getenv(
+    "COPERNICUSMARINE_CATALOGUE_BUILD_PROCESSES", None
+)
+
+COPERNICUSMARINE_CHUNK_CACHE_SIZE_MB = os.getenv(
+    "COPERNICUSMARINE_CHUNK_CACHE_SIZE_MB", None
+)
+
 COPERNICUSMARINE_DISABLE_SSL_CONTEXT = os.getenv(
     "COPERNICUSMARINE_DISABLE_SSL_CONTEXT"
 )
 COPERNICUSMARINE_TRUST_ENV = os.getenv("COPERNICUSMARINE_TRUST_ENV", "True")
 
+COPERNICUSMARINE_OFFLINE = get_boolean_environment_variable(
+    "COPERNICUSMARINE_OFFLINE"
+)
+
 PROXY_HTTPS = os.getenv("HTTPS_PROXY", "")
 PROXY_HTTP = os.getenv("HTTP_PROXY", "")
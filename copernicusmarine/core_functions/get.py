@@ -4,7 +4,9 @@ import os
 import pathlib
 from typing import List, Optional
 
-from copernicusmarine.catalogue_parser.catalogue_parser import parse_catalogue
+from copernicusmarine.catalogue_parser.catalogue_parser import (
+    parse_dataset_catalogue,
+)
 from copernicusmarine.catalogue_parser.request_structure import (
     GetRequest,
     filter_to_regex,
@@ -12,13 +14,15 @@ from copernicusmarine.catalogue_parser.request_structure import (
     overload_regex_with_additionnal_filter,
 )
 from copernicusmarine.core_functions.credentials_utils import (
-    get_and_check_username_password,
+    check_username_password,
+    get_username_password,
 )
 from copernicusmarine.core_functions.services_utils import (
     CommandType,
     RetrievalService,
     get_retrieval_service,
 )
+from copernicusmarine.core_functions.startup_steps import StartupSteps
 from copernicusmarine.core_functions.utils import (
     create_cache_directory,
     delete_cache_folder,
@@ -60,7 +64,6 @@ def get_function(
     disable_progress_bar: bool,
     staging: bool,
 ) -> List[pathlib.Path]:
-    VersionVerifier.check_version_get(staging)
     if staging:
         logger.warning(
             "Detecting staging flag for get command. "
@@ -135,19 +138,26 @@ def get_function(
         if direct_download_files:
             get_request.direct_download = direct_download_files
 
-    return _run_get_request(
-        username=username,
-        password=password,
-        get_request=get_request,
-        create_file_list=create_file_list,
-        credentials_file=credentials_file,
-        no_metadata_cache=no_metadata_cache,
-        disable_progress_bar=disable_progress_bar,
-        staging=staging,
-    )
+    # Started once the cache is deleted, as it caches the versions
+    with StartupSteps("get") as startup_steps:
+        startup_steps.start(
+            "version check", VersionVerifier.check_version_get, staging
+        )
+        return _run_get_request(
+            startup_steps=startup_steps,
+            username=username,
+            password=password,
+            get_request=get_request,
+            create_file_list=create_file_list,
+            credentials_file=credentials_file,
+            no_metadata_cache=no_metadata_cache,
+            disable_progress_bar=disable_progress_bar,
+            staging=staging,
+        )
 
 
 def _run_get_request(
+    startup_steps: StartupSteps,
     username: Optional[str],
     password: Optional[str],
     get_request: GetRequest,
@@ -157,19 +167,29 @@ def _run_get_request(
     disable_progress_bar: bool,
     staging: bool = False,
 ) -> List[pathlib.Path]:
-    username, password = get_and_check_username_password(
+    username, password = get_username_password(
+        username, password, credentials_file
+    )
+    startup_steps.start(
+        "credentials check",
+        check_username_password,
         username,
         password,
-        credentials_file,
         no_metadata_cache=no_metadata_cache,
     )
 
-    catalogue = parse_catalogue(
+    catalogue = startup_steps.run(
+        "catalogue",
+        parse_dataset_catalogue,
+        dataset_id=get_request.dataset_id,
+        dataset_url=get_request.dataset_url,
         no_metadata_cache=no_metadata_cache,
         disable_progress_bar=disable_progress_bar,
         staging=staging,
     )
-    retrieval_service: RetrievalService = get_retrieval_service(
+    retrieval_service: RetrievalService = startup_steps.run(
+        "service selection",
+        get_retrieval_service,
         catalogue,
         get_request.dataset_id,
         get_request.dataset_url,
@@ -179,8 +199,12 @@ def _run_get_request(
         CommandType.GET,
         get_request.index_parts,
         dataset_sync=get_request.sync,
+        no_metadata_cache=no_metadata_cache,
     )
     get_request.dataset_url = retrieval_service.uri
+    # The service selection may have read the metadata of the dataset, but
+    # no file is downloaded before the credentials are checked
+    startup_steps.finish()
     logger.info(
         "Downloading using service "
         f"{retrieval_service.service_type.service_name.value}..."
@@ -0,0 +1,52 @@
+import json
+import logging
+import os
+import pathlib
+import tempfile
+from typing import Any, Callable, Optional, TypeVar
+
+logger = logging.getLogger("copernicus_marine_root_logger")
+
+_T = TypeVar("_T")
+
+
+def read_json_cache_file(
+    path: pathlib.Path, decode: Callable[[Any], Optional[_T]]
+) -> Optional[_T]:
+    """
+    Read a cache file written by ``write_json_cache_file`` and decode its
+    content. Missing, unreadable or invalid files are treated as a cache
+    miss.
+    """
+    try:
+        with open(path) as cache_file:
+            return decode(json.load(cache_file))
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, TypeError) as exception:
+        logger.debug(f"Ignoring unreadable cache file {path}: {exception}")
+        return None
+
+
+def write_json_cache_file(path: pathlib.Path, content: Any) -> None:
+    """
+    Write a cache file atomically, so that concurrent processes never read
+    a partial file. Errors are only logged, the cache being optional.
+    """
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        file_descriptor, temporary_path = tempfile.mkstemp(
+            dir=path.parent, suffix=".tmp"
+        )
+    except OSError as exception:
+        logger.debug(f"Could not write cache file {path}: {exception}")
+        return
+    try:
+        with os.fdopen(file_descriptor, "w") as temporary_file:
+            json.dump(content, temporary_file)
+        os.replace(temporary_path, path)
+    except (OSError, ValueError, TypeError) as exception:
+        logger.debug(f"Could not write cache file {path}: {exception}")
+    finally:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
@@ -0,0 +1,56 @@
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Generic, Hashable, Optional, Tuple, TypeVar
+
+_V = TypeVar("_V")
+
+_time_to_live_caches: "weakref.WeakSet[TimeToLiveCache]" = weakref.WeakSet()
+
+
+class TimeToLiveCache(Generic[_V]):
+    """
+    In-memory cache of values expiring after a time to live.
+
+    The least recently used entries are dropped beyond maximum_size.
+    """
+
+    def __init__(self, time_to_live: timedelta, maximum_size: int = 64):
+        self.time_to_live = time_to_live
+        self.maximum_size = maximum_size
+        self.__entries: OrderedDict[Hashable, Tuple[float, _V]] = OrderedDict()
+        self.__lock = threading.Lock()
+        _time_to_live_caches.add(self)
+
+    def get(self, key: Hashable) -> Optional[_V]:
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                return None
+            saved_at, value = entry
+            if time.monotonic() - saved_at > self.time_to_live.total_seconds():
+                del self.__entries[key]
+                return None
+            self.__entries.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: _V) -> None:
+        with self.__lock:
+            self.__entries[key] = (time.monotonic(), value)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.maximum_size:
+                self.__entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__entries.clear()
+
+
+def clear_time_to_live_caches() -> None:
+    """
+    Forget the values kept in memory, for instance when the cache is reset.
+    """
+    for time_to_live_cache in list(_time_to_live_caches):
+        time_to_live_cache.clear()
@@ -0,0 +1,96 @@
+import hashlib
+import logging
+import pathlib
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from copernicusmarine.core_functions.json_file_cache import (
+    read_json_cache_file,
+    write_json_cache_file,
+)
+from copernicusmarine.core_functions.utils import CACHE_BASE_DIRECTORY
+
+logger = logging.getLogger("copernicus_marine_root_logger")
+
+METADATA_CACHE_DIRECTORY: pathlib.Path = CACHE_BASE_DIRECTORY / "metadata"
+
+
+class OfflineMetadataNotCached(Exception):
+    def __init__(self, description: str):
+        message = (
+            f"Offline mode is enabled but no {description} is cached. "
+            "Please run the command once with network access "
+            "to populate the cache."
+        )
+        super().__init__(message)
+        self.__setattr__("custom_exception_message", message)
+
+
+@dataclass
+class CachedMetadata:
+    content: Any
+    saved_at: datetime
+
+    @property
+    def age(self) -> timedelta:
+        return datetime.now() - self.saved_at
+
+
+class MetadataCache:
+    """
+    On-disk cache of small metadata documents, one file per key.
+
+    Keys are only stored hashed, so that they can contain credentials.
+    """
+
+    def __init__(
+        self, cache_directory: pathlib.Path = METADATA_CACHE_DIRECTORY
+    ) -> None:
+        self.cache_directory = cache_directory
+
+    def _get_path(self, key_hash: str) -> pathlib.Path:
+        return self.cache_directory / f"{key_hash}.json"
+
+    def get(self, key: str) -> Optional[CachedMetadata]:
+        key_hash = _hash_key(key)
+
+        def decode(cached: dict[str, Any]) -> Optional[CachedMetadata]:
+            if cached.get("key_hash") != key_hash:
+                return None
+            return CachedMetadata(
+                content=cached["content"],
+                saved_at=datetime.fromisoformat(cached["saved_at"]),
+            )
+
+        return read_json_cache_file(self._get_path(key_hash), decode)
+
+    def put(self, key: str, content: Any) -> None:
+        key_hash = _hash_key(key)
+        write_json_cache_file(
+            self._get_path(key_hash),
+            {
+                "key_hash": key_hash,
+                "saved_at": datetime.now().isoformat(),
+                "content": content,
+            },
+        )
+
+
+def _hash_key(key: str) -> str:
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def log_offline_metadata_age(
+    description: str, age: timedelta, stale_after: timedelta
+) -> None:
+    rounded_age = timedelta(seconds=int(age.total_seconds()))
+    if age > stale_after:
+        logger.warning(
+            f"Offline mode: using {description} cached {rounded_age} ago, "
+            f"older than {stale_after}. It may be outdated."
+        )
+    else:
+        logger.debug(
+            f"Offline mode: using {description} cached {rounded_age} ago."
+        )
@@ -0,0 +1,302 @@
+import logging
+import random
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Executor, Future
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Callable, Dict, Optional, TypeVar
+
+import botocore.exceptions
+
+logger = logging.getLogger("copernicus_marine_root_logger")
+
+_T = TypeVar("_T")
+
+THROTTLING_ERROR_CODES = {
+    "RequestLimitExceeded",
+    "RequestThrottled",
+    "SlowDown",
+    "Throttling",
+    "ThrottlingException",
+    "TooManyRequests",
+    "429",
+}
+
+
+class RetryErrorClass(str, Enum):
+    THROTTLING = "throttling"
+    SERVER = "server"
+    NETWORK = "network"
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_attempts: int
+    base_delay_seconds: float
+    max_delay_seconds: float
+
+    def get_delay(self, retry_index: int) -> float:
+        """
+        Full jitter backoff: a random delay up to the exponential backoff.
+        """
+        return random.uniform(
+            0,
+            min(
+                self.max_delay_seconds,
+                self.base_delay_seconds * 2**retry_index,
+            ),
+        )
+
+
+DEFAULT_RETRY_POLICIES = {
+    RetryErrorClass.THROTTLING: RetryPolicy(10, 1.0, 30.0),
+    RetryErrorClass.SERVER: RetryPolicy(6, 0.5, 15.0),
+    RetryErrorClass.NETWORK: RetryPolicy(6, 0.25, 10.0),
+}
+RETRY_BUDGET_CAPACITY = 500
+RETRY_COST = 5
+CIRCUIT_BREAKER_FAILURE_THRESHOLD = 20
+CIRCUIT_BREAKER_COOL_DOWN_SECONDS = 30.0
+
+
+def classify_error(exception: BaseException) -> Optional[RetryErrorClass]:
+    """
+    Class of a retryable error, None if the error is not worth retrying.
+    """
+    if isinstance(exception, botocore.exceptions.ClientError):
+        error = exception.response.get("Error", {})
+        status_code = exception.response.get("ResponseMetadata", {}).get(
+            "HTTPStatusCode"
+        )
+        code = str(error.get("Code", ""))
+        if code in THROTTLING_ERROR_CODES or status_code == 429:
+            return RetryErrorClass.THROTTLING
+        if (status_code or 0) >= 500 or (code.isdigit() and int(code) >= 500):
+            return RetryErrorClass.SERVER
+        return None
+    if isinstance(
+        exception,
+        (
+            botocore.exceptions.ConnectionError,
+            botocore.exceptions.HTTPClientError,
+            botocore.exceptions.IncompleteReadError,
+            ConnectionError,
+            TimeoutError,
+        ),
+    ):
+        return RetryErrorClass.NETWORK
+    return None
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of sending a request while the circuit breaker is open.
+    """
+
+    def __init__(self, cool_down_seconds: float):
+        super().__init__(
+            "Too many consecutive errors from the server, no request is sent "
+            f"for {cool_down_seconds:.0f} s. Please try again later."
+        )
+
+
+@dataclass
+class RetryStatistics:
+    attempts: int = 0
+    retries: Counter = field(default_factory=Counter)
+    failures: int = 0
+    budget_exhausted: int = 0
+    circuit_opened: int = 0
+    rejected_by_circuit: int = 0
+    backoff_seconds: float = 0.0
+
+    def describe(self) -> str:
+        retries = ", ".join(
+            f"{count} {error_class.value}"
+            for error_class, count in sorted(self.retries.items())
+        )
+        return (
+            f"{self.attempts} requests, "
+            f"{sum(self.retries.values())} retries ({retries or 'none'}), "
+            f"{self.backoff_seconds:.1f} s of backoff, "
+            f"{self.failures} failed, "
+            f"retry budget exhausted {self.budget_exhausted} times, "
+            f"circuit opened {self.circuit_opened} times"
+        )
+
+
+class RetryController:
+    """
+    Retries of the S3 requests shared by all the zarr stores.
+
+    Retryable errors are classified as throttling, server or network
+    errors, each with its policy of attempts and full jitter backoff. A
+    retry budget shared by all the requests limits the retries when many
+    requests fail: each retry costs RETRY_COST tokens and each success
+    gives back one. After CIRCUIT_BREAKER_FAILURE_THRESHOLD consecutive
+    server or network errors, the circuit breaker opens and requests fail
+    at once with CircuitOpenError for the cool down, then a single request
+    is let through to probe the server.
+
+    Requests are run on an executor with ``submit``, which schedules the
+    retries on a timer instead of sleeping: a request waiting for its
+    retry holds neither a thread of the executor nor the calling thread,
+    which may be a worker of dask.
+    """
+
+    def __init__(
+        self,
+        policies: Dict[RetryErrorClass, RetryPolicy] = DEFAULT_RETRY_POLICIES,
+        retry_budget_capacity: int = RETRY_BUDGET_CAPACITY,
+        retry_cost: int = RETRY_COST,
+        failure_threshold: int = CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+        cool_down_seconds: float = CIRCUIT_BREAKER_COOL_DOWN_SECONDS,
+    ) -> None:
+        self.policies = policies
+        self.retry_budget_capacity = retry_budget_capacity
+        self.retry_cost = retry_cost
+        self.failure_threshold = failure_threshold
+        self.cool_down_seconds = cool_down_seconds
+        self.statistics = RetryStatistics()
+        self.__retry_budget = retry_budget_capacity
+        self.__consecutive_failures = 0
+        self.__circuit_opened_at: Optional[float] = None
+        self.__probe_in_flight = False
+        self.__lock = threading.Lock()
+
+    def submit(
+        self, executor: Executor, function: Callable[[], _T]
+    ) -> "Future[_T]":
+        """
+        Call the function on the executor until it succeeds or is not
+        worth retrying, the retries being scheduled on the executor again
+        once their backoff has elapsed.
+        """
+        result: "Future[_T]" = Future()
+
+        def attempt(retry_index: int) -> None:
+            try:
+                self._before_attempt()
+                value = function()
+            except BaseException as exception:
+                delay = self._after_failure(exception, retry_index)
+                if delay is None:
+                    result.set_exception(exception)
+                    return
+                timer = threading.Timer(
+                    delay, schedule_attempt, args=(retry_index + 1,)
+                )
+                timer.daemon = True
+                timer.start()
+            else:
+                self._after_success()
+                result.set_result(value)
+
+        def schedule_attempt(retry_index: int) -> None:
+            try:
+                executor.submit(attempt, retry_index)
+            except RuntimeError as exception:
+                # The executor is shut down, at the exit of the interpreter
+                result.set_exception(exception)
+
+        schedule_attempt(0)
+        return result
+
+    def _before_attempt(self) -> None:
+        with self.__lock:
+            if self.__circuit_opened_at is not None:
+                cool_down_elapsed = (
+                    time.monotonic() - self.__circuit_opened_at
+                    >= self.cool_down_seconds
+                )
+                if not cool_down_elapsed or self.__probe_in_flight:
+                    self.statistics.rejected_by_circuit += 1
+                    raise CircuitOpenError(self.cool_down_seconds)
+                self.__probe_in_flight = True
+            self.statistics.attempts += 1
+
+    def _after_success(self) -> None:
+        with self.__lock:
+            self.__retry_budget = min(
+                self.retry_budget_capacity, self.__retry_budget + 1
+            )
+            self.__consecutive_failures = 0
+            self.__circuit_opened_at = None
+            self.__probe_in_flight = False
+
+    def _after_failure(
+        self, exception: BaseException, retry_index: int
+    ) -> Optional[float]:
+        """
+        Delay before the next attempt, None if it should not be retried.
+        """
+        if isinstance(exception, CircuitOpenError):
+            return None
+        error_class = classify_error(exception)
+        with self.__lock:
+            if error_class in [
+                RetryErrorClass.SERVER,
+                RetryErrorClass.NETWORK,
+            ]:
+                self._record_circuit_failure()
+            else:
+                # The server answered, with a missing key or throttling
+                self.__consecutive_failures = 0
+                self.__circuit_opened_at = None
+                self.__probe_in_flight = False
+            if error_class is None:
+                return None
+            policy = self.policies[error_class]
+            if retry_index + 1 >= policy.max_attempts:
+                self.statistics.failures += 1
+                return None
+            if self.__retry_budget < self.retry_cost:
+                self.statistics.budget_exhausted += 1
+                self.statistics.failures += 1
+                return None
+            self.__retry_budget -= self.retry_cost
+            delay = policy.get_delay(retry_index)
+            self.statistics.retries[error_class] += 1
+            self.statistics.backoff_seconds += delay
+        logger.debug(
+            f"S3 {error_class.value} error: {exception}, "
+            f"retrying in {delay:.2f} s..."
+        )
+        return delay
+
+    def _record_circuit_failure(self) -> None:
+        self.__consecutive_failures += 1
+        if self.__probe_in_flight or (
+            self.__circuit_opened_at is None
+            and self.__consecutive_failures >= self.failure_threshold
+        ):
+            if not self.__probe_in_flight:
+                self.statistics.circuit_opened += 1
+                logger.warning(
+                    f"{self.__consecutive_failures} consecutive errors from "
+                    "the server, no request will be sent for "
+                    f"{self.cool_down_seconds:.0f} s"
+                )
+            self.__circuit_opened_at = time.monotonic()
+            self.__probe_in_flight = False
+
+    def log_statistics(self) -> None:
+        """
+        Log the statistics since the last call, at info level if some
+        requests had to be retried.
+        """
+        with self.__lock:
+            statistics, self.statistics = self.statistics, RetryStatistics()
+        if not statistics.attempts:
+            return
+        level = (
+            logging.INFO
+            if statistics.retries or statistics.failures
+            else logging.DEBUG
+        )
+        logger.log(level, f"S3 requests: {statistics.describe()}")
+
+
+s3_retry_controller = RetryController()
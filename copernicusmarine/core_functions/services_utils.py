@@ -1,5 +1,6 @@
 import logging
-from dataclasses import dataclass
+from dataclasses import astuple, dataclass, replace
+from datetime import timedelta
 from enum import Enum
 from itertools import chain
 from typing import List, Literal, Optional, Tuple, Union
@@ -17,6 +18,7 @@ from copernicusmarine.catalogue_parser.request_structure import (
     DatasetTimeAndGeographicalSubset,
 )
 from copernicusmarine.core_functions import custom_open_zarr
+from copernicusmarine.core_functions.memoization import TimeToLiveCache
 from copernicusmarine.core_functions.utils import (
     FormatNotSupported,
     datetime_parser,
@@ -28,6 +30,8 @@ from copernicusmarine.download_functions.subset_xarray import (
 
 logger = logging.getLogger("copernicus_marine_root_logger")
 
+RETRIEVAL_SERVICE_MEMORY_TTL = timedelta(minutes=10)
+
 
 class _Command(Enum):
     GET = "get"
@@ -155,12 +159,16 @@ def _get_best_arco_service_type(
     dataset_subset: DatasetTimeAndGeographicalSubset,
     dataset_url: str,
     username: Optional[str],
+    no_metadata_cache: bool,
 ) -> Literal[
     CopernicusMarineDatasetServiceType.TIMESERIES,
     CopernicusMarineDatasetServiceType.GEOSERIES,
 ]:
     dataset = custom_open_zarr.open_zarr(
-        dataset_url, copernicus_marine_username=username
+        dataset_url,
+        chunks="auto",
+        copernicus_marine_username=username,
+        no_metadata_cache=no_metadata_cache,
     )
 
     latitude_size = get_size_of_coordinate_subset(
@@ -221,6 +229,7 @@ def _select_service_by_priority(
     command_type: CommandType,
     dataset_subset: Optional[DatasetTimeAndGeographicalSubset],
     username: Optional[str],
+    no_metadata_cache: bool,
 ) -> CopernicusMarineService:
     dataset_available_service_types = [
         service.service_type for service in dataset_version_part.services
@@ -249,7 +258,10 @@ def _select_service_by_priority(
             )
         best_arco_service_type: CopernicusMarineDatasetServiceType = (
             _get_best_arco_service_type(
-                dataset_subset, first_available_service.uri, username
+                dataset_subset,
+                first_available_service.uri,
+                username,
+                no_metadata_cache,
             )
         )
         return dataset_version_part.get_service_by_service_type(
@@ -268,26 +280,19 @@ def parse_dataset_id_and_service_and_suffix_path_from_url(
             "'dataset_url' or 'dataset_id' options"
         )
         raise syntax_error
-    return next_or_raise_exception(
-        (
-            (
-                dataset.dataset_id,
-                service.service_type,
-                dataset_url.split(service.uri)[1],
-            )
-            for product in catalogue.products
-            for dataset in product.datasets
-            for dataset_version in dataset.versions
-            for dataset_part in dataset_version.parts
-            for service in dataset_part.services
-            if dataset_url.startswith(service.uri)
-        ),
-        KeyError(
+    dataset_and_service = catalogue.find_service_from_url(dataset_url)
+    if dataset_and_service is None:
+        raise KeyError(
             f"The requested dataset URL '{dataset_url}' "
             "was not found in the catalogue, "
             "you can use 'copernicusmarine describe --include-datasets "
             "--contains <search_token>' to find datasets"
-        ),
+        )
+    dataset, service = dataset_and_service
+    return (
+        dataset.dataset_id,
+        service.service_type,
+        dataset_url.split(service.uri)[1],
     )
 
 
@@ -300,6 +305,11 @@ class RetrievalService:
     dataset_valid_start_date: Optional[Union[str, int]]
 
 
+_retrieval_services_in_memory: TimeToLiveCache[
+    Tuple[CopernicusMarineCatalogue, RetrievalService]
+] = TimeToLiveCache(RETRIEVAL_SERVICE_MEMORY_TTL)
+
+
 def get_retrieval_service(
     catalogue: CopernicusMarineCatalogue,
     dataset_id: Optional[str],
@@ -312,6 +322,70 @@ def get_retrieval_service(
     dataset_subset: Optional[DatasetTimeAndGeographicalSubset] = None,
     dataset_sync: bool = False,
     username: Optional[str] = None,
+    no_metadata_cache: bool = False,
+) -> RetrievalService:
+    """
+    Select the dataset version, part and service to retrieve the data from.
+
+    The selection is kept in memory for RETRIEVAL_SERVICE_MEMORY_TTL for
+    the same catalogue and arguments, as it can require opening the
+    dataset to choose between the ARCO services. It is never kept with
+    no_metadata_cache.
+    """
+    memory_key = (
+        dataset_id,
+        dataset_url,
+        force_dataset_version_label,
+        force_dataset_part_label,
+        force_service_type_string,
+        command_type.name,
+        index_parts,
+        astuple(dataset_subset) if dataset_subset else None,
+        dataset_sync,
+        username,
+    )
+    memoized = (
+        None
+        if no_metadata_cache
+        else _retrieval_services_in_memory.get(memory_key)
+    )
+    if memoized is not None and memoized[0] is catalogue:
+        logger.debug("Retrieval service found in memory")
+        return replace(memoized[1])
+    retrieval_service = _get_retrieval_service(
+        catalogue=catalogue,
+        dataset_id=dataset_id,
+        dataset_url=dataset_url,
+        force_dataset_version_label=force_dataset_version_label,
+        force_dataset_part_label=force_dataset_part_label,
+        force_service_type_string=force_service_type_string,
+        command_type=command_type,
+        index_parts=index_parts,
+        dataset_subset=dataset_subset,
+        dataset_sync=dataset_sync,
+        username=username,
+        no_metadata_cache=no_metadata_cache,
+    )
+    if not no_metadata_cache:
+        _retrieval_services_in_memory.put(
+            memory_key, (catalogue, replace(retrieval_service))
+        )
+    return retrieval_service
+
+
+def _get_retrieval_service(
+    catalogue: CopernicusMarineCatalogue,
+    dataset_id: Optional[str],
+    dataset_url: Optional[str],
+    force_dataset_version_label: Optional[str],
+    force_dataset_part_label: Optional[str],
+    force_service_type_string: Optional[str],
+    command_type: CommandType,
+    index_parts: bool,
+    dataset_subset: Optional[DatasetTimeAndGeographicalSubset],
+    dataset_sync: bool,
+    username: Optional[str],
+    no_metadata_cache: bool,
 ) -> RetrievalService:
     force_service_type: Optional[CopernicusMarineDatasetServiceType] = (
         _service_type_from_string(force_service_type_string, command_type)
@@ -349,6 +423,7 @@ def get_retrieval_service(
         dataset_subset=dataset_subset,
         dataset_sync=dataset_sync,
         username=username,
+        no_metadata_cache=no_metadata_cache,
     )
 
 
@@ -364,20 +439,15 @@ def _get_retrieval_service_from_dataset_id(
     dataset_subset: Optional[DatasetTimeAndGeographicalSubset],
     dataset_sync: bool,
     username: Optional[str],
+    no_metadata_cache: bool,
 ) -> RetrievalService:
-    dataset: CopernicusMarineProductDataset = next_or_raise_exception(
-        (
-            dataset
-            for product in catalogue.products
-            for dataset in product.datasets
-            if dataset_id == dataset.dataset_id
-        ),
-        KeyError(
+    dataset = catalogue.get_dataset(dataset_id)
+    if dataset is None:
+        raise KeyError(
             f"The requested dataset '{dataset_id}' was not found in the catalogue,"
             " you can use 'copernicusmarine describe --include-datasets "
             "--contains <search_token>' to find datasets"
-        ),
-    )
+        )
     return _get_retrieval_service_from_dataset(
         dataset=dataset,
         suffix_path=suffix_path,
@@ -389,6 +459,7 @@ def _get_retrieval_service_from_dataset_id(
         dataset_subset=dataset_subset,
         dataset_sync=dataset_sync,
         username=username,
+        no_metadata_cache=no_metadata_cache,
     )
 
 
@@ -403,6 +474,7 @@ def _get_retrieval_service_from_dataset(
     dataset_subset: Optional[DatasetTimeAndGeographicalSubset],
     dataset_sync: bool,
     username: Optional[str],
+    no_metadata_cache: bool,
 ) -> RetrievalService:
     if force_dataset_version_label:
         logger.info(
@@ -426,6 +498,7 @@ def _get_retrieval_service_from_dataset(
         dataset_subset=dataset_subset,
         dataset_sync=dataset_sync,
         username=username,
+        no_metadata_cache=no_metadata_cache,
     )
 
 
@@ -440,6 +513,7 @@ def _get_retrieval_service_from_dataset_version(
     dataset_subset: Optional[DatasetTimeAndGeographicalSubset],
     dataset_sync: bool,
     username: Optional[str],
+    no_metadata_cache: bool,
 ) -> RetrievalService:
     if len(dataset_version.parts) > 1 and dataset_sync:
         raise Exception(
@@ -496,6 +570,7 @@ def _get_retrieval_service_from_dataset_version(
             command_type=command_type,
             dataset_subset=dataset_subset,
             username=username,
+            no_metadata_cache=no_metadata_cache,
         )
         logger.info(
             "Service was not specified, the default one was "
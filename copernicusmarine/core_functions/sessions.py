@@ -1,24 +1,46 @@
+import asyncio
+import atexit
+import logging
+import os
 import ssl
-from typing import Any, List, Literal, Optional, Tuple
+import threading
+import weakref
+from functools import lru_cache
+from typing import Any, Dict, List, Literal, Optional, Tuple
 
 import aiohttp
 import boto3
 import botocore
 import botocore.config
 import certifi
+from boto3.s3.transfer import TransferConfig
 import nest_asyncio
 import requests
 from requests.adapters import HTTPAdapter, Retry
 
 from copernicusmarine.core_functions.environment_variables import (
     COPERNICUSMARINE_DISABLE_SSL_CONTEXT,
+    COPERNICUSMARINE_GET_CONCURRENT_DOWNLOADS,
+    COPERNICUSMARINE_MAX_CONCURRENT_REQUESTS,
     COPERNICUSMARINE_TRUST_ENV,
     PROXY_HTTP,
     PROXY_HTTPS,
 )
 from copernicusmarine.core_functions.utils import create_custom_query_function
 
+logger = logging.getLogger("copernicus_marine_root_logger")
+
 TRUST_ENV = COPERNICUSMARINE_TRUST_ENV == "True"
+MAX_CONNECTIONS_PER_HOST = int(COPERNICUSMARINE_MAX_CONCURRENT_REQUESTS)
+# Number of threads of the get command, the default of ThreadPool
+MAX_CONCURRENT_DOWNLOADS = (
+    int(COPERNICUSMARINE_GET_CONCURRENT_DOWNLOADS)
+    if COPERNICUSMARINE_GET_CONCURRENT_DOWNLOADS
+    else os.cpu_count() or 1
+)
+# Threads of each managed S3 download, the default of TransferConfig
+S3_TRANSFER_MAX_CONCURRENCY = 10
+KEEPALIVE_TIMEOUT_SECONDS = 30
 PROXIES = {}
 if PROXY_HTTP:
     PROXIES["http"] = PROXY_HTTP
@@ -26,16 +48,196 @@ if PROXY_HTTPS:
     PROXIES["https"] = PROXY_HTTPS
 
 
+@lru_cache(maxsize=None)
 def _get_ssl_context() -> Optional[ssl.SSLContext]:
     if COPERNICUSMARINE_DISABLE_SSL_CONTEXT is not None:
         return None
     return ssl.create_default_context(cafile=certifi.where())
 
 
+class TransportManager:
+    """
+    Owner of the connection pools shared by the HTTP clients of the process.
+
+    The catalogue, the version check, the credentials check and S3 get
+    their sessions from here, so that connections are kept alive and
+    reused from one request to the next instead of opening a new TLS
+    session each time. The pools are sized to the configured number of
+    concurrent requests, and for S3 to the number of connections of the
+    concurrent downloads as well, each managed download using up to
+    transfer_max_concurrency threads.
+
+    The boto3 clients, which are thread safe and slow to create, are
+    created once per endpoint, operations and username and shared by all
+    the threads.
+    """
+
+    def __init__(
+        self,
+        max_connections_per_host: int = MAX_CONNECTIONS_PER_HOST,
+        max_concurrent_downloads: int = MAX_CONCURRENT_DOWNLOADS,
+        transfer_max_concurrency: int = S3_TRANSFER_MAX_CONCURRENCY,
+    ) -> None:
+        self.max_connections_per_host = max_connections_per_host
+        self.max_concurrent_downloads = max_concurrent_downloads
+        self.transfer_max_concurrency = transfer_max_concurrency
+        self.__lock = threading.Lock()
+        self.__requests_adapter: Optional[HTTPAdapter] = None
+        self.__aiohttp_sessions: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, aiohttp.ClientSession
+        ] = weakref.WeakKeyDictionary()
+        self.__boto3_config: Optional[botocore.config.Config] = None
+        self.__boto3_clients: Dict[
+            Tuple[str, Tuple[str, ...], str, bool], Any
+        ] = {}
+        self.__boto3_clients_lock = threading.Lock()
+
+    def get_aiohttp_session(self) -> aiohttp.ClientSession:
+        """
+        Session of the current event loop, to be left open by the caller.
+        """
+        nest_asyncio.apply()
+        loop = asyncio.get_event_loop()
+        with self.__lock:
+            session = self.__aiohttp_sessions.get(loop)
+            if session is None or session.closed:
+                connector = aiohttp.TCPConnector(
+                    ssl=_get_ssl_context(),
+                    limit=self.max_connections_per_host,
+                    limit_per_host=self.max_connections_per_host,
+                    keepalive_timeout=KEEPALIVE_TIMEOUT_SECONDS,
+                )
+                session = aiohttp.ClientSession(
+                    connector=connector, trust_env=TRUST_ENV
+                )
+                self.__aiohttp_sessions[loop] = session
+        return session
+
+    def get_requests_session(self) -> requests.Session:
+        """
+        New session on the shared connection pool.
+
+        Sessions are not shared themselves so that cookies, used by the
+        credentials check, do not leak from one caller to another.
+        """
+        session = requests.Session()
+        session.trust_env = TRUST_ENV
+        session.verify = certifi.where()
+        session.proxies = PROXIES
+        session.mount("https://", self._get_requests_adapter())
+        return session
+
+    def _get_requests_adapter(self) -> HTTPAdapter:
+        with self.__lock:
+            if self.__requests_adapter is None:
+                self.__requests_adapter = HTTPAdapter(
+                    pool_maxsize=self.max_connections_per_host,
+                    max_retries=Retry(
+                        total=5,
+                        backoff_factor=1,
+                        status_forcelist=[500, 502, 503, 504],
+                    ),
+                )
+            return self.__requests_adapter
+
+    def get_boto3_config(self) -> botocore.config.Config:
+        with self.__lock:
+            if self.__boto3_config is None:
+                self.__boto3_config = botocore.config.Config(
+                    s3={"addressing_style": "virtual"},
+                    signature_version=botocore.UNSIGNED,
+                    retries={"max_attempts": 10, "mode": "standard"},
+                    max_pool_connections=max(
+                        self.max_connections_per_host,
+                        self.max_concurrent_downloads
+                        * self.transfer_max_concurrency,
+                    ),
+                    tcp_keepalive=True,
+                )
+            return self.__boto3_config
+
+    def get_s3_transfer_config(self) -> TransferConfig:
+        """
+        Configuration of the managed downloads, matching the size of the
+        pool of the boto3 clients.
+        """
+        return TransferConfig(max_concurrency=self.transfer_max_concurrency)
+
+    def get_boto3_client(
+        self,
+        endpoint_url: str,
+        operation_type: List[str],
+        username: Optional[str] = None,
+        retried_by_botocore: bool = True,
+    ) -> Any:
+        """
+        Shared client of the endpoint. Without retried_by_botocore, the
+        client makes a single attempt per request, for callers handling
+        the retries themselves.
+        """
+        key = (
+            endpoint_url,
+            tuple(sorted(operation_type)),
+            username or "",
+            retried_by_botocore,
+        )
+        with self.__boto3_clients_lock:
+            s3_client = self.__boto3_clients.get(key)
+            if s3_client is None:
+                config = self.get_boto3_config()
+                if not retried_by_botocore:
+                    config = config.merge(
+                        botocore.config.Config(
+                            retries={"max_attempts": 1, "mode": "standard"}
+                        )
+                    )
+                s3_client = boto3.Session().client(
+                    "s3", config=config, endpoint_url=endpoint_url
+                )
+                for operation in operation_type:
+                    # Register the botocore event handler for adding custom
+                    # query params to S3 HEAD and GET requests
+                    s3_client.meta.events.register(
+                        f"before-call.s3.{operation}",
+                        create_custom_query_function(username),
+                    )
+                self.__boto3_clients[key] = s3_client
+            return s3_client
+
+    def close(self) -> None:
+        with self.__lock:
+            sessions = list(self.__aiohttp_sessions.items())
+            self.__aiohttp_sessions.clear()
+            requests_adapter, self.__requests_adapter = (
+                self.__requests_adapter,
+                None,
+            )
+        with self.__boto3_clients_lock:
+            boto3_clients = list(self.__boto3_clients.values())
+            self.__boto3_clients.clear()
+        for loop, session in sessions:
+            if session.closed or loop.is_closed() or loop.is_running():
+                continue
+            try:
+                loop.run_until_complete(session.close())
+            except Exception as exception:
+                logger.debug(f"Could not close the http session: {exception}")
+        if requests_adapter is not None:
+            requests_adapter.close()
+        for s3_client in boto3_clients:
+            s3_client.close()
+
+
+transport_manager = TransportManager()
+atexit.register(transport_manager.close)
+
+
 def get_configured_aiohttp_session() -> aiohttp.ClientSession:
-    nest_asyncio.apply()
-    connector = aiohttp.TCPConnector(ssl=_get_ssl_context())
-    return aiohttp.ClientSession(connector=connector, trust_env=TRUST_ENV)
+    return transport_manager.get_aiohttp_session()
+
+
+def get_s3_transfer_config() -> TransferConfig:
+    return transport_manager.get_s3_transfer_config()
 
 
 def get_https_proxy() -> Optional[str]:
@@ -47,48 +249,21 @@ def get_configured_boto3_session(
     operation_type: List[Literal["ListObjects", "HeadObject", "GetObject"]],
     username: Optional[str] = None,
     return_ressources: bool = False,
+    retried_by_botocore: bool = True,
 ) -> Tuple[Any, Any]:
-    config_boto3 = botocore.config.Config(
-        s3={"addressing_style": "virtual"},
-        signature_version=botocore.UNSIGNED,
-        retries={"max_attempts": 10, "mode": "standard"},
+    s3_client = transport_manager.get_boto3_client(
+        endpoint_url, list(operation_type), username, retried_by_botocore
     )
-    s3_session = boto3.Session()
-    s3_client = s3_session.client(
-        "s3",
-        config=config_boto3,
-        endpoint_url=endpoint_url,
-    )
-    for operation in operation_type:
-        # Register the botocore event handler for adding custom query params
-        # to S3 HEAD and GET requests
-        s3_client.meta.events.register(
-            f"before-call.s3.{operation}",
-            create_custom_query_function(username),
-        )
     if not return_ressources:
         return s3_client, None
+    # Resources are not thread safe, so they are not shared
     s3_resource = boto3.resource(
         "s3",
-        config=config_boto3,
+        config=transport_manager.get_boto3_config(),
         endpoint_url=endpoint_url,
     )
     return s3_client, s3_resource
 
 
 def get_configured_requests_session() -> requests.Session:
-    session = requests.Session()
-    session.trust_env = TRUST_ENV
-    session.verify = certifi.where()
-    session.proxies = PROXIES
-    session.mount(
-        "https://",
-        HTTPAdapter(
-            max_retries=Retry(
-                total=5,
-                backoff_factor=1,
-                status_forcelist=[500, 502, 503, 504],
-            )
-        ),
-    )
-    return session
+    return transport_manager.get_requests_session()
@@ -0,0 +1,137 @@
+import logging
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+logger = logging.getLogger("copernicus_marine_root_logger")
+
+_T = TypeVar("_T")
+
+
+@dataclass
+class StartupStepTiming:
+    name: str
+    duration_seconds: float
+    critical_path_seconds: float
+
+
+class StartupSteps:
+    """
+    Run the startup steps of a command following their dependencies.
+
+    Steps given to ``start`` have no dependency on the other steps: they
+    run in a thread while the command goes on, and ``wait`` returns their
+    result when it is needed. Steps given to ``run`` are executed on the
+    calling thread, which is required for steps prompting the user or
+    running an event loop.
+
+    The time spent by the calling thread in each step, running it or
+    waiting for it, is its share of the critical path. Timings are logged
+    at debug level by ``finish``.
+
+    Used as a context manager, the steps still running are waited for when
+    leaving the block, even on an error: the error of a started step is
+    raised first, as a later error may only be a consequence of it. The
+    thread of the steps is always stopped.
+    """
+
+    def __init__(self, command_name: str, max_workers: int = 4) -> None:
+        self.command_name = command_name
+        self.step_timings: List[StartupStepTiming] = []
+        self.__executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="startup"
+        )
+        self.__futures: Dict[str, Future] = {}
+        self.__durations: Dict[str, float] = {}
+        self.__start_time = time.perf_counter()
+
+    def __enter__(self) -> "StartupSteps":
+        return self
+
+    def __exit__(self, *exception_info: Any) -> None:
+        try:
+            self.wait_all()
+        finally:
+            self.__executor.shutdown()
+
+    def finish(self) -> None:
+        """
+        Wait for the steps still running and log the timings.
+        """
+        try:
+            self.wait_all()
+        finally:
+            self.__executor.shutdown()
+        self.log_timings()
+
+    def wait_all(self) -> None:
+        """
+        Wait for all the steps still running, then raise the error of the
+        first one that failed.
+        """
+        first_error: Optional[BaseException] = None
+        for name in list(self.__futures):
+            try:
+                self.wait(name)
+            except BaseException as error:
+                if first_error is None:
+                    first_error = error
+        if first_error is not None:
+            raise first_error
+
+    def start(
+        self, name: str, function: Callable[..., Any], *args, **kwargs
+    ) -> None:
+        def timed_function():
+            start_time = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.__durations[name] = time.perf_counter() - start_time
+
+        self.__futures[name] = self.__executor.submit(timed_function)
+
+    def wait(self, name: str) -> Any:
+        future = self.__futures.pop(name)
+        start_time = time.perf_counter()
+        try:
+            return future.result()
+        finally:
+            self.step_timings.append(
+                StartupStepTiming(
+                    name=name,
+                    duration_seconds=self.__durations.get(name, 0.0),
+                    critical_path_seconds=time.perf_counter() - start_time,
+                )
+            )
+
+    def run(
+        self, name: str, function: Callable[..., _T], *args, **kwargs
+    ) -> _T:
+        start_time = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            duration = time.perf_counter() - start_time
+            self.step_timings.append(
+                StartupStepTiming(
+                    name=name,
+                    duration_seconds=duration,
+                    critical_path_seconds=duration,
+                )
+            )
+
+    def log_timings(self) -> None:
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+        total_seconds = time.perf_counter() - self.__start_time
+        for timing in self.step_timings:
+            logger.debug(
+                f"{self.command_name} startup step '{timing.name}': "
+                f"{timing.duration_seconds:.2f} s, "
+                f"{timing.critical_path_seconds:.2f} s on the critical path"
+            )
+        logger.debug(
+            f"{self.command_name} startup: {total_seconds:.2f} s in total"
+        )
@@ -7,7 +7,7 @@ from typing import List, Optional
 from copernicusmarine.catalogue_parser.catalogue_parser import (
     CopernicusMarineDatasetServiceType,
     CopernicusMarineServiceFormat,
-    parse_catalogue,
+    parse_dataset_catalogue,
 )
 from copernicusmarine.catalogue_parser.request_structure import (
     SubsetRequest,
@@ -15,7 +15,11 @@ from copernicusmarine.catalogue_parser.request_structure import (
     subset_request_from_file,
 )
 from copernicusmarine.core_functions.credentials_utils import (
-    get_and_check_username_password,
+    check_username_password,
+    get_username_password,
+)
+from copernicusmarine.core_functions.custom_open_zarr import (
+    reuse_opened_datasets,
 )
 from copernicusmarine.core_functions.models import SubsetMethod
 from copernicusmarine.core_functions.services_utils import (
@@ -24,6 +28,7 @@ from copernicusmarine.core_functions.services_utils import (
     get_retrieval_service,
     parse_dataset_id_and_service_and_suffix_path_from_url,
 )
+from copernicusmarine.core_functions.startup_steps import StartupSteps
 from copernicusmarine.core_functions.utils import (
     ServiceNotSupported,
     create_cache_directory,
@@ -42,6 +47,7 @@ from copernicusmarine.download_functions.utils import FileFormat
 logger = logging.getLogger("copernicus_marine_root_logger")
 
 
+@reuse_opened_datasets()
 def subset_function(
     dataset_url: Optional[str],
     dataset_id: Optional[str],
@@ -77,7 +83,6 @@ def subset_function(
     netcdf_compression_level: Optional[int],
     netcdf3_compatible: bool,
 ) -> pathlib.Path:
-    VersionVerifier.check_version_subset(staging)
     if staging:
         logger.warning(
             "Detecting staging flag for subset command. "
@@ -132,10 +137,46 @@ def subset_function(
         "netcdf3_compatible": netcdf3_compatible,
     }
     subset_request.update(request_update_dict)
-    username, password = get_and_check_username_password(
+
+    # Started once the cache is deleted, as it caches the versions
+    with StartupSteps("subset") as startup_steps:
+        startup_steps.start(
+            "version check", VersionVerifier.check_version_subset, staging
+        )
+        return _run_subset_request(
+            startup_steps=startup_steps,
+            username=username,
+            password=password,
+            subset_request=subset_request,
+            credentials_file=credentials_file,
+            force_download=force_download,
+            overwrite_output_data=overwrite_output_data,
+            no_metadata_cache=no_metadata_cache,
+            disable_progress_bar=disable_progress_bar,
+            staging=staging,
+        )
+
+
+def _run_subset_request(
+    startup_steps: StartupSteps,
+    username: Optional[str],
+    password: Optional[str],
+    subset_request: SubsetRequest,
+    credentials_file: Optional[pathlib.Path],
+    force_download: bool,
+    overwrite_output_data: bool,
+    no_metadata_cache: bool,
+    disable_progress_bar: bool,
+    staging: bool,
+) -> pathlib.Path:
+    username, password = get_username_password(
+        username, password, credentials_file
+    )
+    startup_steps.start(
+        "credentials check",
+        check_username_password,
         username,
         password,
-        credentials_file,
         no_metadata_cache=no_metadata_cache,
     )
     if all(
@@ -154,7 +195,9 @@ def subset_function(
     ):
         if not subset_request.dataset_id:
             if subset_request.dataset_url:
-                catalogue = parse_catalogue(
+                catalogue = parse_dataset_catalogue(
+                    dataset_id=None,
+                    dataset_url=subset_request.dataset_url,
                     no_metadata_cache=no_metadata_cache,
                     disable_progress_bar=disable_progress_bar,
                     staging=staging,
@@ -188,12 +231,18 @@ def subset_function(
     if overwrite_output_data:
         subset_request.overwrite_output_data = overwrite_output_data
 
-    catalogue = parse_catalogue(
+    catalogue = startup_steps.run(
+        "catalogue",
+        parse_dataset_catalogue,
+        dataset_id=subset_request.dataset_id,
+        dataset_url=subset_request.dataset_url,
         no_metadata_cache=no_metadata_cache,
         disable_progress_bar=disable_progress_bar,
         staging=staging,
     )
-    retrieval_service: RetrievalService = get_retrieval_service(
+    retrieval_service: RetrievalService = startup_steps.run(
+        "service selection",
+        get_retrieval_service,
         catalogue,
         subset_request.dataset_id,
         subset_request.dataset_url,
@@ -202,9 +251,13 @@ def subset_function(
         subset_request.force_service,
         CommandType.SUBSET,
         dataset_subset=subset_request.get_time_and_geographical_subset(),
+        username=username,
+        no_metadata_cache=no_metadata_cache,
     )
     subset_request.dataset_url = retrieval_service.uri
-    check_dataset_subset_bounds(
+    startup_steps.run(
+        "subset bounds check",
+        check_dataset_subset_bounds,
         username=username,
         password=password,
         dataset_url=subset_request.dataset_url,
@@ -212,7 +265,12 @@ def subset_function(
         dataset_subset=subset_request.get_time_and_geographical_subset(),
         subset_method=subset_request.subset_method,
         dataset_valid_date=retrieval_service.dataset_valid_start_date,
+        no_metadata_cache=no_metadata_cache,
     )
+    # The service selection and the bounds check may have read the
+    # metadata of the dataset, but no data is downloaded before the
+    # credentials are checked
+    startup_steps.finish()
     logger.info(
         "Downloading using service "
         f"{retrieval_service.service_type.service_name.value}..."
@@ -234,6 +292,7 @@ def subset_function(
                 retrieval_service.dataset_id,
                 disable_progress_bar,
                 retrieval_service.dataset_valid_start_date,
+                no_metadata_cache=no_metadata_cache,
             )
     else:
         raise ServiceNotSupported(retrieval_service.service_type)
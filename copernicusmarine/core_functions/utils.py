@@ -1,22 +1,10 @@
-import asyncio
 import logging
 import os
 import pathlib
 import re
+import shutil
 from datetime import datetime
-from typing import (
-    Any,
-    Awaitable,
-    Callable,
-    Coroutine,
-    Iterable,
-    Iterator,
-    List,
-    Optional,
-    Tuple,
-    TypeVar,
-    Union,
-)
+from typing import Callable, Iterable, Iterator, Optional, Tuple, TypeVar
 
 import cftime
 import numpy
@@ -28,6 +16,9 @@ from copernicusmarine._version import __version__ as copernicusmarine_version
 from copernicusmarine.core_functions.environment_variables import (
     COPERNICUSMARINE_CACHE_DIRECTORY,
 )
+from copernicusmarine.core_functions.memoization import (
+    clear_time_to_live_caches,
+)
 
 logger = logging.getLogger("copernicus_marine_root_logger")
 
@@ -48,6 +39,10 @@ DEFAULT_CLIENT_BASE_DIRECTORY: pathlib.Path = (
 ) / ".copernicusmarine"
 
 CACHE_BASE_DIRECTORY: pathlib.Path = DEFAULT_CLIENT_BASE_DIRECTORY / "cache"
+# Folders of the metadata caches, deleted with the cached files by
+# delete_cache_folder. The chunk cache holds data, not metadata, so it is
+# kept.
+METADATA_CACHE_FOLDER_NAMES = ["stac", "metadata", "zarr_metadata"]
 
 DATETIME_SUPPORTED_FORMATS = [
     "%Y",
@@ -166,9 +161,15 @@ def create_cache_directory():
 def delete_cache_folder(quiet: bool = False):
     try:
         elements = pathlib.Path(CACHE_BASE_DIRECTORY).glob("*")
-        files = [x for x in elements if x.is_file()]
-        for file in files:
-            os.remove(file)
+        for element in elements:
+            if element.is_file():
+                os.remove(element)
+            elif (
+                element.is_dir()
+                and element.name in METADATA_CACHE_FOLDER_NAMES
+            ):
+                shutil.rmtree(element)
+        clear_time_to_live_caches()
         if not quiet:
             logger.info("Old cache successfully deleted")
     except Exception as exc:
@@ -176,25 +177,6 @@ def delete_cache_folder(quiet: bool = False):
         raise exc
 
 
-async def rolling_batch_gather(
-    promises: Union[List[Coroutine[Any, Any, Any]], List[Awaitable[Any]]],
-    per_batch: int,
-) -> List[Any]:
-    tasks: asyncio.Queue = asyncio.Queue()
-    for promise in promises:
-        tasks.put_nowait(promise)
-
-    async def worker():
-        res = []
-        while not tasks.empty():
-            res.append(await tasks.get_nowait())
-
-        return res
-
-    results = await asyncio.gather(*[worker() for _ in range(per_batch)])
-    return [s for r in results for s in r]
-
-
 # Example data_path
 # https://s3.waw3-1.cloudferro.com/mdl-native-01/native/NWSHELF_MULTIYEAR_BGC_004_011/cmems_mod_nws_bgc-pft_myint_7km-3D-diato_P1M-m_202105
 # https://s3.region.cloudferro.com/bucket/arco/product/dataset/geoChunked.zarr
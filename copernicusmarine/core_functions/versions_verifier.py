@@ -1,8 +1,17 @@
 import logging
+from datetime import timedelta
+from typing import Optional
 
 import semver
 
 from copernicusmarine import __version__ as client_version
+from copernicusmarine.core_functions.environment_variables import (
+    COPERNICUSMARINE_OFFLINE,
+)
+from copernicusmarine.core_functions.metadata_cache import (
+    MetadataCache,
+    log_offline_metadata_age,
+)
 from copernicusmarine.core_functions.sessions import (
     get_configured_requests_session,
 )
@@ -12,6 +21,8 @@ from copernicusmarine.core_functions.utils import (
 
 logger = logging.getLogger("copernicus_marine_root_logger")
 
+CLIENT_REQUIRED_VERSIONS_STALE_AFTER = timedelta(hours=24)
+
 
 class VersionVerifier:
     function_marine_data_store_service_mapping: dict[str, list[str]] = {
@@ -37,6 +48,12 @@ class VersionVerifier:
         marine_data_store_versions = (
             VersionVerifier._get_client_required_versions(staging)
         )
+        if marine_data_store_versions is None:
+            logger.warning(
+                "Offline mode: the client version could not be checked "
+                "against the required versions, as they were never cached."
+            )
+            return
         for (
             service
         ) in VersionVerifier.function_marine_data_store_service_mapping[
@@ -58,12 +75,29 @@ class VersionVerifier:
     @staticmethod
     def _get_client_required_versions(
         staging: bool,
-    ) -> dict[str, str]:
+    ) -> Optional[dict[str, str]]:
+        """
+        Versions required by the Marine Data Store services.
+
+        In offline mode, the versions cached at the last check are used,
+        None if they were never cached.
+        """
         url_mds_versions = (
             "https://s3.waw3-1.cloudferro.com/mdl-metadata-dta/mdsVersions.json"
             if staging
             else "https://s3.waw3-1.cloudferro.com/mdl-metadata/mdsVersions.json"
         )
+        metadata_cache = MetadataCache()
+        if COPERNICUSMARINE_OFFLINE:
+            cached_versions = metadata_cache.get(url_mds_versions)
+            if cached_versions is None:
+                return None
+            log_offline_metadata_age(
+                "required client versions",
+                cached_versions.age,
+                CLIENT_REQUIRED_VERSIONS_STALE_AFTER,
+            )
+            return cached_versions.content
         logger.debug(f"Getting required versions from {url_mds_versions}")
         session = get_configured_requests_session()
         mds_versions: dict[str, str] = session.get(
@@ -71,4 +105,5 @@ class VersionVerifier:
             params=construct_query_params_for_marine_data_store_monitoring(),
             proxies=session.proxies,
         ).json()["clientVersions"]
+        metadata_cache.put(url_mds_versions, mds_versions)
         return mds_versions
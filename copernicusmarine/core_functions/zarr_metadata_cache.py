@@ -0,0 +1,111 @@
+import base64
+import hashlib
+import json
+import pathlib
+import time
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any, Dict, Optional
+
+from copernicusmarine.core_functions.json_file_cache import (
+    read_json_cache_file,
+    write_json_cache_file,
+)
+from copernicusmarine.core_functions.utils import CACHE_BASE_DIRECTORY
+
+ZARR_METADATA_CACHE_DIRECTORY: pathlib.Path = (
+    CACHE_BASE_DIRECTORY / "zarr_metadata"
+)
+ZARR_METADATA_REVALIDATE_AFTER = timedelta(hours=1)
+
+
+@dataclass
+class CachedZarrMetadata:
+    """
+    Consolidated metadata of a zarr store and the chunks of its dimension
+    coordinates, which are read each time the store is opened.
+    """
+
+    dataset_url: str
+    etag: str
+    validated_at: float
+    consolidated_metadata: bytes
+    coordinate_chunks: Dict[str, bytes] = field(default_factory=dict)
+
+    def is_fresh(self) -> bool:
+        return (
+            time.time() - self.validated_at
+            < ZARR_METADATA_REVALIDATE_AFTER.total_seconds()
+        )
+
+    def get_coordinate_names(self) -> set[str]:
+        """
+        Names of the one dimensional arrays named after their dimension.
+        """
+        try:
+            metadata = json.loads(self.consolidated_metadata)["metadata"]
+        except (ValueError, KeyError, TypeError):
+            return set()
+        coordinate_names = set()
+        for key, attributes in metadata.items():
+            name, _, file_name = key.rpartition("/")
+            if file_name != ".zattrs":
+                continue
+            if attributes.get("_ARRAY_DIMENSIONS") == [name]:
+                coordinate_names.add(name)
+        return coordinate_names
+
+
+class ZarrMetadataCache:
+    """
+    On-disk cache of the metadata of zarr stores, one file per dataset url.
+
+    Entries keep the ETag of the consolidated metadata so that they can be
+    revalidated with a conditional request once they are older than
+    ZARR_METADATA_REVALIDATE_AFTER.
+    """
+
+    def __init__(
+        self, cache_directory: pathlib.Path = ZARR_METADATA_CACHE_DIRECTORY
+    ) -> None:
+        self.cache_directory = cache_directory
+
+    def _get_path(self, dataset_url: str) -> pathlib.Path:
+        url_hash = hashlib.sha256(dataset_url.encode("utf-8")).hexdigest()
+        return self.cache_directory / url_hash[:2] / f"{url_hash}.json"
+
+    def get(self, dataset_url: str) -> Optional[CachedZarrMetadata]:
+        def decode(cached: dict[str, Any]) -> Optional[CachedZarrMetadata]:
+            if cached.get("dataset_url") != dataset_url:
+                return None
+            return CachedZarrMetadata(
+                dataset_url=dataset_url,
+                etag=cached["etag"],
+                validated_at=cached["validated_at"],
+                consolidated_metadata=base64.b64decode(
+                    cached["consolidated_metadata"]
+                ),
+                coordinate_chunks={
+                    key: base64.b64decode(chunk)
+                    for key, chunk in cached["coordinate_chunks"].items()
+                },
+            )
+
+        return read_json_cache_file(self._get_path(dataset_url), decode)
+
+    def put(self, cached_metadata: CachedZarrMetadata) -> None:
+        write_json_cache_file(
+            self._get_path(cached_metadata.dataset_url),
+            {
+                "dataset_url": cached_metadata.dataset_url,
+                "etag": cached_metadata.etag,
+                "validated_at": cached_metadata.validated_at,
+                "consolidated_metadata": base64.b64encode(
+                    cached_metadata.consolidated_metadata
+                ).decode("ascii"),
+                "coordinate_chunks": {
+                    key: base64.b64encode(chunk).decode("ascii")
+                    for key, chunk in cached_metadata.coordinate_chunks.items()
+                },
+            },
+        )
@@ -8,6 +8,9 @@ import xarray
 
 from copernicusmarine.catalogue_parser.request_structure import SubsetRequest
 from copernicusmarine.core_functions import custom_open_zarr
+from copernicusmarine.core_functions.retry_controller import (
+    s3_retry_controller,
+)
 from copernicusmarine.core_functions.utils import (
     FORCE_DOWNLOAD_CLI_PROMPT_MESSAGE,
     add_copernicusmarine_version_in_dataset_attributes,
@@ -77,6 +80,7 @@ def download_dataset(
     netcdf3_compatible: bool,
     force_download: bool = False,
     overwrite_output_data: bool = False,
+    no_metadata_cache: bool = False,
 ):
     dataset = _rechunk(
         open_dataset_from_arco_series(
@@ -88,6 +92,7 @@ def download_dataset(
             temporal_parameters=temporal_parameters,
             depth_parameters=depth_parameters,
             chunks="auto",
+            no_metadata_cache=no_metadata_cache,
         )
     )
 
@@ -128,7 +133,10 @@ def download_dataset(
         netcdf_compression_level,
         netcdf3_compatible,
     )
-    download_delayed_dataset(delayed, disable_progress_bar)
+    try:
+        download_delayed_dataset(delayed, disable_progress_bar)
+    finally:
+        s3_retry_controller.log_statistics()
     logger.info(f"Successfully downloaded to {output_path}")
 
     return output_path
@@ -141,6 +149,7 @@ def download_zarr(
     dataset_id: str,
     disable_progress_bar: bool,
     dataset_valid_start_date: Optional[Union[str, int]],
+    no_metadata_cache: bool = False,
 ):
     geographical_parameters = GeographicalParameters(
         latitude_parameters=LatitudeParameters(
@@ -197,6 +206,7 @@ def download_zarr(
         netcdf_compression_enabled=subset_request.netcdf_compression_enabled,
         netcdf_compression_level=subset_request.netcdf_compression_level,
         netcdf3_compatible=subset_request.netcdf3_compatible,
+        no_metadata_cache=no_metadata_cache,
     )
     return output_path
 
@@ -210,11 +220,13 @@ def open_dataset_from_arco_series(
     temporal_parameters: TemporalParameters,
     depth_parameters: DepthParameters,
     chunks=Optional[Literal["auto"]],
+    no_metadata_cache: bool = False,
 ) -> xarray.Dataset:
     dataset = custom_open_zarr.open_zarr(
         dataset_url,
         chunks=chunks,
         copernicus_marine_username=username,
+        no_metadata_cache=no_metadata_cache,
     )
     dataset = subset(
         dataset=dataset,
@@ -235,6 +247,7 @@ def read_dataframe_from_arco_series(
     temporal_parameters: TemporalParameters,
     depth_parameters: DepthParameters,
     chunks: Optional[Literal["auto"]],
+    no_metadata_cache: bool = False,
 ) -> pandas.DataFrame:
     dataset = open_dataset_from_arco_series(
         username=username,
@@ -245,5 +258,6 @@ def read_dataframe_from_arco_series(
         temporal_parameters=temporal_parameters,
         depth_parameters=depth_parameters,
         chunks=chunks,
+        no_metadata_cache=no_metadata_cache,
     )
     return dataset.to_dataframe()
@@ -22,6 +22,7 @@ from copernicusmarine.core_functions.environment_variables import (
 )
 from copernicusmarine.core_functions.sessions import (
     get_configured_boto3_session,
+    get_s3_transfer_config,
 )
 from copernicusmarine.core_functions.utils import (
     FORCE_DOWNLOAD_CLI_PROMPT_MESSAGE,
@@ -538,20 +539,20 @@ def _download_files(
         """
         Download ONE file and return a string of the result
         """
-        s3_client, s3_resource = get_configured_boto3_session(
+        s3_client, _ = get_configured_boto3_session(
             endpoint_url,
             ["GetObject", "HeadObject"],
             username,
-            return_ressources=True,
         )
-        last_modified_date_epoch = s3_resource.Object(
-            bucket, file_in.replace(f"s3://{bucket}/", "")
-        ).last_modified.timestamp()
+        last_modified_date_epoch = s3_client.head_object(
+            Bucket=bucket, Key=file_in.replace(f"s3://{bucket}/", "")
+        )["LastModified"].timestamp()
 
         s3_client.download_file(
             bucket,
             file_in.replace(f"s3://{bucket}/", ""),
             file_out,
+            Config=get_s3_transfer_config(),
         )
 
         os.utime(
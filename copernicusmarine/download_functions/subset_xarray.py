@@ -386,6 +386,7 @@ def check_dataset_subset_bounds(
     dataset_subset: DatasetTimeAndGeographicalSubset,
     subset_method: SubsetMethod,
     dataset_valid_date: Optional[Union[str, int]],
+    no_metadata_cache: bool = False,
 ) -> None:
     if service_type in [
         CopernicusMarineDatasetServiceType.GEOSERIES,
@@ -394,7 +395,10 @@ def check_dataset_subset_bounds(
         CopernicusMarineDatasetServiceType.STATIC_ARCO,
     ]:
         dataset = custom_open_zarr.open_zarr(
-            dataset_url, copernicus_marine_username=username
+            dataset_url,
+            chunks="auto",
+            copernicus_marine_username=username,
+            no_metadata_cache=no_metadata_cache,
         )
         dataset_coordinates = dataset.coords
     else:
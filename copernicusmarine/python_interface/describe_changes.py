@@ -0,0 +1,41 @@
+import pathlib
+from typing import Any, Union
+
+from copernicusmarine.core_functions.describe_changes import (
+    describe_changes_function,
+)
+from copernicusmarine.python_interface.exception_handler import (
+    log_exception_and_exit,
+)
+
+
+@log_exception_and_exit
+def describe_changes(
+    snapshot_file: Union[pathlib.Path, str],
+    update_snapshot: bool = True,
+    disable_progress_bar: bool = False,
+    staging: bool = False,
+) -> dict[str, Any]:
+    """
+    Retrieve the changes of the Copernicus Marine catalogue since a snapshot.
+
+    The catalogue is compared to the snapshot saved in a file by a previous call,
+    then the snapshot is updated. Only the STAC files changed since the last
+    refresh of the local cache are downloaded.
+
+    Args:
+        snapshot_file (Union[pathlib.Path, str]): Path to the catalogue snapshot to compare with. If it does not exist, every product is reported as added.
+        update_snapshot (bool, optional): Whether to replace the snapshot with the current catalogue. Defaults to True.
+        disable_progress_bar (bool, optional): Flag to hide the progress bar. Defaults to False.
+        staging (bool, optional): Flag to compare with the catalogue of the staging environment instead of production. Defaults to False.
+
+    Returns:
+        dict[str, Any]: A dictionary with the list of changes under the "changes" key.
+    """  # noqa
+    changes = describe_changes_function(
+        snapshot_file=pathlib.Path(snapshot_file),
+        update_snapshot=update_snapshot,
+        disable_progress_bar=disable_progress_bar,
+        staging=staging,
+    )
+    return {"changes": [change.to_json_dict() for change in changes]}
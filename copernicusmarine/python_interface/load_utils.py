@@ -5,12 +5,15 @@ import xarray
 
 from copernicusmarine.catalogue_parser.catalogue_parser import (
     CopernicusMarineDatasetServiceType,
-    parse_catalogue,
+    parse_dataset_catalogue,
 )
 from copernicusmarine.catalogue_parser.request_structure import LoadRequest
 from copernicusmarine.core_functions.credentials_utils import (
     get_username_password,
 )
+from copernicusmarine.core_functions.custom_open_zarr import (
+    reuse_opened_datasets,
+)
 from copernicusmarine.core_functions.services_utils import (
     CommandType,
     RetrievalService,
@@ -26,6 +29,7 @@ from copernicusmarine.download_functions.subset_xarray import (
 )
 
 
+@reuse_opened_datasets()
 def load_data_object_from_load_request(
     load_request: LoadRequest,
     disable_progress_bar: bool,
@@ -34,10 +38,17 @@ def load_data_object_from_load_request(
     if load_request.overwrite_metadata_cache:
         delete_cache_folder()
 
-    catalogue = parse_catalogue(
+    catalogue = parse_dataset_catalogue(
+        dataset_id=load_request.dataset_id,
+        dataset_url=load_request.dataset_url,
         no_metadata_cache=load_request.no_metadata_cache,
         disable_progress_bar=disable_progress_bar,
     )
+    username, password = get_username_password(
+        load_request.username,
+        load_request.password,
+        load_request.credentials_file,
+    )
     retrieval_service: RetrievalService = get_retrieval_service(
         catalogue=catalogue,
         dataset_id=load_request.dataset_id,
@@ -47,11 +58,8 @@ def load_data_object_from_load_request(
         force_service_type_string=load_request.force_service,
         command_type=CommandType.LOAD,
         dataset_subset=load_request.get_time_and_geographical_subset(),
-    )
-    username, password = get_username_password(
-        load_request.username,
-        load_request.password,
-        load_request.credentials_file,
+        username=username,
+        no_metadata_cache=load_request.no_metadata_cache,
     )
     load_request.dataset_url = retrieval_service.uri
     check_dataset_subset_bounds(
@@ -62,6 +70,7 @@ def load_data_object_from_load_request(
         dataset_subset=load_request.get_time_and_geographical_subset(),
         subset_method=load_request.subset_method,
         dataset_valid_date=retrieval_service.dataset_valid_start_date,
+        no_metadata_cache=load_request.no_metadata_cache,
     )
     if retrieval_service.service_type in [
         CopernicusMarineDatasetServiceType.GEOSERIES,
@@ -90,6 +99,7 @@ def load_data_object_from_load_request(
             temporal_parameters=load_request.temporal_parameters,
             depth_parameters=load_request.depth_parameters,
             chunks=None,
+            no_metadata_cache=load_request.no_metadata_cache,
         )
     else:
         raise ServiceNotSupported(retrieval_service.service_type)
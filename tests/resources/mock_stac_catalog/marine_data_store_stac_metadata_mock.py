@@ -35,6 +35,8 @@ def mocked_stac_aiohttp_get(*args, **kwargs):
         def __init__(self, json_data: Optional[dict], status_code: int):
             self.json_data = json_data
             self.status_code = status_code
+            self.status = status_code
+            self.headers: dict[str, str] = {}
 
         async def json(self) -> Optional[dict]:
             return self.json_data
@@ -0,0 +1,81 @@
+import asyncio
+from functools import partial
+
+import pytest
+
+from copernicusmarine.core_functions.async_executor import (
+    BoundedConcurrencyExecutor,
+)
+
+
+class TestBoundedConcurrencyExecutor:
+    def test_results_are_yielded_as_they_complete(self):
+        async def sleep_and_return(delay: float) -> float:
+            await asyncio.sleep(delay)
+            return delay
+
+        async def collect():
+            executor = BoundedConcurrencyExecutor(3)
+            return [
+                (task_result.index, task_result.result)
+                async for task_result in executor.as_completed(
+                    partial(sleep_and_return, delay)
+                    for delay in [0.3, 0.1, 0.2]
+                )
+            ]
+
+        assert asyncio.run(collect()) == [(1, 0.1), (2, 0.2), (0, 0.3)]
+
+    def test_tasks_are_created_lazily_within_the_bound(self):
+        created_tasks = []
+
+        def function_factory():
+            for index in range(10):
+                created_tasks.append(index)
+                yield partial(asyncio.sleep, 0.01, index)
+
+        async def collect():
+            executor = BoundedConcurrencyExecutor(2)
+            results = []
+            async for task_result in executor.as_completed(function_factory()):
+                results.append(task_result.result)
+                assert len(created_tasks) - len(results) <= 2
+            return results
+
+        assert sorted(asyncio.run(collect())) == list(range(10))
+
+    def test_run_bounds_concurrency_and_records_timings(self):
+        in_flight = []
+        maximum_in_flight = []
+
+        async def request(index: int) -> int:
+            in_flight.append(index)
+            maximum_in_flight.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.remove(index)
+            return index
+
+        async def run_all():
+            executor = BoundedConcurrencyExecutor(2)
+            results = await asyncio.gather(
+                *[executor.run(request, index) for index in range(6)]
+            )
+            return executor, results
+
+        executor, results = asyncio.run(run_all())
+
+        assert results == list(range(6))
+        assert max(maximum_in_flight) == 2
+        assert len(executor.task_timings) == 6
+
+    def test_exception_is_raised_to_the_consumer(self):
+        async def fail():
+            raise ValueError("failure")
+
+        async def collect():
+            executor = BoundedConcurrencyExecutor(2)
+            async for _ in executor.as_completed([fail]):
+                pass
+
+        with pytest.raises(ValueError):
+            asyncio.run(collect())
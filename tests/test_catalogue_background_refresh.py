@@ -0,0 +1,100 @@
+import pathlib
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+
+from copernicusmarine._version import __version__ as package_version
+from copernicusmarine.catalogue_parser.catalogue_parser import (
+    parse_catalogue,
+    refresh_catalogue_cache,
+)
+from copernicusmarine.catalogue_parser.catalogue_store import CatalogueStore
+from copernicusmarine.catalogue_parser.stac_json_cache import StacJsonCache
+from tests.resources.mock_stac_catalog.marine_data_store_stac_metadata_mock import (
+    mocked_stac_aiohttp_get,
+)
+
+CATALOGUE_PARSER = "copernicusmarine.catalogue_parser.catalogue_parser"
+
+
+class TestCatalogueBackgroundRefresh:
+    def test_stale_catalogue_is_served_and_refreshed_once(self, tmp_path):
+        catalogue_store_path = pathlib.Path(tmp_path) / "catalogue.sqlite3"
+        with self.given_cache_in(tmp_path):
+            with mock.patch(
+                "aiohttp.ClientSession.get",
+                side_effect=mocked_stac_aiohttp_get,
+            ):
+                refresh_catalogue_cache(disable_progress_bar=True)
+
+            with mock.patch(
+                f"{CATALOGUE_PARSER}.CATALOGUE_STALE_AFTER", timedelta(0)
+            ), mock.patch("aiohttp.ClientSession.get") as mock_get, mock.patch(
+                f"{CATALOGUE_PARSER}.subprocess.Popen"
+            ) as mock_popen:
+                for _ in range(2):
+                    catalogue = parse_catalogue(
+                        no_metadata_cache=False, disable_progress_bar=True
+                    )
+                    assert catalogue.products
+
+        mock_get.assert_not_called()
+        mock_popen.assert_called_once()
+        command = mock_popen.call_args.args[0]
+        assert command[3:5] == ["describe", "--refresh-cache"]
+        refresh_lock_path = CatalogueStore(
+            catalogue_store_path
+        ).refresh_lock_path
+        token = command[command.index("--refresh-lock-token") + 1]
+        assert refresh_lock_path.read_text() == token
+
+    @mock.patch(
+        "aiohttp.ClientSession.get",
+        side_effect=mocked_stac_aiohttp_get,
+    )
+    def test_refresh_replaces_the_catalogue_and_releases_lock(
+        self, mock_get, tmp_path
+    ):
+        catalogue_store = CatalogueStore(
+            pathlib.Path(tmp_path) / "catalogue.sqlite3"
+        )
+        token = catalogue_store.acquire_refresh_lock()
+        assert token
+        assert not catalogue_store.acquire_refresh_lock()
+
+        with self.given_cache_in(tmp_path):
+            refresh_catalogue_cache(
+                disable_progress_bar=True, refresh_lock_token=token
+            )
+
+        assert catalogue_store.get_age(package_version) is not None
+        assert not catalogue_store.refresh_lock_path.exists()
+
+    def test_refresh_keeps_the_lock_of_another_refresh(self, tmp_path):
+        catalogue_store = CatalogueStore(
+            pathlib.Path(tmp_path) / "catalogue.sqlite3"
+        )
+        assert catalogue_store.acquire_refresh_lock()
+
+        with self.given_cache_in(tmp_path), mock.patch(
+            f"{CATALOGUE_PARSER}._parse_catalogue",
+            side_effect=ConnectionError,
+        ):
+            with pytest.raises(ConnectionError):
+                refresh_catalogue_cache(disable_progress_bar=True)
+            with pytest.raises(ConnectionError):
+                refresh_catalogue_cache(
+                    disable_progress_bar=True, refresh_lock_token="other"
+                )
+
+        assert catalogue_store.refresh_lock_path.exists()
+
+    def given_cache_in(self, tmp_path):
+        directory = pathlib.Path(tmp_path)
+        return mock.patch.multiple(
+            CATALOGUE_PARSER,
+            get_catalogue_store_path=lambda staging: directory
+            / "catalogue.sqlite3",
+            StacJsonCache=lambda: StacJsonCache(directory / "stac"),
+        )
@@ -0,0 +1,54 @@
+import asyncio
+from unittest import mock
+
+from copernicusmarine.catalogue_parser.catalogue_parser import (
+    CatalogParserConnection,
+    _retrieve_marine_data_store_products,
+)
+from tests.resources.mock_stac_catalog.marine_data_store_stac_metadata_mock import (
+    mocked_stac_aiohttp_get,
+)
+
+
+class ConcurrencyTracker:
+    def __init__(self):
+        self.in_flight = 0
+        self.maximum_in_flight = 0
+
+    def mocked_get(self, *args, **kwargs):
+        response = mocked_stac_aiohttp_get(*args, **kwargs)
+        tracker = self
+
+        class TrackedResponse:
+            status = response.status
+            headers = response.headers
+
+            async def json(self):
+                await asyncio.sleep(0.01)
+                return await response.json()
+
+            async def __aenter__(self):
+                tracker.in_flight += 1
+                tracker.maximum_in_flight = max(
+                    tracker.maximum_in_flight, tracker.in_flight
+                )
+                return self
+
+            async def __aexit__(self, exc_type, exc_val, exc_tb):
+                tracker.in_flight -= 1
+
+        return TrackedResponse()
+
+
+class TestCatalogueConcurrentRequests:
+    def test_items_are_fetched_concurrently_within_the_limit(self):
+        tracker = ConcurrencyTracker()
+        with mock.patch(
+            "aiohttp.ClientSession.get", side_effect=tracker.mocked_get
+        ):
+            connection = CatalogParserConnection(max_concurrent_requests=2)
+            products = _retrieve_marine_data_store_products(connection)
+            asyncio.run(connection.close())
+
+        assert len(products) == 2
+        assert tracker.maximum_in_flight == 2
@@ -0,0 +1,126 @@
+import copy
+import pathlib
+from unittest import mock
+
+from copernicusmarine.catalogue_parser.catalogue_diff import (
+    CatalogueChangeType,
+    diff_catalogues,
+    get_part_time_extent,
+)
+from copernicusmarine.catalogue_parser.catalogue_parser import (
+    load_catalogue_snapshot,
+    parse_catalogue,
+)
+from copernicusmarine.catalogue_parser.stac_json_cache import StacJsonCache
+from copernicusmarine.core_functions.describe_changes import (
+    describe_changes_function,
+)
+from tests.resources.mock_stac_catalog.marine_data_store_stac_metadata_mock import (
+    mocked_stac_aiohttp_get,
+)
+
+CATALOGUE_PARSER = "copernicusmarine.catalogue_parser.catalogue_parser"
+
+
+@mock.patch(
+    "aiohttp.ClientSession.get",
+    side_effect=mocked_stac_aiohttp_get,
+)
+class TestCatalogueDiff:
+    def test_identical_catalogues_have_no_changes(self, mock_get):
+        catalogue = parse_catalogue(
+            no_metadata_cache=True, disable_progress_bar=True
+        )
+
+        assert diff_catalogues(catalogue, copy.deepcopy(catalogue)) == []
+
+    def test_changes_are_reported_at_the_highest_level(self, mock_get):
+        old_catalogue = parse_catalogue(
+            no_metadata_cache=True, disable_progress_bar=True
+        )
+        new_catalogue = copy.deepcopy(old_catalogue)
+        product = new_catalogue.products[0]
+        removed_dataset = product.datasets.pop()
+        version = product.datasets[0].versions[0]
+        added_part = copy.deepcopy(version.parts[0])
+        added_part.name = "added_part"
+        version.parts.append(added_part)
+        changed_part = version.parts[0]
+        old_time_extent = get_part_time_extent(changed_part)
+        for service in changed_part.services:
+            for variable in service.variables:
+                for coordinate in variable.coordinates:
+                    if coordinate.coordinates_id == "time":
+                        coordinate.values = None
+                        coordinate.minimum_value = 0
+                        coordinate.maximum_value = 1
+        removed_product = new_catalogue.products.pop()
+
+        changes = [
+            change.to_json_dict()
+            for change in diff_catalogues(old_catalogue, new_catalogue)
+        ]
+
+        assert changes == [
+            {
+                "change": "product_removed",
+                "product_id": removed_product.product_id,
+            },
+            {
+                "change": "dataset_removed",
+                "product_id": product.product_id,
+                "dataset_id": removed_dataset.dataset_id,
+            },
+            {
+                "change": "time_extent_changed",
+                "product_id": product.product_id,
+                "dataset_id": product.datasets[0].dataset_id,
+                "version": version.label,
+                "part": changed_part.name,
+                "old_value": old_time_extent,
+                "new_value": [0, 1],
+            },
+            {
+                "change": "part_added",
+                "product_id": product.product_id,
+                "dataset_id": product.datasets[0].dataset_id,
+                "version": version.label,
+                "part": "added_part",
+            },
+        ]
+
+    def test_describe_changes_updates_the_snapshot(self, mock_get, tmp_path):
+        directory = pathlib.Path(tmp_path)
+        snapshot_file = directory / "snapshot.sqlite3"
+        with mock.patch.multiple(
+            CATALOGUE_PARSER,
+            get_catalogue_store_path=lambda staging: directory
+            / "catalogue.sqlite3",
+            StacJsonCache=lambda: StacJsonCache(directory / "stac"),
+        ), mock.patch(
+            "copernicusmarine.core_functions.describe_changes.create_cache_directory"
+        ), mock.patch(
+            "copernicusmarine.core_functions.describe_changes.VersionVerifier"
+            ".check_version_describe"
+        ) as mock_check_version:
+            first_changes = describe_changes_function(
+                snapshot_file=snapshot_file,
+                update_snapshot=True,
+                disable_progress_bar=True,
+                staging=False,
+            )
+            second_changes = describe_changes_function(
+                snapshot_file=snapshot_file,
+                update_snapshot=True,
+                disable_progress_bar=True,
+                staging=False,
+            )
+
+        snapshot = load_catalogue_snapshot(snapshot_file)
+        assert snapshot is not None
+        assert {change.change for change in first_changes} == {
+            CatalogueChangeType.PRODUCT_ADDED
+        }
+        assert len(first_changes) == len(snapshot.products)
+        assert second_changes == []
+        assert mock_check_version.call_count == 2
@@ -0,0 +1,90 @@
+import asyncio
+from unittest import mock
+
+from copernicusmarine.catalogue_parser.catalogue_parser import (
+    CatalogParserConnection,
+    CopernicusMarineCatalogue,
+    _retrieve_marine_data_store_products,
+)
+from tests.resources.mock_stac_catalog.marine_data_store_stac_metadata_mock import (
+    mocked_stac_aiohttp_get,
+)
+
+
+def linear_service_lookup(catalogue, dataset_url):
+    return next(
+        (
+            (dataset, service)
+            for product in catalogue.products
+            for dataset in product.datasets
+            for version in dataset.versions
+            for part in version.parts
+            for service in part.services
+            if dataset_url.startswith(service.uri)
+        ),
+        None,
+    )
+
+
+class TestCatalogueIndex:
+    @mock.patch(
+        "aiohttp.ClientSession.get",
+        side_effect=mocked_stac_aiohttp_get,
+    )
+    def test_lookups_match_a_linear_scan(self, mock_get):
+        catalogue = self.given_catalogue()
+        service_uris = [
+            service.uri
+            for product in catalogue.products
+            for dataset in product.datasets
+            for version in dataset.versions
+            for part in version.parts
+            for service in part.services
+        ]
+        urls = [
+            url
+            for uri in service_uris
+            for url in [
+                uri,
+                f"{uri}/variable/0.0.0",
+                f"{uri}_suffix",
+                uri[:-1],
+                uri.rsplit("/", 1)[0],
+            ]
+        ] + ["https://unknown.url/data", ""]
+
+        for url in urls:
+            assert catalogue.find_service_from_url(
+                url
+            ) == linear_service_lookup(catalogue, url)
+
+        for product in catalogue.products:
+            for dataset in product.datasets:
+                assert catalogue.get_dataset(dataset.dataset_id) is dataset
+        assert catalogue.get_dataset("unknown") is None
+
+    @mock.patch(
+        "aiohttp.ClientSession.get",
+        side_effect=mocked_stac_aiohttp_get,
+    )
+    def test_index_follows_official_versions_filtering(self, mock_get):
+        catalogue = self.given_catalogue()
+
+        catalogue.filter_only_official_versions_and_parts()
+
+        for product in catalogue.products:
+            for dataset in product.datasets:
+                for service in dataset.versions[0].parts[0].services:
+                    assert catalogue.find_service_from_url(service.uri) == (
+                        dataset,
+                        service,
+                    )
+
+    def given_catalogue(self):
+        connection = CatalogParserConnection()
+        products = [
+            product.to_copernicus_marine_product()
+            for product in _retrieve_marine_data_store_products(connection)
+        ]
+        asyncio.run(connection.close())
+        return CopernicusMarineCatalogue(products=products)
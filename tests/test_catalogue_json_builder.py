@@ -0,0 +1,77 @@
+from copernicusmarine.catalogue_parser.catalogue_parser import (
+    _construct_marine_data_store_product,
+    _is_valid_stac_item,
+)
+
+ITEM_URL = (
+    "https://stac.marine.copernicus.eu/metadata/PRODUCT_001"
+    "/cmems_dataset_202211/dataset.stac.json"
+)
+
+
+def given_item(item_id, retired_date=None, href="timeChunked.zarr"):
+    return {
+        "id": item_id,
+        "bbox": [-180.0, -80.0, 180.0, 90.0],
+        "properties": {
+            "title": "dataset title",
+            "datetime": "2022-11-01T00:00:00Z",
+            "cube:variables": {
+                "thetao": {"id": "thetao", "standardName": "temperature"}
+            },
+            "admp_retired_date": retired_date,
+        },
+        "links": [{"rel": "self", "href": ITEM_URL}],
+        "assets": {
+            "timeChunked": {"href": href, "type": "application/vnd+zarr"}
+        },
+    }
+
+
+def given_collection():
+    return {
+        "id": "PRODUCT_001",
+        "description": "description",
+        "providers": [{"name": "producer", "roles": ["producer"]}],
+        "extent": {"spatial": {}, "temporal": {}},
+    }
+
+
+class TestCatalogueJsonBuilder:
+    def test_relative_asset_href_is_resolved_against_item(self):
+        product = _construct_marine_data_store_product(
+            (given_collection(), [given_item("cmems_dataset_202211")])
+        ).to_copernicus_marine_product()
+
+        assert product.production_center == "producer"
+        service = product.datasets[0].versions[0].parts[0].services[0]
+        assert service.uri == (
+            "https://stac.marine.copernicus.eu/metadata/PRODUCT_001"
+            "/cmems_dataset_202211/timeChunked.zarr"
+        )
+
+    def test_retired_parts_are_skipped(self):
+        product = _construct_marine_data_store_product(
+            (
+                given_collection(),
+                [
+                    given_item("cmems_dataset_202211"),
+                    given_item(
+                        "cmems_dataset_202211--ext--retired",
+                        retired_date="2000-01-01T00:00:00.000000Z",
+                    ),
+                ],
+            )
+        ).to_copernicus_marine_product()
+
+        parts = product.datasets[0].versions[0].parts
+        assert [part.name for part in parts] == ["default"]
+
+    def test_item_without_any_datetime_is_invalid(self):
+        item = given_item("cmems_dataset_202211")
+        item["properties"]["datetime"] = None
+
+        assert not _is_valid_stac_item(item)
+        item["properties"]["start_datetime"] = "2022-11-01T00:00:00Z"
+        item["properties"]["end_datetime"] = "2022-12-01T00:00:00Z"
+        assert _is_valid_stac_item(item)
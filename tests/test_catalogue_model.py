@@ -0,0 +1,55 @@
+import asyncio
+from unittest import mock
+
+import numpy
+
+from copernicusmarine.catalogue_parser.catalogue_parser import (
+    CatalogParserConnection,
+    CopernicusMarineDatasetServiceType,
+    _retrieve_marine_data_store_products,
+)
+from tests.resources.mock_stac_catalog.marine_data_store_stac_metadata_mock import (
+    mocked_stac_aiohttp_get,
+)
+
+
+class TestCatalogueModel:
+    @mock.patch(
+        "aiohttp.ClientSession.get",
+        side_effect=mocked_stac_aiohttp_get,
+    )
+    def test_coordinates_are_shared_and_compact(self, mock_get):
+        connection = CatalogParserConnection()
+        products = [
+            product.to_copernicus_marine_product()
+            for product in _retrieve_marine_data_store_products(connection)
+        ]
+        asyncio.run(connection.close())
+        dataset = next(
+            dataset
+            for product in products
+            for dataset in product.datasets
+            if dataset.dataset_id
+            == "cmems_mod_glo_phy-cur_anfc_0.083deg_P1D-m"
+        )
+        service = (
+            dataset.versions[0]
+            .parts[0]
+            .get_service_by_service_type(
+                CopernicusMarineDatasetServiceType.GEOSERIES
+            )
+        )
+        first_variable, second_variable = service.variables[:2]
+
+        for first_coordinate, second_coordinate in zip(
+            first_variable.coordinates, second_variable.coordinates
+        ):
+            assert first_coordinate is second_coordinate
+        depth = next(
+            coordinate
+            for coordinate in first_variable.coordinates
+            if coordinate.coordinates_id == "depth"
+        )
+        assert isinstance(depth.values, numpy.ndarray)
+        assert (depth.values >= 0).all()
+        assert not hasattr(depth, "__dict__")
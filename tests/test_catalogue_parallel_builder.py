@@ -0,0 +1,51 @@
+import pickle
+from unittest import mock
+
+from copernicusmarine.catalogue_parser.catalogue_parser import _parse_catalogue
+from tests.resources.mock_stac_catalog.marine_data_store_stac_metadata_mock import (
+    mocked_stac_aiohttp_get,
+)
+
+CATALOGUE_PARSER = "copernicusmarine.catalogue_parser.catalogue_parser"
+
+
+@mock.patch(
+    "aiohttp.ClientSession.get",
+    side_effect=mocked_stac_aiohttp_get,
+)
+class TestCatalogueParallelBuilder:
+    def test_products_built_in_processes_are_the_same(self, mock_get):
+        catalogue = self.parse_catalogue()
+        with mock.patch(f"{CATALOGUE_PARSER}.CATALOGUE_BUILD_PROCESSES", 2):
+            catalogue_built_in_processes = self.parse_catalogue()
+
+        assert catalogue_built_in_processes.products == catalogue.products
+
+    def test_catalogue_model_pickling_keeps_shared_coordinates(self, mock_get):
+        products = self.parse_catalogue().products
+
+        unpickled_products = pickle.loads(pickle.dumps(products))
+
+        assert unpickled_products == products
+        assert self.count_distinct_coordinates(
+            unpickled_products
+        ) == self.count_distinct_coordinates(products)
+
+    def count_distinct_coordinates(self, products):
+        return len(
+            {
+                id(coordinates)
+                for product in products
+                for dataset in product.datasets
+                for version in dataset.versions
+                for part in version.parts
+                for service in part.services
+                for variable in service.variables
+                for coordinates in variable.coordinates
+            }
+        )
+
+    def parse_catalogue(self):
+        return _parse_catalogue(
+            disable_progress_bar=True, use_json_cache=False
+        )
@@ -0,0 +1,84 @@
+import asyncio
+import copy
+from unittest import mock
+
+from copernicusmarine.catalogue_parser.catalogue_parser import (
+    CatalogParserConnection,
+    CopernicusMarineCatalogue,
+    _retrieve_marine_data_store_products,
+    filter_catalogue_with_strings,
+)
+from tests.resources.mock_stac_catalog.marine_data_store_stac_metadata_mock import (
+    mocked_stac_aiohttp_get,
+)
+
+
+class TestCatalogueSearch:
+    @mock.patch(
+        "aiohttp.ClientSession.get",
+        side_effect=mocked_stac_aiohttp_get,
+    )
+    def test_search_projects_matches_without_mutating(self, mock_get):
+        catalogue = self.given_catalogue()
+        original_catalogue = copy.deepcopy(catalogue)
+
+        products = catalogue.search(["so_anfc"])
+
+        assert catalogue == original_catalogue
+        assert [product.product_id for product in products] == [
+            "GLOBAL_ANALYSISFORECAST_PHY_001_024"
+        ]
+        assert [dataset.dataset_id for dataset in products[0].datasets] == [
+            "cmems_mod_glo_phy-so_anfc_0.083deg_P1D-m"
+        ]
+        assert products[0].title == catalogue.products[0].title
+        service = products[0].datasets[0].versions[0].parts[0].services[0]
+        original_service = (
+            catalogue.products[0].datasets[1].versions[0].parts[0].services[0]
+        )
+        assert service is not original_service
+        assert service.variables is original_service.variables
+
+    @mock.patch(
+        "aiohttp.ClientSession.get",
+        side_effect=mocked_stac_aiohttp_get,
+    )
+    def test_search_on_variables_and_service_types(self, mock_get):
+        catalogue = self.given_catalogue()
+
+        products = catalogue.search(["sea_water_salinity"])
+        variables = [
+            variable.standard_name
+            for product in products
+            for dataset in product.datasets
+            for version in dataset.versions
+            for part in version.parts
+            for service in part.services
+            for variable in service.variables
+        ]
+        assert variables
+        assert set(variables) == {"sea_water_salinity"}
+
+        products = catalogue.search(["arco-geo-series"])
+        assert products
+        assert catalogue.search(["arco-geo-series"]) == products
+
+    @mock.patch(
+        "aiohttp.ClientSession.get",
+        side_effect=mocked_stac_aiohttp_get,
+    )
+    def test_no_match_returns_empty_catalogue(self, mock_get):
+        catalogue = self.given_catalogue()
+
+        assert filter_catalogue_with_strings(catalogue, ["lkshdflkhs"]) == {}
+
+    def given_catalogue(self):
+        connection = CatalogParserConnection()
+        products = [
+            product.to_copernicus_marine_product()
+            for product in _retrieve_marine_data_store_products(connection)
+        ]
+        asyncio.run(connection.close())
+        return CopernicusMarineCatalogue(
+            products=sorted(products, key=lambda product: product.product_id)
+        )
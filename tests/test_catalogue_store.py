@@ -0,0 +1,123 @@
+import asyncio
+import pathlib
+from unittest import mock
+
+from copernicusmarine.catalogue_parser.catalogue_parser import (
+    CatalogParserConnection,
+    CatalogueIndex,
+    _product_from_dict,
+    _product_to_dict,
+    _retrieve_marine_data_store_products,
+)
+from copernicusmarine.catalogue_parser.catalogue_store import CatalogueStore
+from tests.resources.mock_stac_catalog.marine_data_store_stac_metadata_mock import (
+    mocked_stac_aiohttp_get,
+)
+
+DATASET_ID = "cmems_mod_glo_phy-so_anfc_0.083deg_P1D-m"
+DATASET_URL = (
+    "https://s3.waw3-1.cloudferro.com/mdl-arco-geo-010/arco/"
+    "GLOBAL_ANALYSISFORECAST_PHY_001_024/"
+    "cmems_mod_glo_phy-so_anfc_0.083deg_P1D-m_202211/geoChunked.zarr"
+)
+
+
+class TestCatalogueStore:
+    @mock.patch(
+        "aiohttp.ClientSession.get",
+        side_effect=mocked_stac_aiohttp_get,
+    )
+    def test_catalogue_roundtrip_and_lookups(self, mock_get, tmp_path):
+        products = self.given_products()
+        catalogue_store = CatalogueStore(
+            pathlib.Path(tmp_path) / "catalogue.sqlite3"
+        )
+
+        catalogue_store.write(
+            (_product_to_dict(product) for product in products),
+            package_version="1.0.0",
+        )
+
+        assert catalogue_store.get_age("1.0.0") is not None
+        assert catalogue_store.get_age("2.0.0") is None
+        assert [
+            _product_from_dict(product)
+            for product in catalogue_store.load_products()
+        ] == products
+
+        assert catalogue_store.find_dataset_id_from_url(DATASET_URL) == (
+            DATASET_ID
+        )
+        assert (
+            catalogue_store.find_dataset_id_from_url(f"{DATASET_URL}/so/0.0.0")
+            == DATASET_ID
+        )
+        assert catalogue_store.find_dataset_id_from_url("https://x/y") is None
+        product = catalogue_store.load_product_with_dataset(DATASET_ID)
+        assert product["product_id"] == "GLOBAL_ANALYSISFORECAST_PHY_001_024"
+        assert [dataset["dataset_id"] for dataset in product["datasets"]] == [
+            DATASET_ID
+        ]
+        assert catalogue_store.load_product_with_dataset("unknown") is None
+        assert (
+            catalogue_store.find_product_id(DATASET_ID)
+            == "GLOBAL_ANALYSISFORECAST_PHY_001_024"
+        )
+        assert catalogue_store.find_product_id("unknown") is None
+
+    @mock.patch(
+        "aiohttp.ClientSession.get",
+        side_effect=mocked_stac_aiohttp_get,
+    )
+    def test_url_lookup_matches_the_catalogue_index(self, mock_get, tmp_path):
+        products = self.given_products()
+        catalogue_store = CatalogueStore(
+            pathlib.Path(tmp_path) / "catalogue.sqlite3"
+        )
+        catalogue_store.write(
+            (_product_to_dict(product) for product in products),
+            package_version="1.0.0",
+        )
+        catalogue_index = CatalogueIndex(products)
+
+        for url in [
+            DATASET_URL,
+            f"{DATASET_URL}/so/0.0.0",
+            # A service URI ending in the middle of a segment of the URL
+            f"{DATASET_URL}_suffix",
+            # A URL that is a prefix of a service URI
+            DATASET_URL.removesuffix(".zarr"),
+            DATASET_URL.rsplit("/", 1)[0],
+            "https://s3.waw3-1.cloudferro.com",
+        ]:
+            match = catalogue_index.find_service_from_url(url)
+            assert catalogue_store.find_dataset_id_from_url(url) == (
+                match[0].dataset_id if match else None
+            ), url
+        assert (
+            catalogue_store.find_dataset_id_from_url(f"{DATASET_URL}_suffix")
+            == DATASET_ID
+        )
+        assert (
+            catalogue_store.find_dataset_id_from_url(
+                DATASET_URL.removesuffix(".zarr")
+            )
+            is None
+        )
+
+    def test_missing_store_has_no_age(self, tmp_path):
+        catalogue_store = CatalogueStore(
+            pathlib.Path(tmp_path) / "missing.sqlite3"
+        )
+
+        assert catalogue_store.get_age("1.0.0") is None
+        assert catalogue_store.find_product_id(DATASET_ID) is None
+
+    def given_products(self):
+        connection = CatalogParserConnection()
+        products = [
+            product.to_copernicus_marine_product()
+            for product in _retrieve_marine_data_store_products(connection)
+        ]
+        asyncio.run(connection.close())
+        return products
@@ -0,0 +1,117 @@
+import multiprocessing
+import sqlite3
+from contextlib import closing
+from unittest import mock
+
+from copernicusmarine.core_functions.chunk_cache import ChunkCache
+from copernicusmarine.core_functions.utils import delete_cache_folder
+
+DATASET_URL = "https://s3.example.com/bucket/dataset.zarr"
+
+
+def _put_chunks(directory, process_index):
+    chunk_cache = ChunkCache(2000, directory)
+    for index in range(50):
+        chunk_cache.put_many(
+            DATASET_URL,
+            "generation",
+            {f"chunk.{process_index}.{index}": bytes(100)},
+        )
+
+
+class TestChunkCache:
+    def test_cached_chunks_are_returned(self, tmp_path):
+        chunk_cache = ChunkCache(2**20, tmp_path)
+        chunk_cache.put_many(DATASET_URL, "v1", {"0.0": b"a", "0.1": b"b"})
+
+        chunks = chunk_cache.get_many(DATASET_URL, "v1", ["0.0", "1.0"])
+
+        assert chunks == {"0.0": b"a"}
+
+    def test_chunks_of_another_generation_are_not_returned(self, tmp_path):
+        chunk_cache = ChunkCache(2**20, tmp_path)
+        chunk_cache.put_many(DATASET_URL, "v1", {"0.0": b"a"})
+
+        assert chunk_cache.get_many(DATASET_URL, "v2", ["0.0"]) == {}
+        chunk_cache.invalidate(DATASET_URL, "v2")
+        assert chunk_cache.get_many(DATASET_URL, "v1", ["0.0"]) == {}
+        assert list(tmp_path.glob("??/*")) == []
+
+    def test_least_recently_used_chunks_are_evicted(self, tmp_path):
+        chunk_cache = ChunkCache(350, tmp_path)
+        chunk_cache.put_many(DATASET_URL, "v1", {"0": bytes(100)})
+        chunk_cache.put_many(DATASET_URL, "v1", {"1": bytes(100)})
+        chunk_cache.put_many(DATASET_URL, "v1", {"2": bytes(100)})
+        chunk_cache.get_many(DATASET_URL, "v1", ["0"])
+
+        chunk_cache.put_many(DATASET_URL, "v1", {"3": bytes(100)})
+
+        assert set(
+            chunk_cache.get_many(DATASET_URL, "v1", ["0", "1", "2", "3"])
+        ) == {"0", "2", "3"}
+        assert len(list(tmp_path.glob("??/*"))) == 3
+
+    def test_chunks_larger_than_the_cache_are_not_stored(self, tmp_path):
+        chunk_cache = ChunkCache(10, tmp_path)
+        chunk_cache.put_many(DATASET_URL, "v1", {"0": bytes(11)})
+
+        assert chunk_cache.get_many(DATASET_URL, "v1", ["0"]) == {}
+
+    def test_rows_of_missing_chunk_files_are_removed(self, tmp_path):
+        chunk_cache = ChunkCache(2**20, tmp_path)
+        chunk_cache.put_many(DATASET_URL, "v1", {"0.0": b"a", "0.1": b"b"})
+        for path in tmp_path.glob("??/*"):
+            path.unlink()
+
+        assert chunk_cache.get_many(DATASET_URL, "v1", ["0.0", "0.1"]) == {}
+        with closing(sqlite3.connect(tmp_path / "index.sqlite3")) as index:
+            assert index.execute("SELECT * FROM chunks").fetchall() == []
+
+    def test_unusable_cache_directory_is_ignored(self, tmp_path):
+        not_a_directory = tmp_path / "chunks"
+        not_a_directory.write_bytes(b"")
+        chunk_cache = ChunkCache(2**20, not_a_directory)
+
+        chunk_cache.put_many(DATASET_URL, "v1", {"0.0": b"a"})
+        chunk_cache.invalidate(DATASET_URL, "v2")
+        assert chunk_cache.get_many(DATASET_URL, "v1", ["0.0"]) == {}
+
+    def test_chunks_are_kept_when_the_metadata_cache_is_deleted(
+        self, tmp_path
+    ):
+        chunk_cache = ChunkCache(2**20, tmp_path / "chunks")
+        chunk_cache.put_many(DATASET_URL, "v1", {"0.0": b"a"})
+        (tmp_path / "stac").mkdir()
+        (tmp_path / "catalogue.sqlite3").write_bytes(b"")
+
+        with mock.patch(
+            "copernicusmarine.core_functions.utils.CACHE_BASE_DIRECTORY",
+            tmp_path,
+        ):
+            delete_cache_folder(quiet=True)
+
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["chunks"]
+        assert chunk_cache.get_many(DATASET_URL, "v1", ["0.0"]) == {
+            "0.0": b"a"
+        }
+
+    def test_cache_is_shared_by_processes_within_its_size(self, tmp_path):
+        context = multiprocessing.get_context("spawn")
+        processes = [
+            context.Process(target=_put_chunks, args=(tmp_path, index))
+            for index in range(4)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+
+        assert [process.exitcode for process in processes] == [0] * 4
+        with closing(sqlite3.connect(tmp_path / "index.sqlite3")) as index:
+            file_names = [
+                row[0] for row in index.execute("SELECT file_name FROM chunks")
+            ]
+        assert 0 < len(file_names) * 100 <= 2000
+        assert sorted(file_names) == sorted(
+            str(path.relative_to(tmp_path)) for path in tmp_path.glob("??/*")
+        )
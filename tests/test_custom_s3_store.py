@@ -0,0 +1,301 @@
+import hashlib
+import threading
+import time
+from datetime import timedelta
+from unittest import mock
+
+import botocore.exceptions
+import numpy
+import zarr
+
+from copernicusmarine.core_functions.chunk_cache import ChunkCache
+from copernicusmarine.core_functions.custom_open_zarr import (
+    CustomS3Store,
+    _open_zarr,
+)
+from copernicusmarine.core_functions.retry_controller import (
+    RetryController,
+    RetryErrorClass,
+    RetryPolicy,
+)
+from copernicusmarine.core_functions.zarr_metadata_cache import (
+    ZarrMetadataCache,
+)
+
+
+class InMemoryS3Client:
+    def __init__(self, latency_seconds=0.0):
+        self.objects = {}
+        self.latency_seconds = latency_seconds
+        self.in_flight = 0
+        self.maximum_in_flight = 0
+        self.head_calls = 0
+        self.get_calls = 0
+        self.server_errors = 0
+        self.__lock = threading.Lock()
+
+    def head_object(self, Bucket, Key):
+        self.head_calls += 1
+        if Key not in self.objects:
+            raise self.not_found()
+        return {"ETag": self.etag(Key)}
+
+    def etag(self, Key):
+        return f'"{hashlib.md5(self.objects[Key]).hexdigest()}"'
+
+    def get_object(self, Bucket, Key, IfNoneMatch=None):
+        with self.__lock:
+            self.in_flight += 1
+            self.get_calls += 1
+            self.maximum_in_flight = max(
+                self.maximum_in_flight, self.in_flight
+            )
+        try:
+            time.sleep(self.latency_seconds)
+            if self.server_errors:
+                self.server_errors -= 1
+                raise botocore.exceptions.ClientError(
+                    {
+                        "Error": {"Code": "InternalError"},
+                        "ResponseMetadata": {"HTTPStatusCode": 500},
+                    },
+                    "GetObject",
+                )
+            if Key not in self.objects:
+                raise self.not_found()
+            if IfNoneMatch == self.etag(Key):
+                raise botocore.exceptions.ClientError(
+                    {"Error": {"Code": "304"}}, "GetObject"
+                )
+            return {
+                "Body": mock.Mock(read=lambda: self.objects[Key]),
+                "ETag": self.etag(Key),
+            }
+        finally:
+            with self.__lock:
+                self.in_flight -= 1
+
+    def not_found(self):
+        return botocore.exceptions.ClientError(
+            {"Error": {"Code": "404"}}, "GetObject"
+        )
+
+
+class TestCustomS3Store:
+    def test_getitems_fetches_chunks_concurrently(self):
+        client = InMemoryS3Client(latency_seconds=0.05)
+        store = self.given_store(client)
+        for index in range(8):
+            client.objects[f"root/chunk.{index}"] = bytes([index])
+
+        chunks = store.getitems(
+            [f"chunk.{index}" for index in range(10)], contexts={}
+        )
+
+        assert chunks == {
+            f"chunk.{index}": bytes([index]) for index in range(8)
+        }
+        assert client.maximum_in_flight > 1
+        assert client.head_calls == 0
+
+    def test_array_selection_reads_chunks_in_one_batch(self):
+        written_store: dict = {}
+        array = zarr.open_array(
+            written_store, mode="w", shape=(100,), chunks=(10,), dtype="i4"
+        )
+        array[:] = numpy.arange(100)
+        client = InMemoryS3Client()
+        for key, value in written_store.items():
+            client.objects[f"root/{key}"] = value
+        store = self.given_store(client)
+
+        with mock.patch.object(
+            CustomS3Store, "getitems", wraps=store.getitems
+        ) as getitems:
+            values = zarr.open_array(store, mode="r")[5:95]
+
+        numpy.testing.assert_array_equal(values, numpy.arange(5, 95))
+        getitems.assert_called_once()
+        assert len(getitems.call_args.args[0]) == 10
+
+    def test_server_errors_are_retried(self):
+        client = self.given_client_with_chunks()
+        client.server_errors = 3
+        store = self.given_store(client)
+
+        chunks = store.getitems(["chunk.0", "chunk.1"], contexts={})
+
+        assert chunks == {"chunk.0": bytes([0]), "chunk.1": bytes([1])}
+        client.server_errors = 1
+        assert store["chunk.2"] == bytes([2])
+
+    def test_single_chunks_are_retried_off_the_calling_thread(self):
+        client = self.given_client_with_chunks()
+        client.server_errors = 2
+        store = self.given_store(client)
+        get_object = client.get_object
+        fetching_threads = []
+
+        def recording_get_object(*args, **kwargs):
+            fetching_threads.append(threading.current_thread())
+            return get_object(*args, **kwargs)
+
+        client.get_object = recording_get_object
+
+        assert store["chunk.0"] == bytes([0])
+        assert store.getitems(["chunk.1"], contexts={}) == {
+            "chunk.1": bytes([1])
+        }
+        assert len(fetching_threads) == 4
+        assert threading.current_thread() not in fetching_threads
+
+    def test_chunks_are_read_again_from_the_chunk_cache(self, tmp_path):
+        client = self.given_client_with_chunks()
+        chunk_cache = ChunkCache(2**20, tmp_path)
+        first_chunks = self.given_store(client, chunk_cache).getitems(
+            [f"chunk.{index}" for index in range(4)], contexts={}
+        )
+        client.get_calls = 0
+
+        second_chunks = self.given_store(client, chunk_cache).getitems(
+            [f"chunk.{index}" for index in range(4)], contexts={}
+        )
+
+        assert second_chunks == first_chunks
+        assert client.get_calls == 0
+
+    def test_chunk_cache_is_invalidated_by_new_metadata(self, tmp_path):
+        client = self.given_client_with_chunks()
+        chunk_cache = ChunkCache(2**20, tmp_path)
+        self.given_store(client, chunk_cache)["chunk.0"]
+        client.objects["root/.zmetadata"] = b'{"new": "version"}'
+        client.objects["root/chunk.0"] = b"updated"
+
+        chunk = self.given_store(client, chunk_cache)["chunk.0"]
+
+        assert chunk == b"updated"
+        assert len(list(tmp_path.glob("??/*"))) == 1
+
+    def test_metadata_is_not_cached(self, tmp_path):
+        client = self.given_client_with_chunks()
+        chunk_cache = ChunkCache(2**20, tmp_path)
+        self.given_store(client, chunk_cache)[".zmetadata"]
+        client.get_calls = 0
+
+        self.given_store(client, chunk_cache)[".zmetadata"]
+
+        assert client.get_calls == 1
+
+    def test_dataset_opened_before_is_opened_from_the_cache(self, tmp_path):
+        client = self.given_client_with_dataset()
+        metadata_cache = ZarrMetadataCache(tmp_path)
+        self.open_dataset(client, metadata_cache)
+        client.get_calls = 0
+
+        times = self.open_dataset(client, metadata_cache)
+
+        numpy.testing.assert_array_equal(times, numpy.arange(20))
+        assert client.get_calls == 0
+        assert client.head_calls == 0
+
+    def test_stale_metadata_is_revalidated(self, tmp_path):
+        client = self.given_client_with_dataset()
+        metadata_cache = ZarrMetadataCache(tmp_path)
+        self.open_dataset(client, metadata_cache)
+        client.get_calls = 0
+
+        with mock.patch(
+            "copernicusmarine.core_functions.zarr_metadata_cache."
+            "ZARR_METADATA_REVALIDATE_AFTER",
+            timedelta(0),
+        ):
+            times = self.open_dataset(client, metadata_cache)
+
+        numpy.testing.assert_array_equal(times, numpy.arange(20))
+        assert client.get_calls == 1
+
+    def test_changed_metadata_is_read_again(self, tmp_path):
+        client = self.given_client_with_dataset()
+        metadata_cache = ZarrMetadataCache(tmp_path)
+        self.open_dataset(client, metadata_cache)
+        client.objects.update(
+            {
+                f"root/{key}": value
+                for key, value in self.given_dataset_objects(
+                    numpy.arange(30)
+                ).items()
+            }
+        )
+
+        with mock.patch(
+            "copernicusmarine.core_functions.zarr_metadata_cache."
+            "ZARR_METADATA_REVALIDATE_AFTER",
+            timedelta(0),
+        ):
+            times = self.open_dataset(client, metadata_cache)
+
+        numpy.testing.assert_array_equal(times, numpy.arange(30))
+
+    def test_metadata_cache_is_not_used_with_no_metadata_cache(self):
+        with mock.patch(
+            "copernicusmarine.core_functions.custom_open_zarr.CustomS3Store"
+        ) as store_class, mock.patch("xarray.open_zarr"):
+            _open_zarr("https://s3.example.com/bucket/root")
+            _open_zarr(
+                "https://s3.example.com/bucket/root", no_metadata_cache=True
+            )
+
+        first_call, second_call = store_class.call_args_list
+        assert isinstance(
+            first_call.kwargs["metadata_cache"], ZarrMetadataCache
+        )
+        assert second_call.kwargs["metadata_cache"] is None
+
+    def open_dataset(self, client, metadata_cache):
+        store = self.given_store(client, metadata_cache=metadata_cache)
+        times = zarr.open_consolidated(store, mode="r")["time"][:]
+        store.save_metadata()
+        return times
+
+    def given_client_with_dataset(self):
+        client = InMemoryS3Client()
+        for key, value in self.given_dataset_objects(numpy.arange(20)).items():
+            client.objects[f"root/{key}"] = value
+        return client
+
+    def given_dataset_objects(self, times):
+        written_store: dict = {}
+        group = zarr.group(written_store)
+        time_array = group.array("time", times, chunks=(10,))
+        time_array.attrs["_ARRAY_DIMENSIONS"] = ["time"]
+        values = group.array("values", times * 2.0, chunks=(10,))
+        values.attrs["_ARRAY_DIMENSIONS"] = ["time"]
+        zarr.consolidate_metadata(written_store)
+        return written_store
+
+    def given_client_with_chunks(self):
+        client = InMemoryS3Client()
+        client.objects["root/.zmetadata"] = b"{}"
+        for index in range(4):
+            client.objects[f"root/chunk.{index}"] = bytes([index])
+        return client
+
+    def given_store(self, client, chunk_cache=None, metadata_cache=None):
+        with mock.patch(
+            "copernicusmarine.core_functions.custom_open_zarr."
+            "get_configured_boto3_session",
+            return_value=(client, None),
+        ):
+            return CustomS3Store(
+                endpoint="https://s3.example.com",
+                bucket="bucket",
+                root_path="root",
+                retry_controller=RetryController(
+                    {
+                        error_class: RetryPolicy(5, 0.01, 0.01)
+                        for error_class in RetryErrorClass
+                    }
+                ),
+                chunk_cache=chunk_cache,
+                metadata_cache=metadata_cache,
+            )
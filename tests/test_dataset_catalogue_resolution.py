@@ -0,0 +1,108 @@
+from unittest import mock
+
+import pystac
+
+from copernicusmarine.catalogue_parser.catalogue_parser import (
+    CatalogParserConnection,
+    _get_candidate_collection_links,
+    parse_dataset_catalogue,
+)
+from tests.resources.mock_stac_catalog.marine_data_store_stac_metadata_mock import (
+    BASE_URL,
+    mocked_stac_aiohttp_get,
+)
+
+DATASET_ID = "cmems_mod_glo_phy-so_anfc_0.083deg_P1D-m"
+DATASET_URL = (
+    "https://s3.waw3-1.cloudferro.com/mdl-arco-geo-007/arco/"
+    "GLOBAL_ANALYSISFORECAST_PHY_001_024/"
+    "cmems_mod_glo_phy-so_anfc_0.083deg_P1D-m_202211/geoChunked.zarr"
+)
+
+
+class TestDatasetCatalogueResolution:
+    @mock.patch(
+        "aiohttp.ClientSession.get",
+        side_effect=mocked_stac_aiohttp_get,
+    )
+    def test_resolution_by_dataset_id_fetches_only_its_items(self, mock_get):
+        catalogue = parse_dataset_catalogue(
+            dataset_id=DATASET_ID,
+            dataset_url=None,
+            no_metadata_cache=True,
+            disable_progress_bar=True,
+        )
+
+        self.then_only_the_requested_dataset_is_resolved(catalogue, mock_get)
+        requested_urls = [call.args[0] for call in mock_get.call_args_list]
+        assert (
+            f"{BASE_URL}/NWSHELF_MULTIYEAR_BGC_004_011/product.stac.json"
+            not in requested_urls
+        )
+
+    def test_likely_product_collections_are_fetched_first(self):
+        child_links = [
+            pystac.Link("child", f"{product_id}/product.stac.json")
+            for product_id in [
+                "ARCTIC_ANALYSISFORECAST_PHY_002_001",
+                "GLOBAL_ANALYSISFORECAST_PHY_001_024",
+                "NWSHELF_MULTIYEAR_BGC_004_011",
+                "SEALEVEL_GLO_PHY_L4_NRT_008_046",
+            ]
+        ]
+
+        groups = _get_candidate_collection_links(
+            child_links,
+            CatalogParserConnection(json_cache=None),
+            dataset_id=DATASET_ID,
+            dataset_url=None,
+            product_id="NWSHELF_MULTIYEAR_BGC_004_011",
+        )
+
+        assert [
+            [link.href.split("/")[0] for link in group] for group in groups
+        ] == [
+            ["NWSHELF_MULTIYEAR_BGC_004_011"],
+            [
+                "GLOBAL_ANALYSISFORECAST_PHY_001_024",
+                "SEALEVEL_GLO_PHY_L4_NRT_008_046",
+            ],
+            ["ARCTIC_ANALYSISFORECAST_PHY_002_001"],
+        ]
+
+    @mock.patch(
+        "aiohttp.ClientSession.get",
+        side_effect=mocked_stac_aiohttp_get,
+    )
+    def test_resolution_by_dataset_url_fetches_only_its_product(
+        self, mock_get
+    ):
+        catalogue = parse_dataset_catalogue(
+            dataset_id=None,
+            dataset_url=DATASET_URL,
+            no_metadata_cache=True,
+            disable_progress_bar=True,
+        )
+
+        self.then_only_the_requested_dataset_is_resolved(catalogue, mock_get)
+        requested_urls = [call.args[0] for call in mock_get.call_args_list]
+        assert (
+            f"{BASE_URL}/NWSHELF_MULTIYEAR_BGC_004_011/product.stac.json"
+            not in requested_urls
+        )
+
+    def then_only_the_requested_dataset_is_resolved(self, catalogue, mock_get):
+        assert len(catalogue.products) == 1
+        assert [
+            dataset.dataset_id for dataset in catalogue.products[0].datasets
+        ] == [DATASET_ID]
+        requested_dataset_urls = [
+            call.args[0]
+            for call in mock_get.call_args_list
+            if call.args[0].endswith("dataset.stac.json")
+        ]
+        assert requested_dataset_urls == [
+            f"{BASE_URL}/GLOBAL_ANALYSISFORECAST_PHY_001_024/"
+            "cmems_mod_glo_phy-so_anfc_0.083deg_P1D-m_202211/"
+            "dataset.stac.json"
+        ]
@@ -0,0 +1,67 @@
+import io
+import json
+from unittest import mock
+
+from copernicusmarine.core_functions.describe import (
+    describe_function,
+    write_describe_function,
+)
+from tests.resources.mock_stac_catalog.marine_data_store_stac_metadata_mock import (
+    mocked_stac_aiohttp_get,
+)
+
+
+class ChunkRecorder(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.number_of_writes = 0
+
+    def write(self, chunk):
+        self.number_of_writes += 1
+        return super().write(chunk)
+
+
+@mock.patch(
+    "copernicusmarine.core_functions.describe.VersionVerifier"
+    ".check_version_describe"
+)
+@mock.patch("aiohttp.ClientSession.get", side_effect=mocked_stac_aiohttp_get)
+class TestDescribeStreaming:
+    def describe_arguments(self, **kwargs):
+        return {
+            "include_description": False,
+            "include_datasets": True,
+            "include_keywords": False,
+            "include_versions": True,
+            "contains": [],
+            "overwrite_metadata_cache": False,
+            "no_metadata_cache": True,
+            "disable_progress_bar": True,
+            "staging": False,
+            **kwargs,
+        }
+
+    def test_streamed_output_is_the_describe_json(self, mock_get, _):
+        output = ChunkRecorder()
+
+        write_describe_function(**self.describe_arguments(), output=output)
+
+        assert output.number_of_writes > 1
+        assert output.getvalue() == (
+            describe_function(**self.describe_arguments()) + "\n"
+        )
+
+    def test_projections_are_applied_while_encoding(self, mock_get, _):
+        output = io.StringIO()
+
+        write_describe_function(
+            **self.describe_arguments(include_datasets=False), output=output
+        )
+
+        products = json.loads(output.getvalue())["products"]
+        assert products
+        for product in products:
+            assert "datasets" not in product
+            assert "description" not in product
+            assert "keywords" not in product
+            assert "product_id" in product
@@ -0,0 +1,34 @@
+from copernicusmarine.core_functions.json_file_cache import (
+    read_json_cache_file,
+    write_json_cache_file,
+)
+
+
+class TestJsonFileCache:
+    def test_cache_file_is_written_and_read_back(self, tmp_path):
+        path = tmp_path / "ab" / "entry.json"
+
+        write_json_cache_file(path, {"content": [1, 2]})
+
+        assert read_json_cache_file(path, lambda cached: cached) == {
+            "content": [1, 2]
+        }
+
+    def test_temporary_file_is_removed_when_the_content_is_invalid(
+        self, tmp_path
+    ):
+        path = tmp_path / "entry.json"
+
+        write_json_cache_file(path, {"content": object()})
+
+        assert list(tmp_path.iterdir()) == []
+
+    def test_unreadable_cache_file_is_a_miss(self, tmp_path):
+        path = tmp_path / "entry.json"
+        path.write_text("{not json")
+
+        assert read_json_cache_file(path, lambda cached: cached) is None
+        assert (
+            read_json_cache_file(tmp_path / "missing.json", lambda c: c)
+            is None
+        )
@@ -0,0 +1,140 @@
+import pathlib
+from datetime import timedelta
+from unittest import mock
+
+from copernicusmarine.catalogue_parser.catalogue_parser import (
+    _parse_dataset_catalogue,
+    parse_dataset_catalogue,
+    refresh_catalogue_cache,
+)
+from copernicusmarine.core_functions.memoization import (
+    TimeToLiveCache,
+    clear_time_to_live_caches,
+)
+from copernicusmarine.core_functions.services_utils import (
+    CommandType,
+    _get_retrieval_service_from_dataset_id,
+    get_retrieval_service,
+)
+from tests.resources.mock_stac_catalog.marine_data_store_stac_metadata_mock import (
+    mocked_stac_aiohttp_get,
+)
+
+CATALOGUE_PARSER = "copernicusmarine.catalogue_parser.catalogue_parser"
+SERVICES_UTILS = "copernicusmarine.core_functions.services_utils"
+DATASET_ID = "cmems_mod_glo_phy-so_anfc_0.083deg_P1D-m"
+
+
+class TestMetadataMemoization:
+    def test_values_expire_after_their_time_to_live(self):
+        time_to_live_cache = TimeToLiveCache(timedelta(seconds=10))
+        with mock.patch("time.monotonic", return_value=100):
+            time_to_live_cache.put("key", "value")
+        with mock.patch("time.monotonic", return_value=105):
+            assert time_to_live_cache.get("key") == "value"
+        with mock.patch("time.monotonic", return_value=111):
+            assert time_to_live_cache.get("key") is None
+
+    def test_least_recently_used_values_are_dropped(self):
+        time_to_live_cache = TimeToLiveCache(
+            timedelta(seconds=10), maximum_size=2
+        )
+        time_to_live_cache.put("first", 1)
+        time_to_live_cache.put("second", 2)
+        time_to_live_cache.get("first")
+        time_to_live_cache.put("third", 3)
+
+        assert time_to_live_cache.get("first") == 1
+        assert time_to_live_cache.get("second") is None
+
+    def test_dataset_catalogue_is_kept_until_the_cache_changes(self, tmp_path):
+        directory = pathlib.Path(tmp_path)
+        with mock.patch(
+            f"{CATALOGUE_PARSER}.get_catalogue_store_path",
+            lambda staging: directory / f"catalogue_{staging}.sqlite3",
+        ), mock.patch(
+            f"{CATALOGUE_PARSER}.StacJsonCache", mock.Mock(return_value=None)
+        ), mock.patch(
+            "aiohttp.ClientSession.get",
+            side_effect=mocked_stac_aiohttp_get,
+        ):
+            refresh_catalogue_cache(disable_progress_bar=True)
+            with mock.patch(
+                f"{CATALOGUE_PARSER}._parse_dataset_catalogue",
+                wraps=_parse_dataset_catalogue,
+            ) as parse:
+                first_catalogue = self.parse_dataset_catalogue()
+                assert self.parse_dataset_catalogue() is first_catalogue
+                assert parse.call_count == 1
+
+                refresh_catalogue_cache(disable_progress_bar=True)
+                assert self.parse_dataset_catalogue() is not first_catalogue
+                assert parse.call_count == 2
+
+                self.parse_dataset_catalogue(no_metadata_cache=True)
+                assert parse.call_count == 3
+
+    @mock.patch(
+        "aiohttp.ClientSession.get",
+        side_effect=mocked_stac_aiohttp_get,
+    )
+    def test_retrieval_service_is_kept_for_the_same_catalogue(self, mock_get):
+        catalogue = self.parse_dataset_catalogue(no_metadata_cache=True)
+        with mock.patch(
+            f"{SERVICES_UTILS}._get_retrieval_service_from_dataset_id",
+            wraps=_get_retrieval_service_from_dataset_id,
+        ) as select_service:
+            first_service = self.get_retrieval_service(catalogue)
+            second_service = self.get_retrieval_service(catalogue)
+            assert select_service.call_count == 1
+
+            clear_time_to_live_caches()
+            self.get_retrieval_service(catalogue)
+            assert select_service.call_count == 2
+
+            other_catalogue = self.parse_dataset_catalogue(
+                no_metadata_cache=True
+            )
+            self.get_retrieval_service(other_catalogue)
+            assert select_service.call_count == 3
+
+        assert second_service == first_service
+        assert second_service is not first_service
+
+    @mock.patch(
+        "aiohttp.ClientSession.get",
+        side_effect=mocked_stac_aiohttp_get,
+    )
+    def test_retrieval_service_is_not_kept_with_no_metadata_cache(
+        self, mock_get
+    ):
+        catalogue = self.parse_dataset_catalogue(no_metadata_cache=True)
+        with mock.patch(
+            f"{SERVICES_UTILS}._get_retrieval_service_from_dataset_id",
+            wraps=_get_retrieval_service_from_dataset_id,
+        ) as select_service:
+            self.get_retrieval_service(catalogue, no_metadata_cache=True)
+            self.get_retrieval_service(catalogue)
+            self.get_retrieval_service(catalogue, no_metadata_cache=True)
+
+        assert select_service.call_count == 3
+
+    def parse_dataset_catalogue(self, no_metadata_cache=False):
+        return parse_dataset_catalogue(
+            dataset_id=DATASET_ID,
+            dataset_url=None,
+            no_metadata_cache=no_metadata_cache,
+            disable_progress_bar=True,
+        )
+
+    def get_retrieval_service(self, catalogue, no_metadata_cache=False):
+        return get_retrieval_service(
+            catalogue=catalogue,
+            dataset_id=DATASET_ID,
+            dataset_url=None,
+            force_dataset_version_label=None,
+            force_dataset_part_label=None,
+            force_service_type_string=None,
+            command_type=CommandType.GET,
+            no_metadata_cache=no_metadata_cache,
+        )
@@ -0,0 +1,152 @@
+import pathlib
+from unittest import mock
+
+import pytest
+
+from copernicusmarine.catalogue_parser.catalogue_parser import (
+    parse_catalogue,
+    parse_dataset_catalogue,
+    refresh_catalogue_cache,
+)
+from copernicusmarine.core_functions.credentials_utils import (
+    _are_copernicus_marine_credentials_valid,
+)
+from copernicusmarine.core_functions.environment_variables import (
+    get_boolean_environment_variable,
+)
+from copernicusmarine.core_functions.metadata_cache import (
+    MetadataCache,
+    OfflineMetadataNotCached,
+)
+from copernicusmarine.core_functions.versions_verifier import VersionVerifier
+from tests.resources.mock_stac_catalog.marine_data_store_stac_metadata_mock import (
+    mocked_stac_aiohttp_get,
+)
+
+CATALOGUE_PARSER = "copernicusmarine.catalogue_parser.catalogue_parser"
+CREDENTIALS_UTILS = "copernicusmarine.core_functions.credentials_utils"
+VERSIONS_VERIFIER = "copernicusmarine.core_functions.versions_verifier"
+CLIENT_VERSIONS = {"mds": ">=1.0.0", "mds/serverlessArco/meta": ">=1.0.0"}
+
+
+class TestOfflineMode:
+    @pytest.mark.parametrize(
+        "value, expected",
+        [
+            ("True", True),
+            ("1", True),
+            ("yes", True),
+            ("False", False),
+            ("false", False),
+            ("0", False),
+            ("", False),
+        ],
+    )
+    def test_offline_environment_variable_is_parsed_as_a_boolean(
+        self, value, expected
+    ):
+        with mock.patch.dict(
+            "os.environ", {"COPERNICUSMARINE_OFFLINE": value}
+        ):
+            assert (
+                get_boolean_environment_variable("COPERNICUSMARINE_OFFLINE")
+                is expected
+            )
+
+    def test_versions_are_served_from_cache_offline(self, tmp_path):
+        session = mock.Mock()
+        session.get.return_value.json.return_value = {
+            "clientVersions": CLIENT_VERSIONS
+        }
+        with self.given_metadata_cache_in(tmp_path, VERSIONS_VERIFIER):
+            with mock.patch(
+                f"{VERSIONS_VERIFIER}.get_configured_requests_session",
+                return_value=session,
+            ):
+                assert (
+                    VersionVerifier._get_client_required_versions(False)
+                    == CLIENT_VERSIONS
+                )
+            with self.given_offline_mode(VERSIONS_VERIFIER), mock.patch(
+                f"{VERSIONS_VERIFIER}.get_configured_requests_session"
+            ) as offline_session:
+                assert (
+                    VersionVerifier._get_client_required_versions(False)
+                    == CLIENT_VERSIONS
+                )
+                assert (
+                    VersionVerifier._get_client_required_versions(True) is None
+                )
+                VersionVerifier.check_version_describe(staging=True)
+
+        offline_session.assert_not_called()
+
+    def test_credentials_validity_is_served_from_cache_offline(self, tmp_path):
+        with self.given_metadata_cache_in(tmp_path, CREDENTIALS_UTILS):
+            with mock.patch(
+                f"{CREDENTIALS_UTILS}._check_credentials_with_cas",
+                return_value=True,
+            ) as check_credentials:
+                assert _are_copernicus_marine_credentials_valid("user", "pw")
+                assert _are_copernicus_marine_credentials_valid("user", "pw")
+                check_credentials.assert_called_once()
+
+                with self.given_offline_mode(CREDENTIALS_UTILS):
+                    assert _are_copernicus_marine_credentials_valid(
+                        "user", "pw"
+                    )
+                    with pytest.raises(OfflineMetadataNotCached):
+                        _are_copernicus_marine_credentials_valid(
+                            "user", "other"
+                        )
+                check_credentials.assert_called_once()
+
+        cache_files = list(pathlib.Path(tmp_path).rglob("*.json"))
+        assert cache_files
+        assert all("pw" not in path.read_text() for path in cache_files)
+
+    def test_catalogue_is_served_from_cache_offline(self, tmp_path):
+        directory = pathlib.Path(tmp_path)
+        with mock.patch(
+            f"{CATALOGUE_PARSER}.get_catalogue_store_path",
+            lambda staging: directory / f"catalogue_{staging}.sqlite3",
+        ):
+            with mock.patch(
+                "aiohttp.ClientSession.get",
+                side_effect=mocked_stac_aiohttp_get,
+            ), mock.patch(
+                f"{CATALOGUE_PARSER}.StacJsonCache",
+                mock.Mock(return_value=None),
+            ):
+                refresh_catalogue_cache(disable_progress_bar=True)
+
+            with self.given_offline_mode(CATALOGUE_PARSER), mock.patch(
+                "aiohttp.ClientSession.get"
+            ) as offline_get:
+                assert parse_catalogue(
+                    no_metadata_cache=True, disable_progress_bar=True
+                ).products
+                dataset_catalogue = parse_dataset_catalogue(
+                    dataset_id="cmems_mod_glo_phy-so_anfc_0.083deg_P1D-m",
+                    dataset_url=None,
+                    no_metadata_cache=False,
+                    disable_progress_bar=True,
+                )
+                assert len(dataset_catalogue.products) == 1
+                with pytest.raises(OfflineMetadataNotCached):
+                    parse_catalogue(
+                        no_metadata_cache=False,
+                        disable_progress_bar=True,
+                        staging=True,
+                    )
+
+        offline_get.assert_not_called()
+
+    def given_offline_mode(self, module):
+        return mock.patch(f"{module}.COPERNICUSMARINE_OFFLINE", True)
+
+    def given_metadata_cache_in(self, tmp_path, module):
+        return mock.patch(
+            f"{module}.MetadataCache",
+            lambda: MetadataCache(pathlib.Path(tmp_path)),
+        )
@@ -0,0 +1,86 @@
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+import xarray
+
+from copernicusmarine.core_functions import custom_open_zarr
+from copernicusmarine.core_functions.memoization import (
+    clear_time_to_live_caches,
+)
+
+
+class TestOpenedDatasets:
+    @pytest.fixture(autouse=True)
+    def open_zarr(self):
+        clear_time_to_live_caches()
+        with mock.patch.object(
+            custom_open_zarr,
+            "_open_zarr",
+            side_effect=lambda *args, **kwargs: xarray.Dataset(),
+        ) as open_zarr:
+            yield open_zarr
+        clear_time_to_live_caches()
+
+    def test_datasets_are_opened_once_within_the_block(self, open_zarr):
+        with custom_open_zarr.reuse_opened_datasets():
+            first = custom_open_zarr.open_zarr("url", chunks="auto")
+            clear_time_to_live_caches()
+            second = custom_open_zarr.open_zarr("url", chunks="auto")
+            custom_open_zarr.open_zarr("url", chunks=None)
+            custom_open_zarr.open_zarr("other_url", chunks="auto")
+
+        assert open_zarr.call_count == 3
+        second.attrs["changed"] = True
+        assert "changed" not in first.attrs
+
+    def test_s3_statistics_are_logged_when_leaving_the_block(self):
+        with mock.patch.object(
+            custom_open_zarr.s3_retry_controller, "log_statistics"
+        ) as log_statistics:
+            with pytest.raises(ValueError):
+                with custom_open_zarr.reuse_opened_datasets():
+                    custom_open_zarr.open_zarr("url")
+                    raise ValueError()
+
+        log_statistics.assert_called_once()
+
+    def test_datasets_are_kept_in_memory(self, open_zarr):
+        custom_open_zarr.open_zarr("url")
+        custom_open_zarr.open_zarr("url")
+        custom_open_zarr.open_zarr("url", copernicus_marine_username="user")
+
+        assert open_zarr.call_count == 2
+
+    def test_datasets_are_not_kept_in_memory_with_no_metadata_cache(
+        self, open_zarr
+    ):
+        custom_open_zarr.open_zarr("url")
+        custom_open_zarr.open_zarr("url", no_metadata_cache=True)
+        custom_open_zarr.open_zarr("other_url", no_metadata_cache=True)
+        custom_open_zarr.open_zarr("other_url")
+
+        assert open_zarr.call_count == 4
+
+    def test_datasets_are_opened_again_after_their_time_to_live(
+        self, open_zarr
+    ):
+        custom_open_zarr.open_zarr("url")
+        with mock.patch.object(
+            custom_open_zarr._opened_datasets_in_memory,
+            "time_to_live",
+            timedelta(0),
+        ):
+            custom_open_zarr.open_zarr("url")
+
+        assert open_zarr.call_count == 2
+
+    def test_only_the_last_datasets_are_kept_in_memory(self, open_zarr):
+        for index in range(custom_open_zarr.OPENED_DATASETS_IN_MEMORY + 1):
+            custom_open_zarr.open_zarr(f"url_{index}")
+        custom_open_zarr.open_zarr("url_0")
+
+        assert (
+            open_zarr.call_count
+            == custom_open_zarr.OPENED_DATASETS_IN_MEMORY + 2
+        )
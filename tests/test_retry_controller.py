@@ -0,0 +1,189 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import botocore.exceptions
+import pytest
+
+from copernicusmarine.core_functions.retry_controller import (
+    CircuitOpenError,
+    RetryController,
+    RetryErrorClass,
+    RetryPolicy,
+    classify_error,
+)
+
+FAST_POLICIES = {
+    error_class: RetryPolicy(4, 0.01, 0.01) for error_class in RetryErrorClass
+}
+
+
+def client_error(code, status_code):
+    return botocore.exceptions.ClientError(
+        {
+            "Error": {"Code": code},
+            "ResponseMetadata": {"HTTPStatusCode": status_code},
+        },
+        "GetObject",
+    )
+
+
+def call(retry_controller, function):
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return retry_controller.submit(executor, function).result()
+
+
+class FailingFunction:
+    def __init__(self, errors, result="result"):
+        self.errors = list(errors)
+        self.result = result
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return self.result
+
+
+class TestRetryController:
+    def test_errors_are_classified(self):
+        assert (
+            classify_error(client_error("SlowDown", 503))
+            == RetryErrorClass.THROTTLING
+        )
+        assert (
+            classify_error(client_error("InternalError", 500))
+            == RetryErrorClass.SERVER
+        )
+        assert (
+            classify_error(
+                botocore.exceptions.EndpointConnectionError(
+                    endpoint_url="https://s3.example.com"
+                )
+            )
+            == RetryErrorClass.NETWORK
+        )
+        assert classify_error(client_error("NoSuchKey", 404)) is None
+        assert classify_error(KeyError("0.0")) is None
+
+    def test_retryable_errors_are_retried(self):
+        retry_controller = RetryController(FAST_POLICIES)
+        function = FailingFunction(
+            [client_error("SlowDown", 503), client_error("Internal", 500)]
+        )
+
+        assert call(retry_controller, function) == "result"
+        assert function.calls == 3
+        assert retry_controller.statistics.retries == {
+            RetryErrorClass.THROTTLING: 1,
+            RetryErrorClass.SERVER: 1,
+        }
+
+    def test_other_errors_are_not_retried(self):
+        retry_controller = RetryController(FAST_POLICIES)
+        function = FailingFunction([KeyError("0.0")])
+
+        with pytest.raises(KeyError):
+            call(retry_controller, function)
+        assert function.calls == 1
+
+    def test_retries_stop_at_the_maximum_attempts(self):
+        retry_controller = RetryController(FAST_POLICIES)
+        function = FailingFunction([client_error("Internal", 500)] * 10)
+
+        with pytest.raises(botocore.exceptions.ClientError):
+            call(retry_controller, function)
+        assert function.calls == 4
+        assert retry_controller.statistics.failures == 1
+
+    def test_retries_stop_when_the_budget_is_exhausted(self):
+        retry_controller = RetryController(
+            FAST_POLICIES, retry_budget_capacity=10, retry_cost=5
+        )
+        function = FailingFunction([client_error("SlowDown", 503)] * 10)
+
+        with pytest.raises(botocore.exceptions.ClientError):
+            call(retry_controller, function)
+        assert function.calls == 3
+        assert retry_controller.statistics.budget_exhausted == 1
+
+    def test_circuit_opens_after_consecutive_failures(self):
+        retry_controller = RetryController(
+            FAST_POLICIES, failure_threshold=3, cool_down_seconds=0.1
+        )
+        function = FailingFunction([client_error("Internal", 500)] * 3)
+
+        with pytest.raises(CircuitOpenError):
+            call(retry_controller, function)
+        with pytest.raises(CircuitOpenError):
+            call(retry_controller, function)
+        assert function.calls == 3
+
+        time.sleep(0.1)
+        assert call(retry_controller, function) == "result"
+        assert retry_controller.statistics.circuit_opened == 1
+
+    def test_submitted_retries_do_not_hold_the_executor(self):
+        retry_controller = RetryController(
+            {
+                error_class: RetryPolicy(2, 0.4, 0.4)
+                for error_class in RetryErrorClass
+            }
+        )
+        finished = []
+
+        def fetch(name, errors):
+            function = FailingFunction(errors, result=name)
+
+            def fetch_and_record():
+                result = function()
+                finished.append(result)
+                return result
+
+            return fetch_and_record
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            failing = retry_controller.submit(
+                executor,
+                fetch("retried", [client_error("Internal", 500)] * 1),
+            )
+            succeeding = retry_controller.submit(
+                executor, fetch("first try", [])
+            )
+            assert succeeding.result(timeout=1) == "first try"
+            assert failing.result(timeout=2) == "retried"
+
+        assert finished == ["first try", "retried"]
+
+    def test_statistics_are_logged_and_reset(self, caplog):
+        retry_controller = RetryController(FAST_POLICIES)
+        call(
+            retry_controller, FailingFunction([client_error("Internal", 500)])
+        )
+
+        with caplog.at_level("INFO", logger="copernicus_marine_root_logger"):
+            retry_controller.log_statistics()
+
+        assert "2 requests, 1 retries (1 server)" in caplog.text
+        assert retry_controller.statistics.attempts == 0
+
+    def test_controller_is_thread_safe(self):
+        retry_controller = RetryController(
+            FAST_POLICIES, retry_budget_capacity=10**6
+        )
+
+        def call_many():
+            for _ in range(100):
+                call(
+                    retry_controller,
+                    FailingFunction([client_error("SlowDown", 503)]),
+                )
+
+        threads = [threading.Thread(target=call_many) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert retry_controller.statistics.attempts == 800
@@ -0,0 +1,67 @@
+import asyncio
+from unittest import mock
+
+from copernicusmarine.catalogue_parser.catalogue_parser import (
+    CatalogParserConnection,
+)
+from copernicusmarine.catalogue_parser.stac_json_cache import StacJsonCache
+
+URL = "https://example.com/metadata/PRODUCT/product.stac.json"
+
+
+class MockResponse:
+    def __init__(self, json_data, status, headers):
+        self.json_data = json_data
+        self.status = status
+        self.headers = headers
+
+    async def json(self):
+        return self.json_data
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+def mocked_conditional_get(*args, **kwargs):
+    headers = kwargs.get("headers") or {}
+    if headers.get("If-None-Match") == '"etag-1"':
+        return MockResponse(None, 304, {})
+    return MockResponse({"id": "PRODUCT"}, 200, {"ETag": '"etag-1"'})
+
+
+class TestStacJsonCache:
+    def test_put_and_get(self, tmp_path):
+        cache = StacJsonCache(tmp_path)
+        assert cache.get(URL) is None
+        cache.put(URL, '"etag-1"', None, {"id": "PRODUCT"})
+        cached = cache.get(URL)
+        assert cached is not None
+        assert cached.content == {"id": "PRODUCT"}
+        assert cached.conditional_request_headers() == {
+            "If-None-Match": '"etag-1"'
+        }
+
+    @mock.patch(
+        "aiohttp.ClientSession.get",
+        side_effect=mocked_conditional_get,
+    )
+    def test_connection_revalidates_cached_json(self, mock_get, tmp_path):
+        async def fetch_twice():
+            connection = CatalogParserConnection(
+                json_cache=StacJsonCache(tmp_path)
+            )
+            first = await connection.get_json_file(URL)
+            second = await connection.get_json_file(URL)
+            await connection.close()
+            return first, second
+
+        first, second = asyncio.run(fetch_twice())
+
+        assert first == second == {"id": "PRODUCT"}
+        assert mock_get.call_args_list[0].kwargs["headers"] is None
+        assert mock_get.call_args_list[1].kwargs["headers"] == {
+            "If-None-Match": '"etag-1"'
+        }
@@ -0,0 +1,89 @@
+import logging
+import threading
+import time
+
+import pytest
+
+from copernicusmarine.core_functions.startup_steps import StartupSteps
+
+
+class TestStartupSteps:
+    def test_started_steps_run_concurrently_with_the_command(self):
+        started = threading.Event()
+        startup_steps = StartupSteps("test")
+
+        startup_steps.start("background", started.wait, 5)
+        startup_steps.run("foreground", started.set)
+        assert startup_steps.wait("background") is True
+        startup_steps.finish()
+
+        assert [timing.name for timing in startup_steps.step_timings] == [
+            "foreground",
+            "background",
+        ]
+
+    def test_errors_of_started_steps_are_raised_when_waited(self):
+        def fail():
+            raise ValueError("invalid")
+
+        startup_steps = StartupSteps("test")
+        startup_steps.start("failing", fail)
+
+        with pytest.raises(ValueError):
+            startup_steps.finish()
+
+    def test_critical_path_only_counts_waiting_time(self, caplog):
+        startup_steps = StartupSteps("test")
+
+        startup_steps.start("background", time.sleep, 0.2)
+        startup_steps.run("foreground", time.sleep, 0.15)
+        with caplog.at_level(
+            logging.DEBUG, logger="copernicus_marine_root_logger"
+        ):
+            startup_steps.finish()
+
+        background = startup_steps.step_timings[1]
+        assert background.duration_seconds >= 0.2
+        assert background.critical_path_seconds < 0.15
+        assert "test startup step 'background'" in caplog.text
+
+    def test_finish_waits_for_all_steps_when_one_fails(self):
+        def fail():
+            raise ValueError("invalid")
+
+        finished = threading.Event()
+        startup_steps = StartupSteps("test")
+        startup_steps.start("failing", fail)
+        startup_steps.start("slow", lambda: time.sleep(0.1) or finished.set())
+
+        with pytest.raises(ValueError):
+            startup_steps.finish()
+
+        assert finished.is_set()
+        with pytest.raises(RuntimeError):
+            startup_steps.start("after", time.sleep, 0)
+
+    def test_errors_of_started_steps_are_raised_before_later_errors(self):
+        def fail():
+            time.sleep(0.1)
+            raise PermissionError("invalid credentials")
+
+        with pytest.raises(PermissionError) as error:
+            with StartupSteps("test") as startup_steps:
+                startup_steps.start("credentials check", fail)
+                startup_steps.run("service selection", int, "not a number")
+
+        assert isinstance(error.value.__context__, ValueError)
+        with pytest.raises(RuntimeError):
+            startup_steps.start("after", time.sleep, 0)
+
+    def test_later_errors_are_raised_if_started_steps_succeed(self):
+        with pytest.raises(ValueError):
+            with StartupSteps("test") as startup_steps:
+                startup_steps.start("version check", time.sleep, 0.1)
+                startup_steps.run("service selection", int, "not a number")
+
+        assert [timing.name for timing in startup_steps.step_timings] == [
+            "service selection",
+            "version check",
+        ]
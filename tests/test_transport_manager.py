@@ -0,0 +1,98 @@
+import asyncio
+from unittest import mock
+
+from copernicusmarine.catalogue_parser.catalogue_parser import (
+    CatalogParserConnection,
+)
+from copernicusmarine.core_functions.sessions import (
+    TransportManager,
+    _get_ssl_context,
+)
+
+
+class TestTransportManager:
+    def test_ssl_context_is_created_once(self):
+        assert _get_ssl_context() is _get_ssl_context()
+
+    def test_requests_sessions_share_the_connection_pool_only(self):
+        transport_manager = TransportManager(max_connections_per_host=7)
+
+        first_session = transport_manager.get_requests_session()
+        second_session = transport_manager.get_requests_session()
+        first_session.cookies.set("TGC", "ticket")
+
+        adapter = first_session.get_adapter("https://example.com")
+        assert adapter is second_session.get_adapter("https://example.com")
+        assert adapter._pool_maxsize == 7
+        assert "TGC" not in second_session.cookies
+        transport_manager.close()
+
+    def test_aiohttp_session_is_reused_until_closed(self):
+        transport_manager = TransportManager(max_connections_per_host=7)
+
+        session = transport_manager.get_aiohttp_session()
+        assert transport_manager.get_aiohttp_session() is session
+        assert session.connector.limit_per_host == 7
+
+        asyncio.get_event_loop().run_until_complete(session.close())
+        new_session = transport_manager.get_aiohttp_session()
+        assert new_session is not session
+        transport_manager.close()
+        assert new_session.closed
+
+    def test_catalogue_connection_keeps_the_shared_session_open(self):
+        transport_manager = TransportManager()
+        with mock.patch(
+            "copernicusmarine.catalogue_parser.catalogue_parser."
+            "get_configured_aiohttp_session",
+            transport_manager.get_aiohttp_session,
+        ):
+            connection = CatalogParserConnection()
+
+        asyncio.get_event_loop().run_until_complete(connection.close())
+        assert not connection.session.closed
+        assert transport_manager.get_aiohttp_session() is connection.session
+        transport_manager.close()
+
+    def test_boto3_pool_is_sized_to_the_concurrency(self):
+        transport_manager = TransportManager(
+            max_connections_per_host=32,
+            max_concurrent_downloads=4,
+            transfer_max_concurrency=2,
+        )
+
+        config = transport_manager.get_boto3_config()
+
+        assert config is transport_manager.get_boto3_config()
+        assert config.max_pool_connections == 32
+
+    def test_boto3_pool_is_sized_to_the_concurrent_downloads(self):
+        transport_manager = TransportManager(
+            max_connections_per_host=15,
+            max_concurrent_downloads=4,
+            transfer_max_concurrency=10,
+        )
+
+        config = transport_manager.get_boto3_config()
+
+        assert config.max_pool_connections == 40
+        assert transport_manager.get_s3_transfer_config().max_concurrency == 10
+
+    def test_boto3_clients_are_reused(self):
+        transport_manager = TransportManager()
+        endpoint_url = "https://s3.example.com"
+
+        s3_client = transport_manager.get_boto3_client(
+            endpoint_url, ["GetObject", "HeadObject"], "user"
+        )
+
+        assert s3_client is transport_manager.get_boto3_client(
+            endpoint_url, ["HeadObject", "GetObject"], "user"
+        )
+        assert s3_client is not transport_manager.get_boto3_client(
+            endpoint_url, ["GetObject", "HeadObject"], "other_user"
+        )
+        assert s3_client is not transport_manager.get_boto3_client(
+            endpoint_url, ["ListObjects"], "user"
+        )
+        transport_manager.close()